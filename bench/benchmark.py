@@ -0,0 +1,162 @@
+"""
+End-to-end clone benchmark against the local mock Discord API
+
+Seeds synthetic source guilds into bench/mockserver.py, then scrapes and
+clones each one into a new server with ServerScraper and ServerCreator,
+reporting requests per second, total time and peak Python memory.
+
+Usage:
+    python bench/benchmark.py
+    python bench/benchmark.py --channels 10 100 500 --roles 250 --latency 0.05 --json results.json
+"""
+
+import tracemalloc
+import argparse
+import tempfile
+import asyncio
+import json
+import time
+import sys
+import os
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchDir))
+sys.path.insert(0, benchDir)
+
+from mockserver import MockDiscord
+import duplicate
+
+def buildGuild(mock, channelCount, roleCount, emojiCount):
+    """
+    Seed a synthetic source guild
+
+    Channels are spread over one category per ten channels, and every channel
+    carries an overwrite for @everyone and one for a role.
+
+    Returns:
+        str: ID of the seeded guild
+    """
+    roles = [
+        {"name": f"role-{index}", "permissions": "0", "position": index + 1, "color": index, "hoist": False, "mentionable": False}
+        for index in range(roleCount)
+    ]
+    categoryCount = max(channelCount // 10, 1)
+    channels = [
+        {"ref": f"category-{index}", "name": f"category-{index}", "type": 4, "position": index}
+        for index in range(categoryCount)
+    ]
+    channels += [
+        {"name": f"channel-{index}", "type": 2 if index % 5 == 0 else 0, "position": index, "parent_id": f"category-{index % categoryCount}"}
+        for index in range(channelCount)
+    ]
+    emojis = [{"name": f"emoji_{index}", "animated": index % 4 == 0} for index in range(emojiCount)]
+    guildId = mock.addGuild(f"bench-{channelCount}", roles, channels, emojis, icon="a" * 32)
+
+    guild = mock.guilds[guildId]
+    roleIds = [role["id"] for role in guild["roles"]]
+
+    for index, channel in enumerate(guild["channels"]):
+        channel["permission_overwrites"] = [
+            {"id": guildId, "type": 0, "allow": "0", "deny": "1024"},
+            {"id": roleIds[index % len(roleIds)], "type": 0, "allow": "1024", "deny": "0"},
+        ]
+
+    return guildId
+
+async def runClone(config, sourceId):
+    metrics = duplicate.RequestMetrics()
+    pool = duplicate.HttpPool("bench-token", config["settings"])
+    scraper = duplicate.ServerScraper("bench-token", sourceId, config, metrics, pool)
+    scrapeStart = time.perf_counter()
+    sourceData = await scraper.collectServerData()
+    scrapeTime = time.perf_counter() - scrapeStart
+
+    creator = duplicate.ServerCreator("bench-token", sourceData, config=config, metrics=metrics, pool=pool)
+    cloneStart = time.perf_counter()
+    await creator.executeAll()
+    cloneTime = time.perf_counter() - cloneStart
+    await pool.aclose()
+
+    return scrapeTime, cloneTime, creator
+
+def runScenario(arguments, channelCount):
+    mock = MockDiscord(latency=arguments.latency, limit=arguments.limit, window=arguments.window,
+                       failRate=arguments.fail_rate, errorRate=arguments.error_rate).start()
+
+    try:
+        sourceId = buildGuild(mock, channelCount, arguments.roles, arguments.emojis)
+
+        with tempfile.TemporaryDirectory() as cacheDir:
+            config = {
+                "token": "bench-token",
+                "settings": {
+                    "api_url": f"{mock.url}/api/v9",
+                    "cdn_url": mock.url,
+                    "asset_cache_dir": cacheDir,
+                    "log_level": "error",
+                    "max_retries": 10,
+                },
+            }
+            duplicate.logger.configure(config)
+
+            tracemalloc.start()
+            scrapeTime, cloneTime, creator = asyncio.run(runClone(config, sourceId))
+            peakMemory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        totalTime = scrapeTime + cloneTime
+        report = creator.metrics.report()
+
+        if arguments.report:
+            creator.metrics.writeReport(os.path.join(arguments.report, f"bench-{channelCount}.json"))
+        target = mock.guilds.get(creator.serverId, {})
+
+        return {
+            "channels": channelCount,
+            "roles": arguments.roles,
+            "emojis": arguments.emojis,
+            "requests": mock.stats["requests"],
+            "rateLimited": mock.stats["rateLimited"],
+            "errors": mock.stats["errors"],
+            "scrapeSeconds": round(scrapeTime, 3),
+            "cloneSeconds": round(cloneTime, 3),
+            "totalSeconds": round(totalTime, 3),
+            "requestsPerSecond": round(mock.stats["requests"] / totalTime, 1) if totalTime else 0.0,
+            "peakMemoryMb": round(peakMemory / (1024 * 1024), 2),
+            "rateLimitWaitSeconds": report["rateLimitWait"],
+            "retries": report["retries"],
+            "createdChannels": len(target.get("channels", [])),
+            "createdRoles": len(target.get("roles", [])) - 1,
+        }
+    finally:
+        mock.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cloning synthetic guilds against the mock Discord API")
+    parser.add_argument("--channels", type=int, nargs="+", default=[10, 100, 500], help="channel counts to benchmark")
+    parser.add_argument("--roles", type=int, default=250, help="roles per synthetic guild")
+    parser.add_argument("--emojis", type=int, default=20, help="emojis per synthetic guild")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock latency per request in seconds")
+    parser.add_argument("--limit", type=int, default=50, help="mock requests per bucket window")
+    parser.add_argument("--window", type=float, default=1.0, help="mock bucket window in seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of API requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of API writes applied but answered with 502")
+    parser.add_argument("--json", help="write results as JSON to this file")
+    parser.add_argument("--report", help="write each scenario's request metrics report to this directory")
+    arguments = parser.parse_args()
+
+    results = []
+    print(f"{'channels':>8} {'roles':>6} {'requests':>9} {'429s':>5} {'total s':>8} {'req/s':>7} {'peak MB':>8}")
+
+    for channelCount in arguments.channels:
+        result = runScenario(arguments, channelCount)
+        results.append(result)
+        print(f"{result['channels']:>8} {result['roles']:>6} {result['requests']:>9} {result['rateLimited']:>5} "
+              f"{result['totalSeconds']:>8.2f} {result['requestsPerSecond']:>7.1f} {result['peakMemoryMb']:>8.2f}")
+
+    if arguments.json:
+        with open(arguments.json, "w") as outputFile:
+            json.dump(results, outputFile, indent=4)
+
+if __name__ == "__main__":
+    main()
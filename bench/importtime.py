@@ -0,0 +1,58 @@
+"""
+Startup benchmark for the headless and interactive entry points
+
+Imports each module in fresh interpreters and reports the median wall time,
+so the engine's startup can be compared with a bare httpx import.
+
+Usage:
+    python bench/importtime.py
+    python bench/importtime.py --runs 20
+"""
+
+import subprocess
+import statistics
+import argparse
+import sys
+import os
+
+rootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+targets = [
+    ("python", "pass"),
+    ("httpx", "import httpx"),
+    ("headless (duplicate)", "import duplicate"),
+    ("interactive (interface)", "import interface"),
+]
+
+def measure(statement, runs):
+    """
+    Time a statement in fresh interpreters
+
+    Returns:
+        float: Median wall time in milliseconds, or None if the import failed
+    """
+    code = f"import time; start = time.perf_counter(); {statement}; print((time.perf_counter() - start) * 1000)"
+    samples = []
+
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], cwd=rootDir, capture_output=True, text=True)
+
+        if result.returncode != 0:
+            return None
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of the Duplicate entry points")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per target")
+    arguments = parser.parse_args()
+
+    print(f"{'target':<26} {'median ms':>10}")
+
+    for name, statement in targets:
+        milliseconds = measure(statement, arguments.runs)
+        print(f"{name:<26} {'failed' if milliseconds is None else f'{milliseconds:>10.1f}':>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,569 @@
+"""
+Local stand-in for the Discord v9 API and CDN used by main.py
+
+Implements the guild, channel, role, emoji and guild template endpoints the
+scraper and creator call, plus the CDN icon and emoji routes. Every API response carries
+X-RateLimit-* headers from a per-bucket window, exhausted buckets answer 429
+with Retry-After, and latency, random 429s and failures of specific routes
+can be injected.
+
+Run standalone:
+    python bench/mockserver.py --port 8080 --latency 0.05
+then point settings.api_url at http://127.0.0.1:8080/api/v9 and
+settings.cdn_url at http://127.0.0.1:8080.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import itertools
+import threading
+import hashlib
+import random
+import json
+import time
+import re
+
+routes = [
+    ("POST", r"/api/v9/guilds", "createGuild"),
+    ("POST", r"/api/v9/guilds/templates/(\w+)", "createGuildFromTemplate"),
+    ("GET", r"/api/v9/guilds/(\d+)", "getGuild"),
+    ("PATCH", r"/api/v9/guilds/(\d+)", "updateGuild"),
+    ("GET", r"/api/v9/guilds/(\d+)/channels", "getChannels"),
+    ("POST", r"/api/v9/guilds/(\d+)/channels", "createChannel"),
+    ("GET", r"/api/v9/guilds/(\d+)/roles", "getRoles"),
+    ("PATCH", r"/api/v9/guilds/(\d+)/channels", "moveChannels"),
+    ("POST", r"/api/v9/guilds/(\d+)/roles", "createRole"),
+    ("PATCH", r"/api/v9/guilds/(\d+)/roles", "moveRoles"),
+    ("PATCH", r"/api/v9/guilds/(\d+)/roles/(\d+)", "updateRole"),
+    ("DELETE", r"/api/v9/guilds/(\d+)/roles/(\d+)", "deleteRole"),
+    ("GET", r"/api/v9/guilds/(\d+)/emojis", "getEmojis"),
+    ("POST", r"/api/v9/guilds/(\d+)/emojis", "createEmoji"),
+    ("DELETE", r"/api/v9/guilds/(\d+)/emojis/(\d+)", "deleteEmoji"),
+    ("GET", r"/api/v9/guilds/(\d+)/templates", "getTemplates"),
+    ("POST", r"/api/v9/guilds/(\d+)/templates", "createTemplate"),
+    ("PUT", r"/api/v9/guilds/(\d+)/templates/(\w+)", "syncTemplate"),
+    ("DELETE", r"/api/v9/guilds/(\d+)/templates/(\w+)", "deleteTemplate"),
+    ("PATCH", r"/api/v9/channels/(\d+)", "updateChannel"),
+    ("DELETE", r"/api/v9/channels/(\d+)", "deleteChannel"),
+    ("GET", r"/emojis/(\d+)\.(png|gif)", "getEmojiImage"),
+    ("GET", r"/icons/(\d+)/(\w+)\.(png|gif)", "getIconImage"),
+]
+compiledRoutes = [(method, re.compile(f"^{pattern}$"), name) for method, pattern, name in routes]
+
+class RateLimitWindow:
+    """
+    Fixed window rate limit for one bucket and major parameter
+    """
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.resetAt = 0.0
+
+    def hit(self, now):
+        """
+        Count a request against the window
+
+        Returns:
+            bool: True if the request is allowed
+        """
+        if now >= self.resetAt:
+            self.remaining = self.limit
+            self.resetAt = now + self.window
+
+        if self.remaining <= 0:
+            return False
+
+        self.remaining -= 1
+        return True
+
+class MockDiscord:
+    """
+    In-memory Discord API state plus the HTTP server serving it.
+
+    Attributes:
+        guilds (dict): Guild ID -> {"info", "channels", "roles", "emojis"}
+        stats (dict): Request counters (requests, rateLimited, errors, bytesIn, bytesOut)
+        history (list): (method, path) of every request received, in order
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, limit=50, window=1.0,
+                 limits=None, failRate=0.0, errorRate=0.0, imageSize=8192):
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.limits = limits or {}
+        self.failRate = failRate
+        self.errorRate = errorRate
+        self.image = b"\x89PNG\r\n\x1a\n" + bytes(random.getrandbits(8) for _ in range(imageSize))
+        self.ids = itertools.count(10 ** 17)
+        self.lock = threading.RLock()
+        self.windows = {}
+        self.guilds = {}
+        self.channels = {}
+        self.templates = {}
+        self.faults = {}
+        self.history = []
+        self.stats = {"requests": 0, "rateLimited": 0, "errors": 0, "bytesIn": 0, "bytesOut": 0}
+        self.server = ThreadingHTTPServer((host, port), self._makeHandler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-discord", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def nextId(self):
+        with self.lock:
+            return str(next(self.ids))
+
+    def addGuild(self, name, roles=(), channels=(), emojis=(), icon=None):
+        """
+        Seed a guild directly into the mock state
+
+        Args:
+            name (str): Guild name
+            roles (list): Role dicts without IDs are given one
+            channels (list): Channel dicts, parent_id may reference an earlier channel's "ref"
+            emojis (list): Emoji dicts
+            icon (str): Icon hash
+
+        Returns:
+            str: ID of the new guild
+        """
+        guildId = self.nextId()
+        guild = {
+            "info": {"id": guildId, "name": name, "icon": icon, "features": [], "verification_level": 0,
+                     "default_message_notifications": 0, "explicit_content_filter": 0, "system_channel_id": None},
+            "roles": [{"id": guildId, "name": "@everyone", "permissions": "1071698529857", "position": 0,
+                       "color": 0, "hoist": False, "mentionable": False, "managed": False}],
+            "channels": [],
+            "emojis": [],
+        }
+        refs = {}
+
+        for role in roles:
+            guild["roles"].append({"id": self.nextId(), "managed": False, **role})
+        for channel in channels:
+            channel = {"permission_overwrites": [], **channel, "id": self.nextId(), "guild_id": guildId}
+            refs[channel.pop("ref", channel["id"])] = channel["id"]
+            channel["parent_id"] = refs.get(channel.get("parent_id"))
+            guild["channels"].append(channel)
+            self.channels[channel["id"]] = guildId
+        for emoji in emojis:
+            guild["emojis"].append({"id": self.nextId(), "roles": [], "animated": False, **emoji})
+
+        self.guilds[guildId] = guild
+        return guildId
+
+    def failNext(self, route, status=500, count=1):
+        """
+        Answer the next requests to a route with an error instead of handling them
+
+        Args:
+            route (str): Method and route template, e.g. "GET /api/v9/guilds/{id}/channels"
+            status (int): Status code to answer with
+            count (int): Number of requests to fail
+        """
+        with self.lock:
+            self.faults[route] = [status] * count
+
+    def _takeFault(self, method, path):
+        """
+        Get the injected status for a request, if any is left for its route
+
+        Returns:
+            int: Status code to answer with, or None to handle the request
+        """
+        route = self._parseRoute(method, path)[0]
+
+        with self.lock:
+            statuses = self.faults.get(route)
+            return statuses.pop(0) if statuses else None
+
+    def _parseRoute(self, method, path):
+        parts = path.split("/")
+        major = None
+
+        for index, part in enumerate(parts):
+            if part.isdigit():
+                if major is None and parts[index - 1] in ("guilds", "channels"):
+                    major = part
+                parts[index] = "{id}"
+
+        return f"{method} {'/'.join(parts)}", major
+
+    def _checkRateLimit(self, method, path):
+        """
+        Apply the bucket window for a request
+
+        Returns:
+            tuple: (allowed, response headers)
+        """
+        route, major = self._parseRoute(method, path)
+        limit, window = self.limits.get(route, (self.limit, self.window))
+        bucketHash = hashlib.sha1(route.encode()).hexdigest()[:16]
+        now = time.monotonic()
+
+        with self.lock:
+            state = self.windows.setdefault((route, major), RateLimitWindow(limit, window))
+            allowed = state.hit(now) and random.random() >= self.failRate
+            resetAfter = max(state.resetAt - now, 0.0)
+            headers = {
+                "X-RateLimit-Bucket": bucketHash,
+                "X-RateLimit-Limit": str(state.limit),
+                "X-RateLimit-Remaining": str(max(state.remaining, 0)),
+                "X-RateLimit-Reset-After": f"{resetAfter:.3f}",
+            }
+
+            if not allowed:
+                self.stats["rateLimited"] += 1
+                headers["Retry-After"] = f"{max(resetAfter, 0.05):.3f}"
+                headers["X-RateLimit-Scope"] = "user"
+
+        return allowed, headers
+
+    def _makeHandler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status, body=None, headers=None, contentType="application/json"):
+                if body is None:
+                    payload = b""
+                elif isinstance(body, bytes):
+                    payload = body
+                else:
+                    payload = json.dumps(body).encode()
+
+                self.send_response(status)
+                self.send_header("Content-Type", contentType)
+                self.send_header("Content-Length", str(len(payload)))
+
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+
+                self.end_headers()
+                self.wfile.write(payload)
+
+                with mock.lock:
+                    mock.stats["bytesOut"] += len(payload)
+
+            def _dispatch(self):
+                path = self.path.split("?")[0]
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+
+                with mock.lock:
+                    mock.stats["requests"] += 1
+                    mock.stats["bytesIn"] += length
+                    mock.history.append((self.command, path))
+
+                if mock.latency:
+                    time.sleep(mock.latency)
+
+                for method, pattern, name in compiledRoutes:
+                    match = pattern.match(path)
+
+                    if method != self.command or not match:
+                        continue
+
+                    if path.startswith("/api/"):
+                        allowed, headers = mock._checkRateLimit(self.command, path)
+
+                        if not allowed:
+                            retryAfter = float(headers["Retry-After"])
+                            return self._respond(429, {"message": "You are being rate limited.", "retry_after": retryAfter, "global": False}, headers)
+
+                        fault = mock._takeFault(self.command, path)
+
+                        if fault:
+                            with mock.lock:
+                                mock.stats["errors"] += 1
+                            return self._respond(fault, {"message": "Injected failure", "code": 0}, headers)
+                    else:
+                        headers = {}
+
+                    with mock.lock:
+                        status, result = getattr(mock, name)(*match.groups(), body=body)
+
+                    if self.command != "GET" and path.startswith("/api/") and random.random() < mock.errorRate:
+                        with mock.lock:
+                            mock.stats["errors"] += 1
+                        return self._respond(502, {"message": "Bad Gateway", "code": 0}, headers)
+
+                    if isinstance(result, bytes):
+                        return self._respond(status, result, headers, "image/png")
+                    return self._respond(status, result, headers)
+
+                return self._respond(404, {"message": "404: Not Found", "code": 0})
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+        return Handler
+
+    def _guild(self, guildId):
+        return self.guilds.get(guildId)
+
+    def createGuild(self, body):
+        guildId = self.addGuild(body.get("name", "guild"))
+        guild = self.guilds[guildId]
+        inlineRoles = body.get("roles") or []
+        inlineChannels = body.get("channels")
+        placeholders = {}
+
+        if inlineRoles:
+            guild["roles"][0]["permissions"] = inlineRoles[0].get("permissions", guild["roles"][0]["permissions"])
+            placeholders[inlineRoles[0].get("id")] = guildId
+
+        for position, role in enumerate(inlineRoles[1:], start=1):
+            roleId = self.nextId()
+            placeholders[role.get("id")] = roleId
+            guild["roles"].append({"color": 0, "hoist": False, "mentionable": False, **role, "id": roleId,
+                                   "position": position, "managed": False})
+
+        if inlineChannels is None:
+            inlineChannels = [{"name": "Text Channels", "type": 4}, {"name": "general", "type": 0}]
+
+        for position, channel in enumerate(inlineChannels):
+            channelId = self.nextId()
+            placeholders[channel.get("id")] = channelId
+            overwrites = [{**overwrite, "id": placeholders.get(overwrite["id"], overwrite["id"])}
+                          for overwrite in channel.get("permission_overwrites", [])]
+            guild["channels"].append({**channel, "id": channelId, "position": position, "guild_id": guildId,
+                                      "parent_id": placeholders.get(channel.get("parent_id")),
+                                      "permission_overwrites": overwrites})
+            self.channels[channelId] = guildId
+
+        return 201, {**guild["info"], "roles": guild["roles"], "emojis": guild["emojis"]}
+
+    def getGuild(self, guildId, body):
+        guild = self._guild(guildId)
+
+        if not guild:
+            return 404, {"message": "Unknown Guild", "code": 10004}
+        return 200, {**guild["info"], "roles": guild["roles"], "emojis": guild["emojis"]}
+
+    def updateGuild(self, guildId, body):
+        guild = self._guild(guildId)
+
+        if not guild:
+            return 404, {"message": "Unknown Guild", "code": 10004}
+
+        guild["info"].update({key: value for key, value in body.items() if key in guild["info"]})
+        return 200, guild["info"]
+
+    def getChannels(self, guildId, body):
+        guild = self._guild(guildId)
+        return (200, guild["channels"]) if guild else (404, {"message": "Unknown Guild", "code": 10004})
+
+    def createChannel(self, guildId, body):
+        channel = {"permission_overwrites": [], "position": 0, "parent_id": None, **body, "id": self.nextId(), "guild_id": guildId}
+        self.guilds[guildId]["channels"].append(channel)
+        self.channels[channel["id"]] = guildId
+        return 201, channel
+
+    def moveChannels(self, guildId, body):
+        channels = {channel["id"]: channel for channel in self.guilds[guildId]["channels"]}
+
+        for update in body:
+            if update["id"] in channels:
+                channels[update["id"]].update(update)
+
+        return 204, None
+
+    def getRoles(self, guildId, body):
+        guild = self._guild(guildId)
+        return (200, guild["roles"]) if guild else (404, {"message": "Unknown Guild", "code": 10004})
+
+    def getEmojis(self, guildId, body):
+        guild = self._guild(guildId)
+        return (200, guild["emojis"]) if guild else (404, {"message": "Unknown Guild", "code": 10004})
+
+    def createRole(self, guildId, body):
+        roles = self.guilds[guildId]["roles"]
+        role = {"color": 0, "hoist": False, "mentionable": False, "managed": False, **body, "id": self.nextId(), "position": 1}
+
+        for other in roles:
+            if other["position"] >= 1:
+                other["position"] += 1
+
+        roles.append(role)
+        return 200, role
+
+    def moveRoles(self, guildId, body):
+        roles = {role["id"]: role for role in self.guilds[guildId]["roles"]}
+
+        for update in body:
+            if update["id"] in roles:
+                roles[update["id"]]["position"] = update["position"]
+
+        return 200, list(roles.values())
+
+    def updateRole(self, guildId, roleId, body):
+        for role in self.guilds[guildId]["roles"]:
+            if role["id"] == roleId:
+                role.update(body)
+                return 200, role
+
+        return 404, {"message": "Unknown Role", "code": 10011}
+
+    def deleteRole(self, guildId, roleId, body):
+        roles = self.guilds[guildId]["roles"]
+        self.guilds[guildId]["roles"] = [role for role in roles if role["id"] != roleId]
+        return 204, None
+
+    def createEmoji(self, guildId, body):
+        emoji = {"id": self.nextId(), "name": body["name"], "roles": body.get("roles", []),
+                 "animated": body.get("image", "").startswith("data:image/gif")}
+        self.guilds[guildId]["emojis"].append(emoji)
+        return 201, emoji
+
+    def deleteEmoji(self, guildId, emojiId, body):
+        emojis = self.guilds[guildId]["emojis"]
+        self.guilds[guildId]["emojis"] = [emoji for emoji in emojis if emoji["id"] != emojiId]
+        return 204, None
+
+    def updateChannel(self, channelId, body):
+        guildId = self.channels.get(channelId)
+
+        for channel in self.guilds.get(guildId, {}).get("channels", []):
+            if channel["id"] == channelId:
+                channel.update(body)
+                return 200, channel
+
+        return 404, {"message": "Unknown Channel", "code": 10003}
+
+    def deleteChannel(self, channelId, body):
+        guildId = self.channels.pop(channelId, None)
+
+        if guildId is None:
+            return 404, {"message": "Unknown Channel", "code": 10003}
+
+        channels = self.guilds[guildId]["channels"]
+        deleted = next(channel for channel in channels if channel["id"] == channelId)
+        self.guilds[guildId]["channels"] = [channel for channel in channels if channel["id"] != channelId]
+        return 200, deleted
+
+    def _serializeGuild(self, guildId):
+        """
+        Serialize a guild the way templates do: roles and channels get integer
+        IDs, @everyone is role 0, and member overwrites are dropped
+        """
+        guild = self.guilds[guildId]
+        roles = sorted(guild["roles"], key=lambda role: (role["id"] != guildId, role["position"]))
+        channels = sorted(guild["channels"], key=lambda channel: (channel.get("type") != 4, channel.get("position", 0)))
+        placeholders = {role["id"]: index for index, role in enumerate(roles)}
+
+        for channel in channels:
+            placeholders[channel["id"]] = len(placeholders)
+
+        return {
+            "name": guild["info"]["name"],
+            "roles": [{key: role.get(key) for key in ("name", "permissions", "color", "hoist", "mentionable")}
+                      | {"id": placeholders[role["id"]]} for role in roles],
+            "channels": [
+                {key: channel.get(key) for key in ("name", "type", "topic", "nsfw", "rate_limit_per_user", "bitrate", "user_limit")
+                 if key in channel}
+                | {"id": placeholders[channel["id"]], "parent_id": placeholders.get(channel.get("parent_id")),
+                   "permission_overwrites": [{**overwrite, "id": placeholders[overwrite["id"]]}
+                                             for overwrite in channel.get("permission_overwrites", [])
+                                             if overwrite.get("type") == 0 and overwrite["id"] in placeholders]}
+                for channel in channels
+            ],
+        }
+
+    def getTemplates(self, guildId, body):
+        if not self._guild(guildId):
+            return 404, {"message": "Unknown Guild", "code": 10004}
+
+        templates = [template for template in self.templates.values() if template["source_guild_id"] == guildId]
+
+        for template in templates:
+            template["is_dirty"] = template["serialized_source_guild"] != self._serializeGuild(guildId)
+        return 200, templates
+
+    def createTemplate(self, guildId, body):
+        if any(template["source_guild_id"] == guildId for template in self.templates.values()):
+            return 400, {"message": "A guild can only have one template", "code": 30031}
+
+        code = "".join(random.choices("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", k=12))
+        self.templates[code] = {"code": code, "name": body["name"], "source_guild_id": guildId, "is_dirty": False,
+                                "serialized_source_guild": self._serializeGuild(guildId)}
+        return 201, self.templates[code]
+
+    def syncTemplate(self, guildId, code, body):
+        template = self.templates.get(code)
+
+        if not template or template["source_guild_id"] != guildId:
+            return 404, {"message": "Unknown Guild Template", "code": 10057}
+
+        template.update(is_dirty=False, serialized_source_guild=self._serializeGuild(guildId))
+        return 200, template
+
+    def deleteTemplate(self, guildId, code, body):
+        template = self.templates.get(code)
+
+        if not template or template["source_guild_id"] != guildId:
+            return 404, {"message": "Unknown Guild Template", "code": 10057}
+
+        return 200, self.templates.pop(code)
+
+    def createGuildFromTemplate(self, code, body):
+        template = self.templates.get(code)
+
+        if not template:
+            return 404, {"message": "Unknown Guild Template", "code": 10057}
+
+        source = template["serialized_source_guild"]
+        return self.createGuild({"name": body.get("name") or source["name"], "roles": source["roles"], "channels": source["channels"]})
+
+    def getEmojiImage(self, emojiId, extension, body):
+        return 200, self.imageAs(extension)
+
+    def getIconImage(self, guildId, iconHash, extension, body):
+        return 200, self.imageAs(extension)
+
+    def imageAs(self, extension):
+        """
+        Return the fake image with the signature of the requested format
+        """
+        return b"GIF89a" + self.image[8:] if extension == "gif" else self.image
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Discord API and CDN")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--limit", type=int, default=50, help="requests per bucket window")
+    parser.add_argument("--window", type=float, default=1.0, help="bucket window in seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of API requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of API writes applied but answered with 502")
+    arguments = parser.parse_args()
+
+    mock = MockDiscord(arguments.host, arguments.port, arguments.latency, arguments.limit,
+                       arguments.window, failRate=arguments.fail_rate, errorRate=arguments.error_rate)
+    print(f"Mock Discord API listening on {mock.url}/api/v9 (CDN at {mock.url})")
+
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        mock.server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+"""
+End-to-end checks of the clone engine against the local mock Discord API
+
+Every test seeds a source guild into bench/mockserver.py, runs the engine
+against it and asserts on the state the mock ends up with: parity of the
+clone on each create path, resumes without duplicates, minimal sync
+plans, dry runs that only read, and rate limits that are never hit.
+
+Usage:
+    python -m pytest bench
+    python -m unittest discover bench
+"""
+
+from collections import Counter
+import contextlib
+import warnings
+import tempfile
+import unittest
+import asyncio
+import json
+import gc
+import sys
+import os
+
+benchDir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(benchDir))
+sys.path.insert(0, benchDir)
+
+from mockserver import MockDiscord
+from benchmark import buildGuild
+import duplicate
+
+token = "e2e-token"
+
+createPaths = {
+    "inline": {},
+    "per-item": {"inline_create": False},
+    "template": {"template_create": True},
+}
+
+class MockCloneTest(unittest.TestCase):
+    """
+    Starts a fresh mock and a scratch directory for every test
+    """
+
+    mockOptions = {"limit": 50, "window": 0.5}
+
+    def setUp(self):
+        self.mock = MockDiscord(**self.mockOptions).start()
+        self.directory = tempfile.TemporaryDirectory()
+        duplicate.logger.configure(self.makeConfig())
+
+    def tearDown(self):
+        self.mock.stop()
+        self.directory.cleanup()
+
+    def makeConfig(self, **settings):
+        """
+        Build a config pointing at the mock, with settings overriding the defaults
+        """
+        return {
+            "token": token,
+            "settings": {
+                "api_url": f"{self.mock.url}/api/v9",
+                "cdn_url": self.mock.url,
+                "asset_cache_dir": self.path("assets"),
+                "checkpoint_dir": self.path("checkpoints"),
+                "log_level": "error",
+                "progress": False,
+                "retry_delay": 0.05,
+                **settings,
+            },
+        }
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def channelNames(self, guildId):
+        return sorted((channel["type"], channel["name"]) for channel in self.mock.guilds[guildId]["channels"])
+
+    def roleNames(self, guildId):
+        return sorted(role["name"] for role in self.mock.guilds[guildId]["roles"])
+
+    def emojiNames(self, guildId):
+        return sorted(emoji["name"] for emoji in self.mock.guilds[guildId]["emojis"])
+
+    def assertMatchesSource(self, sourceId, targetId):
+        """
+        Assert the target holds exactly the source's roles, channels and emojis
+        """
+        self.assertEqual(self.roleNames(targetId), self.roleNames(sourceId))
+        self.assertEqual(self.channelNames(targetId), self.channelNames(sourceId))
+        self.assertEqual(self.emojiNames(targetId), self.emojiNames(sourceId))
+
+    def sentRoutes(self, start=0, writes=False):
+        """
+        Count the API requests the mock received since a point in its history
+
+        Args:
+            start (int): Index into mock.history to count from
+            writes (bool): Only count requests that are not GETs
+
+        Returns:
+            Counter: Route template -> requests, in the form planRequests uses
+        """
+        limiter = duplicate.RateLimiter()
+        return Counter(
+            limiter._parseRoute(method, self.mock.url + path)[0]
+            for method, path in self.mock.history[start:]
+            if path.startswith("/api/") and not (writes and method == "GET")
+        )
+
+    def clone(self, source, config=None, **options):
+        """
+        Run one CloneSession.clone against the mock
+
+        Returns:
+            CloneResult: The finished clone
+        """
+        async def clone():
+            async with duplicate.CloneSession(token, config=config or self.makeConfig()) as session:
+                return await session.clone(source, **options)
+
+        return asyncio.run(clone())
+
+    async def scrape(self, serverId, config, pool):
+        return await duplicate.ServerScraper(token, serverId, config, pool=pool).collectServerData()
+
+class CloneTest(MockCloneTest):
+
+    def testEveryCreatePathMatchesSource(self):
+        for name, settings in createPaths.items():
+            with self.subTest(path=name):
+                sourceId = buildGuild(self.mock, 30, 12, 6)
+                result = self.clone(sourceId, self.makeConfig(**settings))
+
+                self.assertTrue(result.ok, result.failures)
+                self.assertTrue(result.complete)
+                self.assertFalse(any(result.differences.values()))
+                self.assertMatchesSource(sourceId, result.serverId)
+                self.assertEqual(len(result.channelMap), len(self.mock.guilds[sourceId]["channels"]))
+
+    def testSnapshotCloneUsesStoredAssets(self):
+        sourceId = buildGuild(self.mock, 10, 4, 5)
+        snapshotPath = self.path("source.json.gz")
+
+        async def snapshot():
+            async with duplicate.CloneSession(token, config=self.makeConfig()) as session:
+                await session.snapshot(sourceId, snapshotPath)
+
+        asyncio.run(snapshot())
+        start = len(self.mock.history)
+        result = self.clone(snapshotPath)
+
+        self.assertTrue(result.ok, result.failures)
+        self.assertMatchesSource(sourceId, result.serverId)
+        self.assertFalse([path for _, path in self.mock.history[start:] if not path.startswith("/api/")])
+
+    def testFiltersCloneOnlySelectedParts(self):
+        sourceId = buildGuild(self.mock, 20, 6, 3)
+        result = self.clone(sourceId, filters={"categories": ["category-0"], "emojis": False})
+        source = self.mock.guilds[sourceId]
+        categoryId = next(channel["id"] for channel in source["channels"] if channel["name"] == "category-0")
+        expected = sorted((channel["type"], channel["name"]) for channel in source["channels"]
+                          if categoryId in (channel["id"], channel.get("parent_id")))
+
+        self.assertTrue(result.ok, result.failures)
+        self.assertEqual(self.channelNames(result.serverId), expected)
+        self.assertEqual(self.emojiNames(result.serverId), [])
+
+class ResumeTest(MockCloneTest):
+
+    def resume(self, config, checkpointPath):
+        """
+        Resume a clone from its checkpoint and run the parity check
+
+        Returns:
+            tuple: (mode, finished before resuming, executeAll result, parity differences)
+        """
+        async def resume():
+            pool = duplicate.HttpPool(token, config["settings"])
+            creator, mode, finished = duplicate.ServerCreator.fromCheckpoint(token, checkpointPath, config, pool=pool)
+
+            try:
+                return mode, finished, await creator.executeAll(), await creator.verifyClone()
+            finally:
+                creator.checkpoint.close()
+                await pool.aclose()
+
+        return asyncio.run(resume())
+
+    def testInterruptedCloneResumesWithoutDuplicates(self):
+        sourceId = buildGuild(self.mock, 40, 10, 4)
+        config = self.makeConfig(inline_create=False)
+        checkpointPath = self.path("checkpoint.jsonl")
+        self.mock.latency = 0.02
+
+        async def interrupted():
+            pool = duplicate.HttpPool(token, config["settings"])
+            creator = duplicate.ServerCreator(token, await self.scrape(sourceId, config, pool), config=config, pool=pool)
+            creator.startCheckpoint(checkpointPath, "new")
+            clone = asyncio.ensure_future(creator.executeAll())
+
+            while not (creator.serverId and len(self.mock.guilds[creator.serverId]["channels"]) >= 10):
+                self.assertFalse(clone.done(), "clone finished before it could be interrupted")
+                await asyncio.sleep(0.005)
+
+            clone.cancel()
+
+            with contextlib.suppress(asyncio.CancelledError):
+                await clone
+
+            await asyncio.sleep(0.2)
+            creator.checkpoint.close()
+            await pool.aclose()
+            return creator.serverId
+
+        targetId = asyncio.run(interrupted())
+        self.mock.latency = 0.0
+        mode, finished, succeeded, differences = self.resume(config, checkpointPath)
+
+        self.assertEqual((mode, finished, succeeded), ("new", False, True))
+        self.assertFalse(any(differences.values()))
+        self.assertMatchesSource(sourceId, targetId)
+        self.assertEqual(self.resume(config, checkpointPath)[1], True)
+
+    def testFailedChannelDeleteStopsBeforeCreatingChannels(self):
+        sourceId = buildGuild(self.mock, 20, 8, 4)
+        config = self.makeConfig(inline_create=False)
+        checkpointPath = self.path("checkpoint.jsonl")
+
+        async def firstRun():
+            pool = duplicate.HttpPool(token, config["settings"])
+            creator = duplicate.ServerCreator(token, await self.scrape(sourceId, config, pool), config=config, pool=pool)
+            creator.startCheckpoint(checkpointPath, "new")
+            self.mock.failNext("GET /api/v9/guilds/{id}/channels", 403)
+
+            try:
+                return await creator.executeAll(), creator.serverId
+            finally:
+                creator.checkpoint.close()
+                await pool.aclose()
+
+        succeeded, targetId = asyncio.run(firstRun())
+
+        self.assertFalse(succeeded)
+        self.assertEqual(self.mock.guilds[targetId]["channels"], [])
+        self.mock.createChannel(targetId, {"name": "general", "type": 0})
+
+        mode, finished, succeeded, differences = self.resume(config, checkpointPath)
+
+        self.assertEqual((mode, finished, succeeded), ("new", False, True))
+        self.assertFalse(any(differences.values()))
+        self.assertMatchesSource(sourceId, targetId)
+
+class DuplicateSafetyTest(MockCloneTest):
+
+    def testSameNamedItemsSurviveAmbiguousFailures(self):
+        sourceId = self.mock.addGuild(
+            "same names",
+            roles=[{"name": "dup", "permissions": "0", "position": index + 1, "color": index} for index in range(4)],
+            channels=[{"ref": "category", "name": "category", "type": 4, "position": 0}]
+            + [{"name": "dup", "type": 0, "position": index, "parent_id": "category"} for index in range(4)],
+            emojis=[{"name": "dup"} for _ in range(4)],
+        )
+        config = self.makeConfig(inline_create=False, max_retries=20, retry_delay=0.01)
+
+        async def clone():
+            pool = duplicate.HttpPool(token, config["settings"])
+            creator = duplicate.ServerCreator(token, await self.scrape(sourceId, config, pool), config=config, pool=pool)
+
+            try:
+                await creator.createServer()
+                self.mock.errorRate = 0.5
+                await creator.cloneStructure()
+                self.mock.errorRate = 0.0
+                return creator
+            finally:
+                await pool.aclose()
+
+        creator = asyncio.run(clone())
+
+        self.assertGreater(self.mock.stats["errors"], 0)
+        self.assertEqual(creator.failures, [])
+        self.assertMatchesSource(sourceId, creator.serverId)
+        self.assertEqual(len(set(creator.roleMap.values())), len(creator.roleMap))
+        self.assertEqual(len(set(creator.channelMap.values())), len(creator.channelMap))
+        self.assertEqual(len(set(creator.emojiMap.values())), 4)
+
+class SyncTest(MockCloneTest):
+
+    def setUp(self):
+        super().setUp()
+        self.sourceId = buildGuild(self.mock, 20, 6, 4)
+        self.targetId = self.clone(self.sourceId).serverId
+        target = self.mock.guilds[self.targetId]
+        channel = next(channel for channel in target["channels"] if channel["name"] == "channel-3")
+
+        next(role for role in target["roles"] if role["name"] == "role-1")["color"] = 12345
+        self.mock.deleteChannel(channel["id"], None)
+        self.mock.createChannel(self.targetId, {"name": "stray", "type": 0})
+        self.mock.deleteEmoji(self.targetId, target["emojis"][0]["id"], None)
+
+    def testSyncPlansOnlyTheDifferences(self):
+        config = self.makeConfig()
+
+        async def plan():
+            pool = duplicate.HttpPool(token, config["settings"])
+            creator = duplicate.ServerCreator(token, await self.scrape(self.sourceId, config, pool), config=config, pool=pool)
+
+            try:
+                return creator.planSync(await self.scrape(self.targetId, config, pool))
+            finally:
+                await pool.aclose()
+
+        operations = {
+            (operation["action"], operation["kind"], operation["source"].name if operation["source"] else operation["target"]["name"])
+            for operation in asyncio.run(plan())
+        }
+
+        self.assertEqual(operations, {
+            ("update", "role", "role-1"),
+            ("create", "channel", "channel-3"),
+            ("delete", "channel", "stray"),
+            ("create", "emoji", "emoji_0"),
+        })
+
+    def testSyncSendsThePlannedRequests(self):
+        config = self.makeConfig()
+
+        async def sync():
+            pool = duplicate.HttpPool(token, config["settings"])
+            creator = duplicate.ServerCreator(token, await self.scrape(self.sourceId, config, pool), config=config, pool=pool)
+            creator.serverId = self.targetId
+
+            try:
+                targetData = await self.scrape(self.targetId, config, pool)
+                planned = Counter(request["route"] for request in creator.planRequests(targetData))
+                start = len(self.mock.history)
+                await creator.syncStructure(targetData)
+                return planned, self.sentRoutes(start, writes=True), await creator.verifyClone()
+            finally:
+                await pool.aclose()
+
+        planned, sent, differences = asyncio.run(sync())
+
+        self.assertEqual(sent, planned)
+        self.assertFalse(any(differences.values()))
+        self.assertMatchesSource(self.sourceId, self.targetId)
+
+    def testUnfilteredSyncNeedsConfirmation(self):
+        start = len(self.mock.history)
+
+        with self.assertRaises(duplicate.UnconfirmedSyncError):
+            self.clone(self.sourceId, target=self.targetId)
+
+        self.assertEqual(self.sentRoutes(start, writes=True), Counter())
+        self.assertIn((0, "stray"), self.channelNames(self.targetId))
+
+class PlanTest(MockCloneTest):
+
+    def testPlanMatchesRequestsSent(self):
+        for name, settings in createPaths.items():
+            with self.subTest(path=name):
+                sourceId = buildGuild(self.mock, 20, 8, 4)
+                config = self.makeConfig(**settings)
+
+                async def planAndClone():
+                    pool = duplicate.HttpPool(token, config["settings"])
+                    creator = duplicate.ServerCreator(token, await self.scrape(sourceId, config, pool), config=config, pool=pool)
+
+                    try:
+                        await creator.readTemplates()
+                        planned = Counter(request["route"] for request in creator.planRequests())
+                        start = len(self.mock.history)
+                        await creator.executeAll()
+                        return planned, self.sentRoutes(start)
+                    finally:
+                        await pool.aclose()
+
+                planned, sent = asyncio.run(planAndClone())
+
+                self.assertEqual(sent, planned)
+
+    def testDryRunBatchOnlyReads(self):
+        sourceId = buildGuild(self.mock, 20, 8, 4)
+        targetId = self.mock.addGuild("target")
+        configPath = self.path("config.json")
+
+        with open(configPath, "w") as configFile:
+            json.dump(self.makeConfig(), configFile)
+
+        config = duplicate.Config(configPath)
+        jobs = [{"source": sourceId}, {"source": sourceId, "target": targetId}]
+        shared = {
+            "metrics": duplicate.RequestMetrics(),
+            "rateLimiter": duplicate.RateLimiter(),
+            "assetCache": duplicate.AssetCache(self.path("assets")),
+            "sources": {},
+            "fingerprints": {},
+            "skipUnchanged": False,
+            "dryRun": True,
+            "plans": [None] * len(jobs),
+        }
+        guildCount = len(self.mock.guilds)
+        start = len(self.mock.history)
+
+        async def dryRun():
+            shared["pool"] = duplicate.HttpPool(token, config.settings)
+
+            try:
+                with contextlib.redirect_stdout(None):
+                    return await duplicate.runJobs(jobs, token, config, shared)
+            finally:
+                await shared["pool"].aclose()
+
+        results = asyncio.run(dryRun())
+
+        self.assertEqual([result["status"] for result in results], ["planned", "planned"])
+        self.assertEqual(len(self.mock.guilds), guildCount)
+        self.assertEqual(self.sentRoutes(start), Counter({
+            "GET /api/v9/guilds/{id}": 2,
+            "GET /api/v9/guilds/{id}/channels": 2,
+        }))
+        self.assertEqual([len(plan["requests"]) for plan in shared["plans"]], [5 + 4 + 2, 8 + 2 + 20 + 4 + 2])
+
+class MetricsTest(MockCloneTest):
+
+    def testRequestsAreBilledToTheirPhase(self):
+        sourceId = buildGuild(self.mock, 10, 4, 2)
+        config = self.makeConfig(template_create=True)
+
+        async def clone():
+            pool = duplicate.HttpPool(token, config["settings"])
+            metrics = duplicate.RequestMetrics()
+            scraper = duplicate.ServerScraper(token, sourceId, config, metrics, pool)
+            creator = duplicate.ServerCreator(token, await scraper.collectServerData(), config=config, metrics=metrics, pool=pool)
+
+            try:
+                self.assertEqual(duplicate.currentPhase.get(), "other")
+                await creator.readTemplates()
+                planned = Counter(request["phase"] for request in creator.planRequests())
+                await creator.executeAll()
+                await creator.verifyClone()
+                self.assertEqual(duplicate.currentPhase.get(), "other")
+                return planned, metrics.report()["phases"]
+            finally:
+                await pool.aclose()
+
+        planned, phases = asyncio.run(clone())
+
+        self.assertNotIn("other", phases)
+        self.assertEqual(phases["scrape"]["requests"], 2)
+        self.assertEqual(phases["verify"]["requests"], 2)
+        self.assertEqual(phases["positions"]["requests"], planned["positions"])
+        # the template read before planning and the CDN downloads are not in the plan
+        self.assertEqual(phases["server"]["requests"], planned["server"] + 2)
+        self.assertEqual(phases["emojis"]["requests"], planned["emojis"] * 2)
+
+class PoolTest(MockCloneTest):
+
+    def testSessionClosesConnectionsOfEveryLoop(self):
+        sourceId = buildGuild(self.mock, 5, 2, 1)
+        session = duplicate.CloneSession(token, config=self.makeConfig())
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+
+            for _ in range(2):
+                self.assertTrue(asyncio.run(session.clone(sourceId)).ok)
+
+            asyncio.run(session.close())
+            gc.collect()
+
+        self.assertEqual([str(warning.message) for warning in caught if issubclass(warning.category, ResourceWarning)], [])
+
+class RateLimitTest(MockCloneTest):
+
+    mockOptions = {"limit": 5, "window": 0.25}
+
+    def testCloneStaysWithinRateLimits(self):
+        sourceId = buildGuild(self.mock, 20, 15, 4)
+        result = self.clone(sourceId, self.makeConfig(inline_create=False))
+
+        self.assertTrue(result.ok, result.failures)
+        self.assertEqual(self.mock.stats["rateLimited"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,4962 @@
+"""
+Duplicate engine: configuration, logging, rate limiting, HTTP transport and
+the scraper, creator and batch runner that clone a Discord server.
+
+Only the standard library and httpx are imported here, so headless runs
+start fast; the interactive terminal UI lives in interface.py.
+"""
+
+from httpx import *
+from base64 import *
+from random import *
+from time import *
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+import importlib.util
+import contextvars
+import collections
+import functools
+import asyncio
+import atexit
+import hashlib
+import fnmatch
+import json
+import gzip
+import io
+import threading
+import math
+import sys
+import os
+
+class DuplicateError(Exception):
+    """
+    Base class of the errors raised by the Duplicate engine
+    """
+
+class ConfigError(DuplicateError, ValueError):
+    """
+    The config file is not valid JSON or fails validation
+    """
+
+class SnapshotError(DuplicateError, ValueError):
+    """
+    A snapshot file was written by an unsupported version
+    """
+
+class UnconfirmedSyncError(DuplicateError, ValueError):
+    """
+    An unfiltered sync would delete target items and was not confirmed
+    """
+
+class RequestError(DuplicateError):
+    """
+    A Discord API request failed or ran out of retries
+    
+    Attributes:
+        status (int): HTTP status code
+        text (str): Response body
+        url (str): Requested URL
+    """
+    
+    def __init__(self, status, text="", url=None):
+        super().__init__(f"Request failed with status {status}")
+        self.status = status
+        self.text = text
+        self.url = url
+
+class CloneError(DuplicateError):
+    """
+    A clone finished with failed items or a target that differs from the source
+    
+    Attributes:
+        result (CloneResult): Everything the clone did create
+    """
+    
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+defaultConfig = {
+    "token": "",
+    "colors": {
+        "success": "red",
+        "error": "red",
+        "info": "red",
+        "warning": "red",
+        "default": "red"
+    }
+}
+
+def validateConfig(data):
+    """
+    Checks the structure and setting types of a loaded configuration
+    
+    Args:
+        data (dict): Parsed config.json contents
+    
+    Returns:
+        list: Human readable problems, empty if the config is valid
+    """
+    if not isinstance(data, dict):
+        return ["config must be a JSON object"]
+    
+    problems = []
+    
+    if not isinstance(data.get("token", ""), str):
+        problems.append("token must be a string")
+    if not isinstance(data.get("colors", {}), dict):
+        problems.append("colors must be an object")
+        
+    settings = data.get("settings", {})
+    
+    if not isinstance(settings, dict):
+        return problems + ["settings must be an object"]
+    
+    minimums = {
+        "max_retries": 1,
+        "retry_delay": 0,
+        "retry_max_delay": 0,
+        "retry_budget": 0,
+        "max_concurrency": 1,
+        "batch_workers": 1,
+        "emoji_prefetch": 1,
+        "emoji_max_bytes": 1024,
+        "icon_max_bytes": 1024,
+        "image_workers": 1,
+        "asset_cache_size_mb": 0,
+        "plan_latency": 0,
+        "progress_interval": 0.1,
+        "progress_refresh": 0.1,
+        "request_timeout": 0,
+        "connect_timeout": 0,
+        "api_connections": 1,
+        "cdn_connections": 1,
+    }
+    
+    for name, minimum in minimums.items():
+        value = settings.get(name, minimum)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+            problems.append(f"settings.{name} must be a number >= {minimum}")
+            
+    if not isinstance(settings.get("filters", {}), dict):
+        problems.append("settings.filters must be an object")
+    if settings.get("log_level", "default") not in Logger.levels:
+        problems.append(f"settings.log_level must be one of {', '.join(Logger.levels)}")
+        
+    return problems
+
+class Config(dict):
+    """
+    Configuration loaded once from config.json and shared by every component.
+    
+    Behaves like the parsed JSON dict. With settings.watch_config enabled, a
+    background thread reloads it whenever the file changes on disk.
+    
+    Attributes:
+        path (str): Path of the config file
+        mtime (float): Modification time of the loaded file
+    """
+    
+    def __init__(self, path="config.json"):
+        super().__init__()
+        self.path = path
+        self.mtime = None
+        self.watcher = None
+        self.reload()
+
+    @property
+    def settings(self):
+        return self.get("settings", {})
+
+    def reload(self):
+        """
+        Read, validate and apply the config file, creating a default one if missing
+        
+        Raises:
+            ConfigError: If the file is not valid JSON or fails validation
+        """
+        try:
+            with open(self.path, "r") as configFile:
+                data = json.load(configFile)
+        except FileNotFoundError:
+            logMessage("Config file not found. Creating default config...", "error")
+            data = json.loads(json.dumps(defaultConfig))
+            with open(self.path, "w") as configFile:
+                json.dump(data, configFile, indent=4)
+        except json.JSONDecodeError as e:
+            raise ConfigError(f"Invalid config file: {e}")
+        
+        problems = validateConfig(data)
+        
+        if problems:
+            raise ConfigError(f"Invalid config file: {'; '.join(problems)}")
+        
+        self.update(data)
+        for key in [key for key in self if key not in data]:
+            del self[key]
+            
+        self.mtime = os.path.getmtime(self.path)
+        logger.configure(self)
+
+    def save(self):
+        """
+        Write the current configuration back to the config file
+        """
+        with open(self.path, "w") as configFile:
+            json.dump(dict(self), configFile, indent=4)
+        self.mtime = os.path.getmtime(self.path)
+
+    def watch(self, interval=1.0):
+        """
+        Start a daemon thread that reloads the config when the file changes
+        
+        Args:
+            interval (float): Seconds between modification time checks
+        """
+        if self.watcher:
+            return
+        
+        def poll():
+            while True:
+                sleep(interval)
+                
+                try:
+                    mtime = os.path.getmtime(self.path)
+                except OSError:
+                    continue
+                
+                if mtime == self.mtime:
+                    continue
+                
+                self.mtime = mtime
+                
+                try:
+                    self.reload()
+                    logMessage("Reloaded config.json", "info")
+                except ValueError as e:
+                    logMessage(f"Keeping previous config: {e}", "warning")
+                    
+        self.watcher = threading.Thread(target=poll, name="config-watcher", daemon=True)
+        self.watcher.start()
+
+activeConfig = None
+
+def loadConfig():
+    """
+    Returns the shared configuration, loading config.json on first use only.
+    """
+    global activeConfig
+    
+    if activeConfig is None:
+        try:
+            activeConfig = Config()
+        except ValueError as e:
+            logMessage(str(e), "error")
+            logger.flush()
+            sys.exit(1)
+            
+        if activeConfig.settings.get("watch_config", False):
+            activeConfig.watch()
+            
+    return activeConfig
+
+logFloor = contextvars.ContextVar("logFloor", default=0)
+
+class Logger:
+    """
+    Buffered, level-filtered sink behind logMessage.
+    
+    Messages below settings.log_level, or below the logFloor of the task
+    logging them, are dropped before any formatting.
+    The rest are buffered and written in batches: when the buffer fills up,
+    when flushInterval has passed, or right away for warnings and errors.
+    
+    Attributes:
+        threshold (int): Minimum level that is written
+        buffer (list): Formatted lines waiting to be written
+    """
+    
+    levels = {"default": 10, "success": 15, "info": 20, "warning": 30, "error": 40}
+    
+    colorCodes = {"white": "\033[97m", "green": "\033[92m", "red": "\033[31m", "cyan": "\033[36m", "yellow": "\033[93m", "reset": "\033[0m"}
+    
+    prefixes = {
+        "success": ("green", "+"),
+        "error": ("red", "-"),
+        "info": ("cyan", ">"),
+        "warning": ("yellow", "*"),
+        "default": ("white", "·"),
+    }
+    
+    def __init__(self, bufferSize=64, flushInterval=0.25, colors=None):
+        self.setColors(sys.stdout.isatty() if colors is None else colors)
+        self.bufferSize = bufferSize
+        self.flushInterval = flushInterval
+        self.threshold = self.levels["default"]
+        self.buffer = []
+        self.lastFlush = monotonic()
+        self.lastSecond = None
+        self.timestamp = ""
+        self.lock = threading.Lock()
+
+    def setColors(self, enabled):
+        """
+        Turn ANSI colors in log lines on or off
+        
+        Args:
+            enabled (bool): Whether to color prefixes and timestamps
+        """
+        self.colors = {name: code if enabled else "" for name, code in self.colorCodes.items()}
+        self.prefixMap = {
+            level: f"[{self.colors[color]}{symbol}{self.colors['white']}]"
+            for level, (color, symbol) in self.prefixes.items()
+        }
+
+    def configure(self, config):
+        """
+        Apply the log level from the configuration
+        
+        Args:
+            config (dict): Loaded configuration
+        """
+        self.threshold = self.levels.get(config.get("settings", {}).get("log_level", "default"), 10)
+
+    def isEnabled(self, level):
+        return self.levels.get(level, 10) >= max(self.threshold, logFloor.get())
+
+    def log(self, text, level="default"):
+        """
+        Format and buffer a log line if its level is enabled
+        
+        Args:
+            text (str): The message to display
+            level (str): Message level (success, error, info, warning, or default)
+        """
+        severity = self.levels.get(level, 10)
+        
+        if severity < self.threshold or severity < logFloor.get():
+            return
+        
+        now = time()
+        
+        if int(now) != self.lastSecond:
+            self.lastSecond = int(now)
+            self.timestamp = f"{self.colors['white']}[{self.colors['cyan']}{strftime('%H:%M:%S')}{self.colors['white']}]"
+            
+        prefix = self.prefixMap.get(level, self.prefixMap["default"])
+        
+        if "[" in text:
+            text = (text.replace("[+]", self.prefixMap["success"])
+                        .replace("[-]", self.prefixMap["error"])
+                        .replace("[*]", self.prefixMap["warning"])
+                        .replace("[>]", self.prefixMap["info"]))
+            
+        with self.lock:
+            self.buffer.append(f"{self.timestamp} {prefix} {text}{self.colors['reset']}")
+            
+        if (severity >= self.levels["warning"]
+                or len(self.buffer) >= self.bufferSize
+                or monotonic() - self.lastFlush >= self.flushInterval):
+            self.flush()
+
+    def flush(self):
+        """
+        Write every buffered line to stdout
+        """
+        with self.lock:
+            lines, self.buffer = self.buffer, []
+            self.lastFlush = monotonic()
+            
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+
+logger = Logger()
+atexit.register(logger.flush)
+
+def logMessage(text, level="default"):
+    """
+    Prints a formatted log message with timestamp and color coding
+    
+    Args:
+        text (str): The message to display
+        level (str): Message level (success, error, info, warning, or default)
+    """
+    logger.log(text, level)
+
+def encodeImagePayload(fields, data, mime, key="image"):
+    """
+    Builds a JSON request body with an image embedded as a data URI
+    
+    The image is base64-encoded once, straight into the final body, instead
+    of going through a decoded str and a second copy in json.dumps.
+    
+    Args:
+        fields (dict): Other JSON fields of the payload
+        data (bytes): Raw image bytes
+        mime (str): MIME type of the image
+        key (str): Name of the field holding the data URI
+    
+    Returns:
+        bytes: Encoded JSON body
+    """
+    head = json.dumps(fields)[:-1]
+    separator = ", " if fields else ""
+    
+    return b"".join((
+        f'{head}{separator}"{key}": "data:{mime};base64,'.encode(),
+        b64encode(data),
+        b'"}',
+    ))
+
+imageSignatures = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+
+def sniffImage(data):
+    """
+    Detects an image format from its leading bytes
+    
+    Args:
+        data (bytes): Raw image bytes
+    
+    Returns:
+        str: MIME type, or None if the format is not recognised
+    """
+    for signature, mime in imageSignatures:
+        if data.startswith(signature):
+            return mime
+        
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    
+    return None
+
+def normalizeImage(data, maxBytes, maxSide):
+    """
+    Transcodes an image into a format and size the API accepts
+    
+    Animated images become GIFs and still images PNGs. The image is scaled
+    down to maxSide and then further, a quarter at a time, until it fits in
+    maxBytes. Runs in an image worker process, so Pillow is imported here.
+    
+    Args:
+        data (bytes): Raw image bytes in any format Pillow reads
+        maxBytes (int): Size limit of the encoded image
+        maxSide (int): Largest allowed width or height
+    
+    Returns:
+        tuple: (encoded bytes, MIME type)
+    """
+    from PIL import Image, ImageSequence
+    
+    image = Image.open(io.BytesIO(data))
+    animated = getattr(image, "is_animated", False)
+    frames = [frame.convert("RGBA") for frame in ImageSequence.Iterator(image)] if animated else [image.convert("RGBA")]
+    durations = [frame.info.get("duration", 100) for frame in ImageSequence.Iterator(image)] if animated else None
+    side = min(maxSide, max(image.size))
+    
+    while True:
+        resized = []
+        
+        for frame in frames:
+            frame = frame.copy()
+            frame.thumbnail((side, side))
+            resized.append(frame)
+            
+        output = io.BytesIO()
+        
+        if animated:
+            resized[0].save(output, "GIF", save_all=True, append_images=resized[1:], duration=durations,
+                            loop=image.info.get("loop", 0), disposal=2, optimize=True)
+        else:
+            resized[0].save(output, "PNG", optimize=True)
+            
+        if output.tell() <= maxBytes or side <= 16:
+            return output.getvalue(), "image/gif" if animated else "image/png"
+        
+        side = side * 3 // 4
+
+imagePool = None
+
+def getImagePool(workers=None):
+    """
+    Gets the process pool for image transcoding, starting it on first use
+    
+    Args:
+        workers (int): Worker processes, defaults to the CPU count
+    
+    Returns:
+        ProcessPoolExecutor: Shared image worker pool
+    """
+    global imagePool
+    
+    if imagePool is None:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        imagePool = ProcessPoolExecutor(max_workers=workers)
+        atexit.register(imagePool.shutdown, cancel_futures=True)
+        
+    return imagePool
+
+def getIconAsset(guild, cdnUrl="https://cdn.discordapp.com"):
+    """
+    Get the cache key and CDN URL of a server icon
+    
+    Animated icons (hash starting with a_) are fetched as GIF, others as PNG.
+    
+    Args:
+        guild (Guild): Server model
+        cdnUrl (str): Base URL of the CDN
+    
+    Returns:
+        tuple: (asset key, CDN URL)
+    """
+    extension = "gif" if guild.icon.startswith("a_") else "png"
+    
+    return (
+        f"icon-{guild.icon}-512.{extension}",
+        f"{cdnUrl}/icons/{guild.id}/{guild.icon}.{extension}?size=512",
+    )
+
+def getEmojiAsset(emoji, cdnUrl="https://cdn.discordapp.com"):
+    """
+    Get the cache key, CDN URL and MIME type of an emoji image
+    
+    Args:
+        emoji (Emoji): Emoji model
+        cdnUrl (str): Base URL of the CDN
+    
+    Returns:
+        tuple: (asset key, CDN URL, MIME type)
+    """
+    extension, mime = ("gif", "image/gif") if emoji.animated else ("png", "image/png")
+    
+    return (
+        f"emoji-{emoji.id}.{extension}",
+        f"{cdnUrl}/emojis/{emoji.id}.{extension}",
+        mime,
+    )
+
+SNAPSHOT_VERSION = 1
+
+def saveSnapshot(path, serverData, assets):
+    """
+    Writes a versioned, gzip-compressed JSON snapshot of a scraped server
+    
+    Args:
+        path (str): Snapshot file path
+        serverData (dict): Output of ServerScraper.collectServerData
+        assets (dict): Asset key -> raw bytes for the icon and emojis
+    """
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created": time(),
+        "fingerprint": Guild.fromData(serverData).fingerprintHash(),
+        "server": serverData,
+        "assets": {key: b64encode(content).decode("ascii") for key, content in assets.items()},
+    }
+    
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        
+    with gzip.open(path, "wt", encoding="utf-8") as snapshotFile:
+        json.dump(snapshot, snapshotFile, separators=(",", ":"))
+
+def loadSnapshot(path):
+    """
+    Reads a snapshot written by saveSnapshot
+    
+    Args:
+        path (str): Snapshot file path
+    
+    Returns:
+        tuple: (server data, assets dict of key -> raw bytes, source fingerprint
+            hash stored with it, None for snapshots written without one)
+    
+    Raises:
+        SnapshotError: If the snapshot version is not supported
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as snapshotFile:
+        snapshot = json.load(snapshotFile)
+        
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version: {snapshot.get('version')}")
+    
+    assets = {key: b64decode(content) for key, content in snapshot.get("assets", {}).items()}
+    return snapshot["server"], assets, snapshot.get("fingerprint")
+
+def getSnapshotFingerprint(path):
+    """
+    Reads the source fingerprint stored in an existing snapshot
+    
+    Args:
+        path (str): Snapshot file path
+    
+    Returns:
+        str: Fingerprint hash, or None if there is no readable snapshot with one at path
+    """
+    try:
+        return loadSnapshot(path)[2]
+    except (OSError, ValueError, EOFError):
+        return None
+
+def filterServerData(serverData, filters):
+    """
+    Narrows scraped server data down to the parts selected by a filter spec
+    
+    Categories match by ID or name, roles by case-insensitive glob pattern.
+    Children of removed categories are removed with them, categories left
+    empty by channel_types are dropped, and role overwrites pointing at
+    removed roles are pruned. @everyone and member overwrites are always kept.
+    
+    Args:
+        serverData (dict): collectServerData output
+        filters (dict): Any of categories, exclude_categories, channel_types,
+            roles, exclude_roles (lists) and emojis (bool)
+    
+    Returns:
+        dict: Filtered copy of serverData, marked "filtered" if anything was selected
+    """
+    if not any(value not in (None, [], True) for value in filters.values()):
+        return serverData
+    
+    def matchesCategory(channel, selectors):
+        return channel["id"] in selectors or channel["name"].lower() in selectors
+    
+    def matchesRole(role, patterns):
+        return any(fnmatch.fnmatchcase(role["name"].lower(), pattern.lower()) for pattern in patterns)
+    
+    includeCategories = {str(selector).lower() for selector in filters.get("categories") or []}
+    excludeCategories = {str(selector).lower() for selector in filters.get("exclude_categories") or []}
+    channelTypes = set(filters.get("channel_types") or [])
+    
+    categories = {
+        channel["id"]: channel for channel in serverData["channels"]
+        if channel["type"] == 4
+        and (not includeCategories or matchesCategory(channel, includeCategories))
+        and not matchesCategory(channel, excludeCategories)
+    }
+    channels = [
+        channel for channel in serverData["channels"]
+        if channel["type"] != 4
+        and (channel.get("parent_id") in categories or (not channel.get("parent_id") and not includeCategories))
+        and (not channelTypes or channel["type"] in channelTypes)
+    ]
+    
+    if channelTypes and 4 not in channelTypes:
+        parents = {channel.get("parent_id") for channel in channels}
+        categories = {channelId: channel for channelId, channel in categories.items() if channelId in parents}
+        
+    roles = [
+        role for role in serverData["roles"]
+        if role["name"] == "@everyone" or (
+            (not filters.get("roles") or matchesRole(role, filters["roles"]))
+            and not matchesRole(role, filters.get("exclude_roles") or [])
+        )
+    ]
+    roleIds = {role["id"] for role in roles}
+    
+    def pruneOverwrites(channel):
+        overwrites = [
+            overwrite for overwrite in channel.get("permission_overwrites", [])
+            if overwrite["type"] not in (0, "role") or overwrite["id"] in roleIds
+        ]
+        return {**channel, "permission_overwrites": overwrites}
+    
+    filtered = {
+        **serverData,
+        "channels": [pruneOverwrites(channel) for channel in list(categories.values()) + channels],
+        "roles": roles,
+        "emojis": serverData.get("emojis", []) if filters.get("emojis", True) else [],
+        "filtered": True,
+    }
+    
+    logMessage(
+        f"Filters selected {len(categories)}/{sum(channel['type'] == 4 for channel in serverData['channels'])} categories, "
+        f"{len(channels)}/{sum(channel['type'] != 4 for channel in serverData['channels'])} channels, "
+        f"{len(roles)}/{len(serverData['roles'])} roles and "
+        f"{len(filtered['emojis'])}/{len(serverData.get('emojis', []))} emojis",
+        "info",
+    )
+    return filtered
+
+@dataclass(frozen=True, slots=True)
+class Overwrite:
+    """
+    Permission overwrite of a source channel
+    
+    Attributes:
+        id (str): Role or member ID the overwrite applies to
+        type (int): 0 for a role, 1 for a member
+        allow (str): Allowed permission bits
+        deny (str): Denied permission bits
+    """
+    id: str
+    type: int
+    allow: str
+    deny: str
+
+    @property
+    def isRole(self):
+        return self.type == 0
+
+    @classmethod
+    def fromData(cls, data):
+        return cls(str(data["id"]), 0 if data["type"] in (0, "role") else 1, str(data.get("allow", "0")), str(data.get("deny", "0")))
+
+    def toData(self, targetId=None):
+        """
+        Builds the API form of the overwrite
+        
+        Args:
+            targetId: ID to put in place of the source ID, such as a target role ID
+        
+        Returns:
+            dict: Overwrite payload
+        """
+        return {"id": self.id if targetId is None else targetId, "type": self.type, "allow": self.allow, "deny": self.deny}
+
+@dataclass(frozen=True, slots=True)
+class Role:
+    """
+    Source role, with only the fields a clone sends
+    """
+    id: str
+    name: str
+    permissions: str
+    position: int
+    color: int = 0
+    hoist: bool = False
+    mentionable: bool = False
+    managed: bool = False
+
+    @classmethod
+    def fromData(cls, data):
+        return cls(
+            str(data["id"]), data["name"], str(data.get("permissions", "0")), data.get("position", 0),
+            data.get("color", 0), data.get("hoist", False), data.get("mentionable", False), data.get("managed", False),
+        )
+
+    def toData(self):
+        return {
+            "id": self.id, "name": self.name, "permissions": self.permissions, "position": self.position,
+            "color": self.color, "hoist": self.hoist, "mentionable": self.mentionable, "managed": self.managed,
+        }
+
+@dataclass(frozen=True, slots=True)
+class Channel:
+    """
+    Source channel or category, with only the fields a clone sends
+    
+    Attributes:
+        apiFields (dict): API field name -> attribute for the plain fields
+    """
+    id: str
+    name: str
+    type: int
+    position: int = 0
+    parentId: str = None
+    topic: str = None
+    nsfw: bool = False
+    rateLimitPerUser: int = 0
+    bitrate: int = None
+    userLimit: int = None
+    overwrites: tuple = ()
+
+    apiFields = {
+        "name": "name",
+        "topic": "topic",
+        "nsfw": "nsfw",
+        "rate_limit_per_user": "rateLimitPerUser",
+        "bitrate": "bitrate",
+        "user_limit": "userLimit",
+    }
+
+    @property
+    def isCategory(self):
+        return self.type == 4
+
+    @classmethod
+    def fromData(cls, data):
+        return cls(
+            str(data["id"]), data["name"], data["type"], data.get("position") or 0, data.get("parent_id"),
+            data.get("topic"), data.get("nsfw", False), data.get("rate_limit_per_user") or 0,
+            data.get("bitrate"), data.get("user_limit"),
+            tuple(Overwrite.fromData(overwrite) for overwrite in data.get("permission_overwrites") or []),
+        )
+
+    def toData(self):
+        data = {field: getattr(self, attribute) for field, attribute in self.apiFields.items()}
+        data.update({
+            "id": self.id, "type": self.type, "position": self.position, "parent_id": self.parentId,
+            "permission_overwrites": [overwrite.toData() for overwrite in self.overwrites],
+        })
+        return data
+
+@dataclass(frozen=True, slots=True)
+class Emoji:
+    """
+    Source custom emoji
+    """
+    id: str
+    name: str
+    animated: bool = False
+    roles: tuple = ()
+
+    @classmethod
+    def fromData(cls, data):
+        return cls(str(data["id"]), data["name"], data.get("animated", False), tuple(data.get("roles") or ()))
+
+    def toData(self):
+        return {"id": self.id, "name": self.name, "animated": self.animated, "roles": list(self.roles)}
+
+@dataclass(frozen=True, slots=True)
+class Guild:
+    """
+    Immutable model of a scraped server, loaded once and shared by every clone of it
+    
+    Holds only the fields ServerCreator uses, plus lookup tables built at
+    load time. Nothing here is ever changed by a clone: source -> target ID
+    translation lives in each ServerCreator's roleMap and channelMap, so one
+    Guild can feed any number of concurrent clones.
+    
+    Attributes:
+        roleById (Mapping): Role ID -> Role
+        channelById (Mapping): Channel ID -> Channel
+        childrenByParent (Mapping): Category ID (None for top level) -> its channels by position
+        overwritesByTarget (Mapping): Role or member ID -> (channel ID, Overwrite) pairs
+        rolesByPosition (tuple): Roles from the top of the hierarchy down
+        channelsByPosition (tuple): Channels by position
+        createOrder (tuple): Categories, then other channels, each by position
+        everyone (Role): The @everyone role, or None
+    """
+    id: str
+    name: str
+    icon: str = None
+    features: tuple = ("APPLICATION_COMMAND_PERMISSIONS_V2", "COMMUNITY")
+    verificationLevel: int = 1
+    defaultMessageNotifications: int = 1
+    explicitContentFilter: int = 2
+    roles: tuple = ()
+    channels: tuple = ()
+    emojis: tuple = ()
+    filtered: bool = False
+    roleById: Mapping = field(init=False, repr=False, compare=False)
+    channelById: Mapping = field(init=False, repr=False, compare=False)
+    childrenByParent: Mapping = field(init=False, repr=False, compare=False)
+    overwritesByTarget: Mapping = field(init=False, repr=False, compare=False)
+    rolesByPosition: tuple = field(init=False, repr=False, compare=False)
+    channelsByPosition: tuple = field(init=False, repr=False, compare=False)
+    createOrder: tuple = field(init=False, repr=False, compare=False)
+    everyone: Role = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        channelsByPosition = tuple(sorted(self.channels, key=lambda channel: channel.position))
+        childrenByParent = {}
+        overwritesByTarget = {}
+        
+        for channel in channelsByPosition:
+            childrenByParent.setdefault(None if channel.isCategory else channel.parentId, []).append(channel)
+            
+            for overwrite in channel.overwrites:
+                overwritesByTarget.setdefault(overwrite.id, []).append((channel.id, overwrite))
+                
+        indexes = {
+            "roleById": MappingProxyType({role.id: role for role in self.roles}),
+            "channelById": MappingProxyType({channel.id: channel for channel in self.channels}),
+            "childrenByParent": MappingProxyType({parentId: tuple(children) for parentId, children in childrenByParent.items()}),
+            "overwritesByTarget": MappingProxyType({targetId: tuple(pairs) for targetId, pairs in overwritesByTarget.items()}),
+            "rolesByPosition": tuple(sorted(self.roles, key=lambda role: role.position, reverse=True)),
+            "channelsByPosition": channelsByPosition,
+            "createOrder": tuple(sorted(channelsByPosition, key=lambda channel: not channel.isCategory)),
+            "everyone": next((role for role in self.roles if role.name == "@everyone"), None),
+        }
+        
+        for name, value in indexes.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def fromData(cls, serverData):
+        """
+        Builds the model from collectServerData output or a snapshot
+        
+        Args:
+            serverData (dict): Raw server data
+        
+        Returns:
+            Guild: Immutable server model
+        """
+        info = serverData["info"]
+        
+        return cls(
+            str(info["id"]),
+            info["name"],
+            info.get("icon"),
+            tuple(serverData.get("features", ["APPLICATION_COMMAND_PERMISSIONS_V2", "COMMUNITY"])),
+            serverData.get("verification_level", 1),
+            serverData.get("default_message_notifications", 1),
+            serverData.get("explicit_content_filter", 2),
+            tuple(Role.fromData(role) for role in serverData.get("roles", [])),
+            tuple(Channel.fromData(channel) for channel in serverData.get("channels", [])),
+            tuple(Emoji.fromData(emoji) for emoji in serverData.get("emojis", [])),
+            serverData.get("filtered", False),
+        )
+
+    def toData(self):
+        """
+        Converts the model back into collectServerData form, for checkpoints
+        
+        Returns:
+            dict: Raw server data
+        """
+        return {
+            "info": {"id": self.id, "name": self.name, "icon": self.icon},
+            "channels": [channel.toData() for channel in self.channels],
+            "roles": [role.toData() for role in self.roles],
+            "emojis": [emoji.toData() for emoji in self.emojis],
+            "features": list(self.features),
+            "verification_level": self.verificationLevel,
+            "default_message_notifications": self.defaultMessageNotifications,
+            "explicit_content_filter": self.explicitContentFilter,
+            "filtered": self.filtered,
+        }
+
+    def fingerprint(self, includeManaged=True):
+        """
+        Builds a canonical, ID-free description of the structure a clone reproduces
+        
+        Roles are keyed by name, channels by parent category, type and name,
+        and emojis by name, with a #n suffix for repeated names. Overwrites
+        name their role instead of its ID, so a source and a finished clone
+        of it have equal fingerprints whatever IDs the target assigned.
+        
+        Args:
+            includeManaged (bool): Include integration-managed roles
+        
+        Returns:
+            dict: Key -> canonical value, JSON serializable
+        """
+        entries = {}
+        
+        def add(key, value):
+            count = 1
+            unique = key
+            
+            while unique in entries:
+                count += 1
+                unique = f"{key} #{count}"
+                
+            entries[unique] = value
+            
+        def subject(overwrite):
+            if not overwrite.isRole:
+                return f"member {overwrite.id}"
+            if overwrite.id == self.id:
+                return "role @everyone"
+            return f"role {self.roleById[overwrite.id].name}" if overwrite.id in self.roleById else f"role {overwrite.id}"
+        
+        roles = [role for role in self.rolesByPosition if includeManaged or not role.managed]
+        
+        for role in roles:
+            add(f"role {role.name}", [role.permissions, role.color, role.hoist, role.mentionable])
+            
+        entries["role order"] = [role.name for role in roles if role is not self.everyone]
+        
+        for parentId, children in self.childrenByParent.items():
+            parent = self.channelById[parentId].name if parentId in self.channelById else ""
+            
+            for channel in children:
+                overwrites = sorted([subject(overwrite), overwrite.allow, overwrite.deny] for overwrite in channel.overwrites)
+                fields = [getattr(channel, attribute) or None for field, attribute in Channel.apiFields.items() if field != "name"]
+                add(f"channel {parent}/{channel.type}/{channel.name}", fields + [overwrites])
+                
+            entries[f"channel order {parent}/"] = [channel.name for channel in children]
+            
+        for emoji in self.emojis:
+            add(f"emoji {emoji.name}", [emoji.animated])
+            
+        return entries
+
+    def fingerprintHash(self):
+        """
+        Hashes the fingerprint together with what it leaves out on purpose:
+        server settings, the icon and emoji IDs (a changed emoji image gets a
+        new ID)
+        
+        Two loads of a source with the same hash clone to the same result, so
+        scheduled runs can skip a source whose hash has not changed.
+        
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        content = {
+            "structure": self.fingerprint(),
+            "server": [self.name, self.icon, sorted(self.features), self.verificationLevel,
+                       self.defaultMessageNotifications, self.explicitContentFilter],
+            "emojis": sorted(emoji.id for emoji in self.emojis),
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def compareFingerprints(expected, actual, ignoreExtra=False):
+    """
+    Lists the differences between two Guild fingerprints
+    
+    Args:
+        expected (dict): Fingerprint of the source
+        actual (dict): Fingerprint of the target
+        ignoreExtra (bool): Do not report target entries missing from the source,
+            nor order differences they cause
+    
+    Returns:
+        dict: "missing", "extra" and "changed" lists of fingerprint keys
+    """
+    def isOrder(key):
+        return key == "role order" or key.startswith("channel order ")
+    
+    return {
+        "missing": [key for key in expected if key not in actual and not isOrder(key)],
+        "extra": [] if ignoreExtra else [key for key in actual if key not in expected and not isOrder(key)],
+        "changed": [
+            key for key, value in expected.items()
+            if key in actual and actual[key] != value and not (ignoreExtra and isOrder(key))
+        ],
+    }
+
+class RateLimiter:
+    """
+    Tracks Discord rate limit buckets from response headers and only waits
+    when a bucket has actually been used up.
+    
+    Discord groups routes into buckets identified by X-RateLimit-Bucket. Each
+    bucket is limited separately per major parameter (guild or channel ID),
+    so state is keyed by bucket hash plus major parameter.
+    
+    Attributes:
+        routeBuckets (dict): Route template -> bucket hash learned from responses
+        routeLimits (dict): Route template -> (limit, window seconds) seen at the start of a window
+        buckets (dict): Bucket key -> {"limit": int, "remaining": int, "resetAt": float}
+        globalResetAt (float): Monotonic time until which all requests must wait
+        maxConcurrency (int): Maximum requests in flight per route and major parameter
+        probes (dict): (route, major) -> Event set once the first request to it has finished
+    """
+    
+    majorResources = ("guilds", "channels", "webhooks")
+    
+    def __init__(self, maxConcurrency=5):
+        self.routeBuckets = {}
+        self.routeLimits = {}
+        self.buckets = {}
+        self.globalResetAt = 0.0
+        self.maxConcurrency = maxConcurrency
+        self.semaphores = {}
+        self.probes = {}
+
+    def _parseRoute(self, method, url):
+        """
+        Split a request into its route template and major parameter
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+        
+        Returns:
+            tuple: (route template, major parameter or None)
+        """
+        parts = URL(url).path.split("/")
+        major = None
+        
+        for index, part in enumerate(parts):
+            if index and parts[index - 1] == "templates":
+                parts[index] = "{code}"
+            elif part.isdigit():
+                if major is None and parts[index - 1] in self.majorResources:
+                    major = part
+                parts[index] = "{id}"
+                
+        return f"{method.upper()} {'/'.join(parts)}", major
+
+    def _getBucket(self, method, url):
+        """
+        Get the tracked state for the bucket a request belongs to
+        
+        Returns:
+            dict: Bucket state, or None if the route's bucket is not known yet
+        """
+        route, major = self._parseRoute(method, url)
+        bucketHash = self.routeBuckets.get(route)
+        
+        if bucketHash is None:
+            return None
+        
+        return self.buckets.get(f"{bucketHash}:{major}")
+
+    def describe(self, method, url):
+        """
+        Get the route template and bucket hash a request is reported under
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+        
+        Returns:
+            tuple: (route template, bucket hash or None if not known yet)
+        """
+        route = self._parseRoute(method, url)[0]
+        return route, self.routeBuckets.get(route)
+
+    def getDelay(self, method, url):
+        """
+        Get how long a request has to wait before it can be sent
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+        
+        Returns:
+            float: Seconds to wait, 0 if the request can go out right away
+        """
+        now = monotonic()
+        delay = max(self.globalResetAt - now, 0.0)
+        bucket = self._getBucket(method, url)
+        
+        if bucket and bucket["remaining"] <= 0 and bucket["resetAt"] > now:
+            delay = max(delay, bucket["resetAt"] - now)
+            
+        return delay
+
+    def getSemaphore(self, method, url):
+        """
+        Get the semaphore capping concurrent requests for a route
+        
+        The bucket hash is only known after the first response, so the cap is
+        keyed by route template and major parameter, which never spans buckets.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+        
+        Returns:
+            asyncio.Semaphore: Semaphore for this route
+        """
+        key = self._parseRoute(method, url)
+        
+        if key not in self.semaphores:
+            self.semaphores[key] = asyncio.Semaphore(self.maxConcurrency)
+            
+        return self.semaphores[key]
+
+    async def wait(self, method, url):
+        """
+        Wait until the bucket for this request has room, then reserve a slot
+        
+        Until a bucket is known, the first request to its route goes out
+        alone and the rest wait for release(): headers of responses to
+        requests sent before the bucket was known can't count each other.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+        """
+        if self._getBucket(method, url) is None:
+            key = self._parseRoute(method, url)
+            probe = self.probes.get(key)
+            
+            if probe is None:
+                self.probes[key] = asyncio.Event()
+            else:
+                await probe.wait()
+                
+        delay = self.getDelay(method, url)
+        
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.getDelay(method, url)
+            
+        bucket = self._getBucket(method, url)
+        
+        if bucket:
+            now = monotonic()
+            
+            if bucket["resetAt"] <= now:
+                window = self.routeLimits.get(self._parseRoute(method, url)[0], (None, 1.0))[1]
+                bucket["remaining"] = bucket["limit"]
+                bucket["resetAt"] = now + window
+            bucket["remaining"] -= 1
+
+    def release(self, method, url):
+        """
+        Let the requests held back by wait() go once a route's first request has finished
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+        """
+        probe = self.probes.get(self._parseRoute(method, url))
+        
+        if probe:
+            probe.set()
+
+    def update(self, method, url, response):
+        """
+        Update bucket state from the rate limit headers of a response
+        
+        Responses can land out of order, so while the locally tracked window
+        is still running a header "remaining" is only taken when it is not
+        higher than the local count; an older response reporting more room
+        would otherwise undo the decrements made by wait(). Once the local
+        window has reset, the headers are taken as they are.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+            response (Response): The API response
+        
+        Returns:
+            float: Seconds to wait before retrying if the response was a 429, else 0
+        """
+        headers = response.headers
+        now = monotonic()
+        route, major = self._parseRoute(method, url)
+        bucketHash = headers.get("X-RateLimit-Bucket")
+        
+        if bucketHash:
+            self.routeBuckets[route] = bucketHash
+            
+            try:
+                limit = int(headers.get("X-RateLimit-Limit", 1))
+                remaining = int(headers.get("X-RateLimit-Remaining", 1))
+                resetAfter = float(headers.get("X-RateLimit-Reset-After", 0))
+            except ValueError:
+                limit, remaining, resetAfter = 1, 1, 0.0
+                
+            bucket = self.buckets.get(f"{bucketHash}:{major}")
+            
+            if bucket is None or bucket["resetAt"] <= now or remaining <= bucket["remaining"]:
+                self.buckets[f"{bucketHash}:{major}"] = {
+                    "limit": limit,
+                    "remaining": remaining,
+                    "resetAt": now + resetAfter,
+                }
+            
+            if resetAfter > 0 and (remaining == limit - 1 or route not in self.routeLimits):
+                self.routeLimits[route] = (limit, resetAfter)
+            
+        if response.status_code != 429:
+            return 0.0
+        
+        try:
+            retryAfter = float(headers.get("Retry-After", 1))
+        except ValueError:
+            retryAfter = 1.0
+            
+        if headers.get("X-RateLimit-Global") == "true" or headers.get("X-RateLimit-Scope") == "global":
+            self.globalResetAt = max(self.globalResetAt, now + retryAfter)
+        else:
+            if not bucketHash:
+                bucketHash = self.routeBuckets.setdefault(route, route)
+                
+            self.buckets[f"{bucketHash}:{major}"] = {
+                "limit": self.buckets.get(f"{bucketHash}:{major}", {}).get("limit", 1),
+                "remaining": 0,
+                "resetAt": now + retryAfter,
+            }
+            
+        return retryAfter
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is sent again.
+    
+    Responses are classified as ok, rateLimited (429, the RateLimiter already
+    knows how long to wait for API requests; CDN downloads wait for
+    Retry-After and count it as a failed attempt), retryable (5xx, 408 and network errors) or fatal
+    (any other 4xx). Retryable failures back off exponentially with full
+    jitter, and every request gives up once its total time budget is spent.
+    
+    Attributes:
+        maxAttempts (int): Attempts per request, rate limited ones not included
+        baseDelay (float): Backoff before the first retry
+        maxDelay (float): Upper bound of a single backoff
+        budget (float): Seconds a request may take including every retry
+        retryFailures (bool): Whether retryable failures are retried at all
+    """
+    
+    retryableStatuses = (408, 500, 502, 503, 504)
+    
+    def __init__(self, settings=None):
+        settings = settings or {}
+        self.maxAttempts = settings.get("max_retries", 3)
+        self.baseDelay = settings.get("retry_delay", 1.5)
+        self.maxDelay = settings.get("retry_max_delay", 30.0)
+        self.budget = settings.get("retry_budget", 120.0)
+        self.retryFailures = settings.get("auto_retry_failed_requests", True)
+
+    def classify(self, response=None, error=None):
+        """
+        Classify the outcome of one attempt
+        
+        Args:
+            response (Response): The response, None if the request raised
+            error (Exception): The transport error the request raised
+        
+        Returns:
+            str: "ok", "rateLimited", "retryable" or "fatal"
+        """
+        if error is not None:
+            return "retryable" if isinstance(error, TransportError) else "fatal"
+        if response.status_code == 429:
+            return "rateLimited"
+        if response.status_code in self.retryableStatuses or response.status_code >= 500:
+            return "retryable"
+        if response.status_code >= 400:
+            return "fatal"
+        return "ok"
+
+    def getBackoff(self, attempt):
+        """
+        Get the jittered backoff before a retry
+        
+        Args:
+            attempt (int): Number of failed attempts so far, starting at 1
+        
+        Returns:
+            float: Seconds to wait
+        """
+        return uniform(0, min(self.maxDelay, self.baseDelay * 2 ** (attempt - 1)))
+
+    def getRetryAfter(self, response, attempt):
+        """
+        Get the wait before retrying a 429 that did not go through the RateLimiter
+        
+        Args:
+            response (Response): The 429 response
+            attempt (int): Number of failed attempts so far, starting at 1
+        
+        Returns:
+            float: Seconds from the Retry-After header, or the jittered backoff without one
+        """
+        try:
+            return max(float(response.headers["Retry-After"]), 0.0)
+        except (KeyError, ValueError):
+            return self.getBackoff(attempt)
+
+    def isUnsent(self, error):
+        """
+        Check whether a failed attempt can't have reached the server
+        
+        Args:
+            error (Exception): The transport error, None if a response arrived
+        
+        Returns:
+            bool: True if the request never left this machine
+        """
+        return isinstance(error, (ConnectError, ConnectTimeout, PoolTimeout))
+
+currentPhase = contextvars.ContextVar("currentPhase", default="other")
+
+def inPhase(name):
+    """
+    Tags every request a coroutine method makes with a clone phase
+    
+    The phase the caller had is restored when the method returns, so a
+    step never leaves its phase behind in the calling task.
+    
+    Args:
+        name (str): Phase name reported by RequestMetrics
+    
+    Returns:
+        callable: Decorator for async methods
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            token = currentPhase.set(name)
+            
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                currentPhase.reset(token)
+                
+        return wrapper
+    
+    return decorate
+
+class RequestMetrics:
+    """
+    Collects per-endpoint request metrics for one run and writes them out as
+    a JSON report and, optionally, a Prometheus textfile.
+    
+    Every attempt is recorded, including 429s and retries, and attributed to
+    the clone phase active in the calling task (see currentPhase).
+    
+    Attributes:
+        endpoints (dict): Route template -> counters, statuses and latency histogram
+        phases (dict): Phase -> request totals and first/last request time
+        startedAt (float): Wall-clock time the run started
+    """
+    
+    latencyBuckets = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self):
+        self.endpoints = {}
+        self.phases = {}
+        self.startedAt = time()
+        self.startedMonotonic = monotonic()
+
+    def record(self, route, bucket, response, latency, waited=0.0, retry=False):
+        """
+        Record one request attempt
+        
+        Args:
+            route (str): Route template, e.g. "POST /api/v9/guilds/{id}/roles"
+            bucket (str): Rate limit bucket hash, or None if not known yet
+            response (Response): The response received
+            latency (float): Seconds from sending the request to its response
+            waited (float): Seconds spent waiting on rate limits before sending
+            retry (bool): Whether this attempt retried an earlier one
+        """
+        bytesIn = len(response.content)
+        bytesOut = int(response.request.headers.get("Content-Length", 0))
+        now = monotonic() - self.startedMonotonic
+        endpoint = self.endpoints.setdefault(route, {
+            "bucket": None,
+            "requests": 0,
+            "statuses": {},
+            "retries": 0,
+            "seconds": 0.0,
+            "maxSeconds": 0.0,
+            "rateLimitWait": 0.0,
+            "bytesIn": 0,
+            "bytesOut": 0,
+            "histogram": [0] * len(self.latencyBuckets),
+        })
+        phase = self.phases.setdefault(currentPhase.get(), {
+            "requests": 0,
+            "retries": 0,
+            "seconds": 0.0,
+            "rateLimitWait": 0.0,
+            "bytesIn": 0,
+            "bytesOut": 0,
+            "firstAt": now - latency - waited,
+            "lastAt": now,
+        })
+        status = str(response.status_code)
+        
+        endpoint["bucket"] = bucket or endpoint["bucket"]
+        endpoint["statuses"][status] = endpoint["statuses"].get(status, 0) + 1
+        endpoint["maxSeconds"] = max(endpoint["maxSeconds"], latency)
+        
+        for index, bound in enumerate(self.latencyBuckets):
+            if latency <= bound:
+                endpoint["histogram"][index] += 1
+                break
+            
+        for totals in (endpoint, phase):
+            totals["requests"] += 1
+            totals["retries"] += int(retry)
+            totals["seconds"] += latency
+            totals["rateLimitWait"] += waited
+            totals["bytesIn"] += bytesIn
+            totals["bytesOut"] += bytesOut
+            
+        phase["lastAt"] = max(phase["lastAt"], now)
+
+    def report(self):
+        """
+        Build the run report
+        
+        Returns:
+            dict: Run totals, per-phase totals and per-endpoint metrics
+        """
+        round3 = lambda value: round(value, 3)
+        endpoints = []
+        
+        for route, endpoint in sorted(self.endpoints.items(), key=lambda item: -item[1]["seconds"]):
+            endpoints.append({
+                "route": route,
+                **{key: value for key, value in endpoint.items() if key != "histogram"},
+                "seconds": round3(endpoint["seconds"]),
+                "maxSeconds": round3(endpoint["maxSeconds"]),
+                "rateLimitWait": round3(endpoint["rateLimitWait"]),
+                "averageSeconds": round3(endpoint["seconds"] / endpoint["requests"]),
+                "histogram": dict(zip(map(str, self.latencyBuckets), endpoint["histogram"])),
+            })
+            
+        phases = {
+            name: {
+                **{key: value for key, value in phase.items() if key not in ("firstAt", "lastAt")},
+                "seconds": round3(phase["seconds"]),
+                "rateLimitWait": round3(phase["rateLimitWait"]),
+                "wallSeconds": round3(phase["lastAt"] - phase["firstAt"]),
+            }
+            for name, phase in self.phases.items()
+        }
+        
+        return {
+            "started": strftime("%Y-%m-%dT%H:%M:%S", localtime(self.startedAt)),
+            "durationSeconds": round3(monotonic() - self.startedMonotonic),
+            "requests": sum(endpoint["requests"] for endpoint in self.endpoints.values()),
+            "retries": sum(endpoint["retries"] for endpoint in self.endpoints.values()),
+            "rateLimitWait": round3(sum(endpoint["rateLimitWait"] for endpoint in self.endpoints.values())),
+            "phases": phases,
+            "endpoints": endpoints,
+        }
+
+    def writeReport(self, path):
+        """
+        Write the run report as JSON
+        
+        Args:
+            path (str): Report file path
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        
+        with open(path, "w") as reportFile:
+            json.dump(self.report(), reportFile, indent=4)
+
+    def writePrometheus(self, path):
+        """
+        Write the metrics in Prometheus text format for the node_exporter textfile collector
+        
+        The file is replaced atomically so the collector never reads a partial file.
+        
+        Args:
+            path (str): Textfile path, should end in .prom
+        """
+        def label(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        
+        lines = [
+            "# HELP duplicate_request_duration_seconds Discord API request latency.",
+            "# TYPE duplicate_request_duration_seconds histogram",
+        ]
+        
+        for route, endpoint in self.endpoints.items():
+            cumulative = 0
+            
+            for bound, count in zip(self.latencyBuckets, endpoint["histogram"]):
+                cumulative += count
+                lines.append(f'duplicate_request_duration_seconds_bucket{{route="{label(route)}",le="{bound}"}} {cumulative}')
+                
+            lines.append(f'duplicate_request_duration_seconds_bucket{{route="{label(route)}",le="+Inf"}} {endpoint["requests"]}')
+            lines.append(f'duplicate_request_duration_seconds_sum{{route="{label(route)}"}} {endpoint["seconds"]:.6f}')
+            lines.append(f'duplicate_request_duration_seconds_count{{route="{label(route)}"}} {endpoint["requests"]}')
+            
+        counters = (
+            ("duplicate_request_retries_total", "Request attempts that retried an earlier one.", "retries"),
+            ("duplicate_rate_limit_wait_seconds_total", "Seconds spent waiting on rate limits.", "rateLimitWait"),
+            ("duplicate_request_bytes_received_total", "Response body bytes.", "bytesIn"),
+            ("duplicate_request_bytes_sent_total", "Request body bytes.", "bytesOut"),
+        )
+        
+        lines += ["# HELP duplicate_requests_total Discord API requests by status.", "# TYPE duplicate_requests_total counter"]
+        
+        for route, endpoint in self.endpoints.items():
+            for status, count in endpoint["statuses"].items():
+                lines.append(f'duplicate_requests_total{{route="{label(route)}",bucket="{label(endpoint["bucket"] or "")}",status="{status}"}} {count}')
+                
+        for name, description, key in counters:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{route="{label(route)}"}} {endpoint[key]}' for route, endpoint in self.endpoints.items()]
+            
+        phaseGauges = (
+            ("duplicate_phase_requests", "Requests sent per clone phase.", "requests"),
+            ("duplicate_phase_request_seconds", "Summed request latency per clone phase.", "seconds"),
+            ("duplicate_phase_rate_limit_wait_seconds", "Summed rate limit wait per clone phase.", "rateLimitWait"),
+            ("duplicate_phase_wall_seconds", "Time from first to last request per clone phase.", "wallSeconds"),
+        )
+        phases = self.report()["phases"]
+        
+        for name, description, key in phaseGauges:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} gauge"]
+            lines += [f'{name}{{phase="{label(phase)}"}} {totals[key]}' for phase, totals in phases.items()]
+            
+        lines += [
+            "# HELP duplicate_run_timestamp_seconds Start time of the run.",
+            "# TYPE duplicate_run_timestamp_seconds gauge",
+            f"duplicate_run_timestamp_seconds {self.startedAt:.0f}",
+        ]
+        
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporaryPath = f"{path}.tmp"
+        
+        with open(temporaryPath, "w") as textFile:
+            textFile.write("\n".join(lines) + "\n")
+            
+        os.replace(temporaryPath, path)
+
+class CloneProgress:
+    """
+    Follows one clone against its request plan for progress displays.
+    
+    Every finished request of the creator is matched to the next planned
+    request with the same route, in plan order, so each phase knows how many
+    of its requests are done. Requests that were not planned (existence
+    checks, extra retries of the plan) only count towards throughput.
+    
+    Attributes:
+        creator (ServerCreator): Creator whose requests are followed
+        label (str): Prefix for summary lines, such as a batch job name
+        phases (dict): Phase -> {"done": int, "total": int}, in plan order
+        rateLimitWait (float): Seconds requests spent waiting on rate limits
+    """
+    
+    throughputWindow = 5.0
+    
+    def __init__(self, creator, planned, label=None):
+        self.creator = creator
+        self.label = label
+        self.phases = {}
+        self.pending = {}
+        self.completions = collections.deque()
+        self.requests = 0
+        self.latency = 0.0
+        self.rateLimitWait = 0.0
+        self.startedAt = monotonic()
+        
+        for request in planned:
+            self.phases.setdefault(request["phase"], {"done": 0, "total": 0})["total"] += 1
+            self.pending.setdefault(request["route"], collections.deque()).append(request)
+
+    def record(self, route, latency, waited):
+        """
+        Count one finished request
+        
+        Args:
+            route (str): Route template of the request
+            latency (float): Seconds the last attempt took
+            waited (float): Seconds all attempts waited on rate limits
+        """
+        now = monotonic()
+        self.requests += 1
+        self.latency += latency
+        self.rateLimitWait += waited
+        self.completions.append(now)
+        planned = self.pending.get(route)
+        
+        if planned:
+            self.phases[planned.popleft()["phase"]]["done"] += 1
+
+    def snapshot(self):
+        """
+        Get the current progress figures
+        
+        The ETA replays the requests still planned through estimateDuration,
+        with the rate limit windows seen so far and the observed latency.
+        
+        Returns:
+            dict: phases, requests, throughput (requests/s), rateLimitWait, elapsed and eta (seconds)
+        """
+        now = monotonic()
+        
+        while self.completions and now - self.completions[0] > self.throughputWindow:
+            self.completions.popleft()
+            
+        remaining = [request for planned in self.pending.values() for request in planned]
+        latency = self.latency / self.requests if self.requests else None
+        eta = self.creator.estimateDuration(remaining, self.creator.rateLimiter.routeLimits, latency)["total"] if remaining else 0.0
+        
+        return {
+            "phases": self.phases,
+            "requests": self.requests,
+            "throughput": len(self.completions) / min(self.throughputWindow, max(now - self.startedAt, 0.001)),
+            "rateLimitWait": self.rateLimitWait,
+            "elapsed": now - self.startedAt,
+            "eta": eta,
+        }
+
+    def summary(self):
+        """
+        Format the current progress as one line
+        
+        Returns:
+            str: Summary line
+        """
+        snapshot = self.snapshot()
+        phases = ", ".join(f"{name} {phase['done']}/{phase['total']}" for name, phase in snapshot["phases"].items())
+        
+        return (
+            f"{self.label + ': ' if self.label else ''}{phases or 'no planned requests'} | "
+            f"{snapshot['throughput']:.1f} req/s | rate limit wait {snapshot['rateLimitWait']:.1f}s | "
+            f"ETA {formatSeconds(snapshot['eta'])}"
+        )
+
+    def logSummary(self, progress=None):
+        logMessage(self.summary(), "info")
+
+    async def run(self, coroutine, render=None, interval=None):
+        """
+        Run a clone coroutine while a background task renders the progress
+        
+        Rendering happens every interval seconds, however many requests
+        finish in between. Per-item success lines of this clone are muted
+        meanwhile through logFloor, which only applies to the clone's own
+        task and the tasks it starts; info, warnings and errors still show,
+        as does everything logged by other clones running alongside.
+        
+        Args:
+            coroutine: executeAll or syncStructure of the creator
+            render (callable): Called with this tracker, defaults to a summary log line
+            interval (float): Seconds between renders, defaults to settings.progress_interval
+        
+        Returns:
+            The coroutine's result
+        """
+        render = render or self.logSummary
+        interval = interval or self.creator.settings.get("progress_interval", 5.0)
+        
+        async def refresh():
+            while True:
+                await asyncio.sleep(interval)
+                render(self)
+                
+        self.creator.progress = self
+        refresher = asyncio.create_task(refresh())
+        floor = logFloor.set(logger.levels["info"])
+        
+        try:
+            return await coroutine
+        finally:
+            refresher.cancel()
+            logFloor.reset(floor)
+            self.creator.progress = None
+            render(self)
+
+def formatSeconds(seconds):
+    """
+    Format a duration as m:ss, or h:mm:ss from an hour up
+    
+    Args:
+        seconds (float): Duration in seconds
+    
+    Returns:
+        str: Formatted duration
+    """
+    minutes, seconds = divmod(int(math.ceil(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
+
+class AssetCache:
+    """
+    On-disk, content-addressed cache for CDN assets like icons and emojis.
+    
+    Blobs are stored under their SHA-256 digest and an index maps asset keys
+    (emoji ID, icon hash) to digests. Reads verify the digest, and the least
+    recently used entries are evicted once the cache grows past maxBytes.
+    
+    Attributes:
+        directory (str): Cache directory
+        maxBytes (int): Maximum total size of cached blobs
+        index (dict): Asset key -> {"digest": str, "size": int, "lastUsed": float}
+        hits (int): Number of assets served from disk this run
+        misses (int): Number of assets downloaded this run
+    """
+    
+    def __init__(self, directory=".cache/assets", maxBytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.indexPath = os.path.join(directory, "index.json")
+        self.hits = 0
+        self.misses = 0
+        
+        os.makedirs(os.path.join(directory, "blobs"), exist_ok=True)
+        
+        try:
+            with open(self.indexPath, "r") as indexFile:
+                self.index = json.load(indexFile)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.index = {}
+
+    def _blobPath(self, digest):
+        return os.path.join(self.directory, "blobs", digest)
+
+    def read(self, key):
+        """
+        Read an asset from disk, verifying its integrity
+        
+        Args:
+            key (str): Asset key
+        
+        Returns:
+            bytes: Asset content, or None if missing or corrupted
+        """
+        entry = self.index.get(key)
+        
+        if not entry:
+            return None
+        
+        try:
+            with open(self._blobPath(entry["digest"]), "rb") as blobFile:
+                content = blobFile.read()
+        except OSError:
+            content = None
+            
+        if content is None or hashlib.sha256(content).hexdigest() != entry["digest"]:
+            self._remove(key)
+            return None
+        
+        entry["lastUsed"] = time()
+        return content
+
+    def write(self, key, content):
+        """
+        Store an asset on disk and evict old entries if over the size limit
+        
+        Args:
+            key (str): Asset key
+            content (bytes): Asset content
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        blobPath = self._blobPath(digest)
+        
+        if not os.path.exists(blobPath):
+            temporaryPath = f"{blobPath}.tmp"
+            with open(temporaryPath, "wb") as blobFile:
+                blobFile.write(content)
+            os.replace(temporaryPath, blobPath)
+            
+        self.index[key] = {"digest": digest, "size": len(content), "lastUsed": time()}
+        self._evict()
+
+    def _remove(self, key):
+        """
+        Drop a key from the index, deleting its blob if nothing else uses it
+        """
+        entry = self.index.pop(key, None)
+        
+        if entry and not any(other["digest"] == entry["digest"] for other in self.index.values()):
+            try:
+                os.remove(self._blobPath(entry["digest"]))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """
+        Evict least recently used entries until the cache fits in maxBytes
+        """
+        sizes = {entry["digest"]: entry["size"] for entry in self.index.values()}
+        totalSize = sum(sizes.values())
+        
+        for key in sorted(self.index, key=lambda k: self.index[k]["lastUsed"]):
+            if totalSize <= self.maxBytes:
+                break
+            
+            digest = self.index[key]["digest"]
+            self._remove(key)
+            
+            if digest not in {entry["digest"] for entry in self.index.values()}:
+                totalSize -= sizes[digest]
+
+    async def fetch(self, download, key, url):
+        """
+        Get an asset from the cache, downloading and storing it on a miss
+        
+        Args:
+            download (callable): Coroutine function fetching a URL and returning its Response
+            key (str): Asset key
+            url (str): CDN URL of the asset
+        
+        Returns:
+            tuple: (content or None, HTTP status code, 200 on a cache hit)
+        """
+        content = self.read(key)
+        
+        if content is not None:
+            self.hits += 1
+            return content, 200
+        
+        self.misses += 1
+        response = await download(url)
+        
+        if response.status_code != 200:
+            return None, response.status_code
+        
+        self.write(key, response.content)
+        return response.content, 200
+
+    def save(self):
+        """
+        Persist the cache index to disk
+        """
+        temporaryPath = f"{self.indexPath}.tmp"
+        with open(temporaryPath, "w") as indexFile:
+            json.dump(self.index, indexFile)
+        os.replace(temporaryPath, self.indexPath)
+
+class Checkpoint:
+    """
+    Append-only journal of completed clone steps, one JSON object per line.
+    
+    The first line is a start header holding the source server data, every
+    following line records a finished step and its source -> target IDs,
+    so an interrupted clone can be rebuilt and continued with --resume.
+    
+    Attributes:
+        path (str): Checkpoint file path
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            
+        self.file = open(path, "a", encoding="utf-8")
+
+    def record(self, entry):
+        """
+        Append an entry and flush it to disk right away
+        
+        Args:
+            entry (dict): Journal entry
+        """
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def load(path):
+        """
+        Read every entry of a checkpoint file
+        
+        A torn last line from a crash mid-write is ignored.
+        
+        Args:
+            path (str): Checkpoint file path
+        
+        Returns:
+            list: Journal entries in order
+        """
+        entries = []
+        
+        with open(path, "r", encoding="utf-8") as checkpointFile:
+            for line in checkpointFile:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+                
+        return entries
+
+class HttpPool:
+    """
+    Keep-alive HTTP clients shared by every scraper and creator in a run.
+    
+    API requests go through one client, multiplexed over HTTP/2 unless
+    settings.http2 is false (the h2 package comes with httpx[http2] from
+    requirements.txt; without it HTTP/1.1 is used), and CDN downloads through a second
+    client with its own connection limits. The Authorization header is a
+    default of the API client only, so the token never reaches the CDN.
+    Clients are opened on first use inside the running event loop and
+    reopened if a later task runs on a different loop. The clients of each
+    loop are closed by aclose(), or at the latest when asyncio.run shuts
+    that loop down, since connections can't be closed from another loop.
+    
+    Attributes:
+        token (str): Discord user token sent with every API request
+        settings (dict): Configuration settings
+        http2 (bool): Whether HTTP/2 is negotiated with the API and CDN
+    """
+    
+    def __init__(self, token, settings=None):
+        self.token = token
+        self.settings = settings or {}
+        self.http2 = self.settings.get("http2", True) and importlib.util.find_spec("h2") is not None
+        self.loop = None
+        self.clients = {}
+        self.closer = None
+
+    async def _closeWithLoop(self, clients):
+        """
+        Waits until cancelled, then closes the clients opened on this loop
+        
+        asyncio.run cancels every task left when its coroutine returns, so
+        this runs while the loop can still close the connections.
+        
+        Args:
+            clients (dict): Name -> AsyncClient, filled as clients are opened
+        """
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await asyncio.gather(*(client.aclose() for client in clients.values()), return_exceptions=True)
+
+    def _getClient(self, name):
+        """
+        Get an open client, creating it on first use in the running event loop
+        
+        Args:
+            name (str): "api" or "cdn"
+        
+        Returns:
+            AsyncClient: The client
+        """
+        loop = asyncio.get_running_loop()
+        
+        if loop is not self.loop:
+            self.loop = loop
+            self.clients = {}
+            self.closer = loop.create_task(self._closeWithLoop(self.clients))
+            
+        if name not in self.clients:
+            timeout = Timeout(
+                self.settings.get("request_timeout", 30.0),
+                connect=self.settings.get("connect_timeout", 10.0),
+            )
+            
+            if name == "api":
+                connections = self.settings.get("api_connections", 20)
+                headers = {"Authorization": self.token}
+            else:
+                connections = self.settings.get("cdn_connections", 10)
+                headers = {}
+                
+            self.clients[name] = AsyncClient(
+                http2=self.http2,
+                headers=headers,
+                timeout=timeout,
+                limits=Limits(max_connections=connections, max_keepalive_connections=connections, keepalive_expiry=60.0),
+            )
+            
+        return self.clients[name]
+
+    @property
+    def api(self):
+        """
+        AsyncClient: Client for Discord API requests
+        """
+        return self._getClient("api")
+
+    @property
+    def cdn(self):
+        """
+        AsyncClient: Client for CDN downloads
+        """
+        return self._getClient("cdn")
+
+    async def aclose(self):
+        """
+        Close every connection opened on the running event loop
+        """
+        if self.loop is not asyncio.get_running_loop() or self.closer is None:
+            return
+        
+        closer, self.closer = self.closer, None
+        self.loop, self.clients = None, {}
+        closer.cancel()
+        await asyncio.gather(closer, return_exceptions=True)
+
+class DiscordClient:
+    """
+    Base for components that talk to Discord, holding the HTTP pool, rate
+    limiter, request metrics and retry policy that every request goes through.
+    
+    Attributes:
+        token (str): Discord user token
+        config (Config): Shared configuration
+        settings (dict): Current configuration settings, re-read on every use so reloads apply
+        cdnUrl (str): Base URL for CDN downloads
+        pool (HttpPool): Shared HTTP clients for API and CDN requests
+        rateLimiter (RateLimiter): Rate limit state for API requests
+        metrics (RequestMetrics): Collected request metrics
+        retryPolicy (RetryPolicy): Retry classification and backoff for the current settings
+        progress (CloneProgress): Progress tracker counting finished API requests, if any
+    """
+    
+    def __init__(self, token, config=None, metrics=None, pool=None, rateLimiter=None):
+        self.token = token
+        self.config = config or loadConfig()
+        self.cdnUrl = self.settings.get("cdn_url", "https://cdn.discordapp.com")
+        self.pool = pool or HttpPool(self.token, self.settings)
+        self.rateLimiter = rateLimiter or RateLimiter(self.settings.get("max_concurrency", 5))
+        self.metrics = metrics or RequestMetrics()
+        self.policySettings = None
+        self.downloadSlots = asyncio.Semaphore(self.settings.get("cdn_connections", 10))
+        self.progress = None
+
+    @property
+    def settings(self):
+        return self.config.get("settings", {})
+
+    @property
+    def retryPolicy(self):
+        settings = self.settings
+        
+        if settings is not self.policySettings:
+            self.policySettings = settings
+            self._retryPolicy = RetryPolicy(settings)
+            
+        return self._retryPolicy
+
+    async def _request(self, method, url, exists=None, **kwargs):
+        """
+        Send an API request through the rate limiter and retry policy
+        
+        At most maxConcurrency requests per route are in flight at once, and
+        requests only wait when their rate limit bucket is used up. A POST
+        that may have reached the server is only retried when exists is
+        given; it is called first and its result returned if the object was
+        created after all, so a retry never makes a duplicate.
+        
+        Args:
+            method (str): HTTP method
+            url (str): The URL to request
+            exists (callable): Coroutine function returning a Response for the already created object, or None
+            **kwargs: Extra arguments passed to the HTTP client
+        
+        Returns:
+            Response: The last response received
+        
+        Raises:
+            TransportError: If the last attempt failed without a response
+        """
+        return await self._send(self.pool.api, method, url, exists, **kwargs)
+
+    async def _download(self, url):
+        """
+        Download a CDN asset, retrying transient failures
+        
+        Args:
+            url (str): CDN URL
+        
+        Returns:
+            Response: The last response received
+        """
+        return await self._send(self.pool.cdn, "GET", url, rateLimited=False)
+
+    async def _send(self, client, method, url, exists=None, rateLimited=True, **kwargs):
+        policy = self.retryPolicy
+        deadline = monotonic() + policy.budget
+        failures = 0
+        attempt = 0
+        waited = 0.0
+        
+        while True:
+            response = error = None
+            retryAfter = 0.0
+            
+            if rateLimited:
+                route, bucket = self.rateLimiter.describe(method, url)
+            else:
+                route, bucket = "GET cdn", "cdn"
+                
+            async with self.rateLimiter.getSemaphore(method, url) if rateLimited else self.downloadSlots:
+                waitStart = monotonic()
+                
+                if rateLimited:
+                    await self.rateLimiter.wait(method, url)
+                    
+                sentAt = monotonic()
+                
+                try:
+                    response = await client.request(method, url, **kwargs)
+                except TransportError as e:
+                    error = e
+                finally:
+                    if rateLimited:
+                        self.rateLimiter.release(method, url)
+                    
+            latency = monotonic() - sentAt
+            waited += sentAt - waitStart
+            
+            if response is not None:
+                if rateLimited:
+                    retryAfter = self.rateLimiter.update(method, url, response)
+                    route, bucket = self.rateLimiter.describe(method, url)
+                self.metrics.record(route, bucket, response, latency, sentAt - waitStart, attempt > 0)
+                
+            outcome = policy.classify(response, error)
+            attempt += 1
+            
+            if outcome in ("ok", "fatal"):
+                break
+            
+            if outcome == "rateLimited" and rateLimited:
+                delay = retryAfter
+            else:
+                failures += 1
+                delay = policy.getRetryAfter(response, failures) if outcome == "rateLimited" else policy.getBackoff(failures)
+                
+                if not policy.retryFailures or failures >= policy.maxAttempts:
+                    break
+                if method == "POST" and exists is None and not policy.isUnsent(error):
+                    break
+                
+            if monotonic() + delay > deadline:
+                break
+            
+            reason = error.__class__.__name__ if error is not None else response.status_code
+            logMessage(f"{route} failed ({reason}), retrying in {delay:.2f}s", "warning")
+            
+            if outcome == "retryable" or not rateLimited:
+                await asyncio.sleep(delay)
+                
+            if outcome == "retryable" and exists is not None and not policy.isUnsent(error):
+                existing = await exists()
+                
+                if existing is not None:
+                    response, error = existing, None
+                    break
+                    
+        if self.progress and rateLimited:
+            self.progress.record(route, latency, waited)
+            
+        if response is None:
+            raise error
+        
+        return response
+
+class ServerScraper(DiscordClient):
+    """
+    Scrapes data from a Discord server using the Discord API.
+    
+    Attributes:
+        serverId (str): ID of the server to scrape
+        baseUrl (str): Base URL for API requests
+    """
+    
+    def __init__(self, token, serverId, config=None, metrics=None, pool=None, rateLimiter=None):
+        """
+        Initialize the ServerScraper with token and server ID
+        
+        Args:
+            token (str): Discord user token
+            serverId (str): ID of the server to scrape
+            config (Config): Shared configuration, loaded on first use if omitted
+            metrics (RequestMetrics): Shared request metrics, a new collector if omitted
+            pool (HttpPool): Shared HTTP clients, a new pool if omitted
+            rateLimiter (RateLimiter): Shared rate limit state, a new tracker if omitted
+        """
+        super().__init__(token, config, metrics, pool, rateLimiter)
+        self.serverId = serverId
+        self.baseUrl = f"{self.settings.get('api_url', 'https://discord.com/api/v9')}/guilds/{self.serverId}"
+
+    async def makeRequest(self, url):
+        """
+        Make an HTTP GET request to the Discord API
+        
+        Args:
+            url (str): The URL to request
+        
+        Returns:
+            dict: JSON response from the API
+            
+        Raises:
+            RequestError: If the request fails or runs out of retries
+        """
+        response = await self._request("GET", url)
+        
+        if response.status_code == 200:
+            return response.json()
+        
+        logMessage(f"Request failed: {response.status_code} - {response.text}", "error")
+        raise RequestError(response.status_code, response.text, url)
+
+    async def getChannels(self):
+        """
+        Get all channels from the server
+        
+        Returns:
+            dict: Server channels data
+        """
+        return await self.makeRequest(f"{self.baseUrl}/channels")
+
+    async def getServerInfo(self):
+        """
+        Get general server information
+        
+        Returns:
+            dict: Server information
+        """
+        return await self.makeRequest(self.baseUrl)
+
+    @inPhase("scrape")
+    async def collectServerData(self):
+        """
+        Collect all necessary data from the server
+        
+        Server info and channels are fetched concurrently.
+        
+        Returns:
+            dict: Complete server data including info, channels, roles, emojis
+        """
+        serverInfo, serverChannels = await asyncio.gather(
+            self.getServerInfo(),
+            self.getChannels(),
+        )
+
+        return {
+            "info": serverInfo,
+            "channels": serverChannels,
+            "roles": serverInfo.get("roles", []),
+            "emojis": serverInfo.get("emojis", []),
+            "features": serverInfo.get("features", []),
+            "system_channel_id": serverInfo.get("system_channel_id"),
+            "verification_level": serverInfo.get("verification_level", 0),
+            "default_message_notifications": serverInfo.get("default_message_notifications", 0),
+            "explicit_content_filter": serverInfo.get("explicit_content_filter", 0),
+        }
+
+    @inPhase("scrape")
+    async def collectAssets(self, serverData):
+        """
+        Download the server icon and every emoji image concurrently
+        
+        Args:
+            serverData (dict): Output of collectServerData
+        
+        Returns:
+            dict: Asset key -> raw bytes for every asset that downloaded
+        """
+        guild = Guild.fromData(serverData)
+        downloads = []
+        
+        if guild.icon:
+            downloads.append(getIconAsset(guild, self.cdnUrl))
+        for emoji in guild.emojis:
+            downloads.append(getEmojiAsset(emoji, self.cdnUrl)[:2])
+            
+        responses = await asyncio.gather(
+            *(self._download(url) for _, url in downloads),
+            return_exceptions=True,
+        )
+        assets = {}
+        
+        for (key, url), response in zip(downloads, responses):
+            if isinstance(response, Exception) or response.status_code != 200:
+                logMessage(f"Failed to download asset: {url}", "error")
+                continue
+            assets[key] = response.content
+            
+        return assets
+
+class ServerCreator(DiscordClient):
+    """
+    Clones a source server into a new or existing target server.
+    
+    Attributes:
+        guild (Guild): Source server model, shared and never modified
+        roleMap (dict): Source role ID -> target role ID
+        channelMap (dict): Source channel ID -> target channel ID
+        emojiMap (dict): Source emoji ID -> target emoji ID
+        failures (list): {"kind", "name", "reason"} of every item that failed
+        sourceTemplates: Source templates from readTemplates, False if they can't be read, None until read
+        serverId (str): ID of the target server
+    """
+    
+    def __init__(self, token, serverData, assets=None, config=None, metrics=None, pool=None,
+                 rateLimiter=None, assetCache=None):
+        """
+        Initialize the ServerCreator for one clone of a source server
+        
+        Args:
+            token (str): Discord user token
+            serverData: Source Guild, or collectServerData output to load one from
+            assets (dict): Asset key -> raw bytes, as stored in snapshots
+            config (Config): Shared configuration, loaded on first use if omitted
+            metrics (RequestMetrics): Shared request metrics, a new collector if omitted
+            pool (HttpPool): Shared HTTP clients, a new pool if omitted
+            rateLimiter (RateLimiter): Shared rate limit state, a new tracker if omitted
+            assetCache (AssetCache): Shared asset cache, opened from settings if omitted
+        """
+        super().__init__(token, config, metrics, pool, rateLimiter)
+        self.baseUrl = self.settings.get("api_url", "https://discord.com/api/v9")
+        self.guild = serverData if isinstance(serverData, Guild) else Guild.fromData(serverData)
+        self.assetCache = assetCache or AssetCache(
+            self.settings.get("asset_cache_dir", ".cache/assets"),
+            self.settings.get("asset_cache_size_mb", 256) * 1024 * 1024,
+        )
+        self.assets = assets or {}
+        self.checkpoint = None
+        self.completed = set()
+        self.serverId = None
+        self.everyoneRoleId = None
+        self.roleMap = {}
+        self.channelMap = {}
+        self.emojiMap = {}
+        self.failures = []
+        self.sourceTemplates = None
+        self.createLocks = {}
+
+    @classmethod
+    def fromSnapshot(cls, token, path, config=None, metrics=None, pool=None, rateLimiter=None, assetCache=None):
+        """
+        Create a ServerCreator straight from a snapshot file
+        
+        Args:
+            token (str): Discord user token
+            path (str): Snapshot file path
+            config (Config): Shared configuration
+            metrics (RequestMetrics): Shared request metrics
+            pool (HttpPool): Shared HTTP clients
+            rateLimiter (RateLimiter): Shared rate limit state
+            assetCache (AssetCache): Shared asset cache
+        
+        Returns:
+            ServerCreator: Creator using the snapshot's data and assets
+        """
+        serverData, assets, _ = loadSnapshot(path)
+        return cls(token, serverData, assets, config, metrics, pool, rateLimiter, assetCache)
+
+    @classmethod
+    def fromCheckpoint(cls, token, path, config=None, metrics=None, pool=None, rateLimiter=None, assetCache=None):
+        """
+        Rebuild a ServerCreator from a checkpoint file so the clone can continue
+        
+        Args:
+            token (str): Discord user token
+            path (str): Checkpoint file path
+            config (Config): Shared configuration
+            metrics (RequestMetrics): Shared request metrics
+            pool (HttpPool): Shared HTTP clients
+            rateLimiter (RateLimiter): Shared rate limit state
+            assetCache (AssetCache): Shared asset cache
+        
+        Returns:
+            tuple: (ServerCreator, clone mode "new" or "sync", True if the job already finished)
+        """
+        entries = Checkpoint.load(path)
+        header = entries[0]
+        creator = cls(token, header["server"], config=config, metrics=metrics, pool=pool,
+                      rateLimiter=rateLimiter, assetCache=assetCache)
+        creator.serverId = header.get("serverId")
+        finished = False
+        
+        for entry in entries[1:]:
+            if entry["type"] == "server":
+                creator.serverId = entry["target"]
+                creator.everyoneRoleId = entry["everyone"]
+            elif entry["type"] == "role":
+                creator.roleMap[entry["source"]] = entry["target"]
+            elif entry["type"] == "channel":
+                creator.channelMap[entry["source"]] = entry["target"]
+            elif entry["type"] == "emoji":
+                creator.emojiMap[entry["source"]] = entry["target"]
+            elif entry["type"] == "done":
+                finished = True
+                
+            creator.completed.add((entry["type"], entry.get("source")))
+            
+        creator.checkpoint = Checkpoint(path)
+        return creator, header["mode"], finished
+
+    def startCheckpoint(self, path, mode):
+        """
+        Start journaling completed steps to a new checkpoint file
+        
+        Sync jobs are re-planned against the target on resume, so their
+        checkpoint only needs the start header.
+        
+        Args:
+            path (str): Checkpoint file path
+            mode (str): Clone mode, "new" for executeAll or "sync" for syncStructure
+        """
+        self.checkpoint = Checkpoint(path)
+        self.checkpoint.record({
+            "type": "start",
+            "mode": mode,
+            "serverId": self.serverId,
+            "server": self.guild.toData(),
+        })
+
+    def _recordStep(self, kind, source, target=None, **extra):
+        """
+        Mark a step as completed and journal it if a checkpoint is active
+        
+        Args:
+            kind (str): Step kind (server, phase, role, channel, emoji, done)
+            source (str): Source ID or phase name of the step
+            target (str): Target ID created by the step
+            **extra: Additional fields to store
+        """
+        self.completed.add((kind, source))
+        
+        if self.checkpoint:
+            self.checkpoint.record({"type": kind, "source": source, "target": target, **extra})
+
+    def _recordFailure(self, kind, name, reason):
+        """
+        Remember an item that could not be created, updated or deleted
+        
+        Args:
+            kind (str): Item kind (server, role, category, channel, emoji, positions)
+            name (str): Item name
+            reason (str): Status code or error message
+        """
+        self.failures.append({"kind": kind, "name": name, "reason": reason})
+
+    async def _fetchAsset(self, key, url):
+        """
+        Get an asset from the loaded snapshot, or from the asset cache
+        
+        Args:
+            key (str): Asset key
+            url (str): CDN URL of the asset
+        
+        Returns:
+            tuple: (content or None, HTTP status code)
+        """
+        if key in self.assets:
+            return self.assets[key], 200
+        
+        return await self.assetCache.fetch(self._download, key, url)
+
+    def _findCreated(self, collection, match, status):
+        """
+        Builds an exists check for a create request that may be retried
+        
+        Args:
+            collection (str): Target server collection, "roles", "channels" or "emojis"
+            match (callable): Returns True for the object the request would create
+            status (int): Status code the create request returns on success
+        
+        Returns:
+            callable: Coroutine function returning a Response for the object, or None
+        """
+        async def findCreated():
+            response = await self._request("GET", f"{self.baseUrl}/guilds/{self.serverId}/{collection}")
+            
+            if response.status_code != 200:
+                return None
+            
+            item = next((item for item in response.json() if match(item)), None)
+            
+            if item is None:
+                return None
+            
+            logMessage(f"Found {collection[:-1]} {item.get('name')} already created, not retrying", "info")
+            return Response(status, json=item, request=response.request)
+        
+        return findCreated
+
+    def _createLock(self, kind, key):
+        """
+        Gets the lock that serializes creates of items sharing a name
+        
+        A create that may have gone through is resolved by claiming an
+        unmapped target item with the same name; two such creates in flight
+        at once could both claim the same item, leaving one source item
+        uncreated.
+        
+        Args:
+            kind (str): Item kind, "role", "channel" or "emoji"
+            key: Name, or for channels the (name, type, parent) identity
+        
+        Returns:
+            asyncio.Lock: Lock for this name
+        """
+        return self.createLocks.setdefault((kind, key), asyncio.Lock())
+
+    @inPhase("server")
+    async def createServer(self):
+        """
+        Creates a new Discord server based on source server data
+        
+        The create request carries no roles or channels; cloneStructure
+        clears whatever channels the server starts with and then creates
+        every item separately.
+        
+        Returns:
+            bool: True if server creation was successful, False otherwise
+        """
+        logMessage("Creating new server", "info")
+        
+        try:
+            serverIcon = await self._getServerIcon()
+                
+            serverData = {
+                "name": self.guild.name,
+                "icon": serverIcon,
+                "channels": [],
+                "system_channel_id": None,
+            }
+
+            response = await self._request(
+                "POST",
+                f"{self.baseUrl}/guilds",
+                json=serverData,
+            )
+            
+            if response.status_code != 201:
+                logMessage(f"Failed to create server: {response.status_code} - {response.text}", "error")
+                self._recordFailure("server", self.guild.name, f"HTTP {response.status_code}")
+                return False
+
+            responseData = response.json()
+            
+            self.serverId = responseData["id"]
+            self.everyoneRoleId = responseData["roles"][0]["id"]
+            self._recordStep("server", self.guild.id, self.serverId, everyone=self.everyoneRoleId)
+            
+            logMessage(f"Created server: {self.guild.name} (ID: {self.serverId})", "success")
+            
+            await self._configureServer()
+            
+            return True
+        except Exception as e:
+            logMessage(f"Error creating server: {e}", "error")
+            self._recordFailure("server", self.guild.name, str(e))
+            return False
+
+    async def _getServerIcon(self):
+        """
+        Gets the source server icon as a data URI
+        
+        Returns:
+            str: Icon data URI, or None if the server has no icon or it failed to download
+        """
+        if not self.guild.icon:
+            return None
+        
+        try:
+            imgContent, statusCode = await self._fetchAsset(*getIconAsset(self.guild, self.cdnUrl))
+            if imgContent is not None:
+                imgContent, mime = await self._prepareImage(imgContent, "icon")
+                return f"data:{mime};base64,{b64encode(imgContent).decode('utf-8')}"
+            logMessage(f"Failed to download server icon: {statusCode}", "error")
+        except Exception as e:
+            logMessage(f"Error downloading server icon: {e}", "error")
+            
+        return None
+
+    imageLimits = {
+        "emoji": ("emoji_max_bytes", 256 * 1024, 128),
+        "icon": ("icon_max_bytes", 10 * 1024 * 1024, 1024),
+    }
+    uploadFormats = ("image/png", "image/jpeg", "image/gif")
+
+    async def _prepareImage(self, data, kind):
+        """
+        Makes sure an image will be accepted by the API before it is uploaded
+        
+        Images already in an accepted format and under the size limit pass
+        straight through; anything else is transcoded in the image worker
+        pool so the event loop keeps downloading and uploading meanwhile.
+        
+        Args:
+            data (bytes): Raw image bytes
+            kind (str): "emoji" or "icon"
+        
+        Returns:
+            tuple: (image bytes, MIME type)
+        """
+        setting, defaultBytes, maxSide = self.imageLimits[kind]
+        maxBytes = self.settings.get(setting, defaultBytes)
+        mime = sniffImage(data)
+        
+        if mime in self.uploadFormats and len(data) <= maxBytes:
+            return data, mime
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                getImagePool(self.settings.get("image_workers")),
+                normalizeImage,
+                data,
+                maxBytes,
+                maxSide,
+            )
+        except Exception as e:
+            logMessage(f"Could not convert {kind} image ({mime or 'unknown format'}, {len(data)} bytes): {e}", "warning")
+            return data, mime or "image/png"
+
+    def _buildInlinePayload(self, serverIcon):
+        """
+        Translates the source structure into a single POST /guilds payload
+        
+        Roles and channels get integer placeholder IDs that the API replaces
+        on creation; the first role is @everyone, categories are listed
+        before their children, and overwrites point at role placeholders.
+        Member overwrites cannot be expressed and are left to the follow-up sync.
+        
+        Args:
+            serverIcon (str): Icon data URI or None
+        
+        Returns:
+            dict: Guild create payload
+        """
+        everyone = self.guild.everyone
+        placeholders = {}
+        inlineRoles = [{"id": 0, "permissions": everyone.permissions if everyone else "1071698529857"}]
+        
+        if everyone:
+            placeholders[everyone.id] = 0
+            
+        for role in self.guild.rolesByPosition:
+            if role is everyone:
+                continue
+            placeholders[role.id] = len(placeholders) + (0 if everyone else 1)
+            inlineRoles.append({**self._buildRolePayload(role), "id": placeholders[role.id]})
+            
+        inlineChannels = []
+        
+        for channel in self.guild.createOrder:
+            placeholders[channel.id] = len(placeholders) + 1
+            
+        for channel in self.guild.createOrder:
+            channelData = self._buildChannelPayload(channel)
+            channelData.pop("position", None)
+            channelData["id"] = placeholders[channel.id]
+            channelData["permission_overwrites"] = [
+                overwrite.toData(placeholders[overwrite.id])
+                for overwrite in channel.overwrites
+                if overwrite.isRole and overwrite.id in placeholders
+            ]
+            
+            if channel.parentId in placeholders:
+                channelData["parent_id"] = placeholders[channel.parentId]
+                
+            inlineChannels.append(channelData)
+            
+        return {
+            "name": self.guild.name,
+            "icon": serverIcon,
+            "roles": inlineRoles,
+            "channels": inlineChannels,
+            "system_channel_id": None,
+        }
+
+    @inPhase("server")
+    async def createServerInline(self):
+        """
+        Creates the new server with every role and channel in one request
+        
+        Returns:
+            bool: True if server creation was successful, False otherwise
+        """
+        logMessage("Creating new server with inline roles and channels", "info")
+        
+        try:
+            serverData = self._buildInlinePayload(await self._getServerIcon())
+            
+            response = await self._request(
+                "POST",
+                f"{self.baseUrl}/guilds",
+                json=serverData,
+            )
+            
+            if response.status_code != 201:
+                logMessage(f"Failed to create server: {response.status_code} - {response.text}", "error")
+                self._recordFailure("server", self.guild.name, f"HTTP {response.status_code}")
+                return False
+
+            responseData = response.json()
+            
+            self.serverId = responseData["id"]
+            self.everyoneRoleId = next(
+                (role["id"] for role in responseData["roles"] if role["id"] == self.serverId),
+                responseData["roles"][0]["id"],
+            )
+            self._recordStep("server", self.guild.id, self.serverId, everyone=self.everyoneRoleId)
+            self._recordStep("phase", "inline")
+            
+            logMessage(f"Created server: {self.guild.name} with {len(serverData['roles']) - 1} roles "
+                       f"and {len(serverData['channels'])} channels (ID: {self.serverId})", "success")
+            
+            await self._configureServer()
+            
+            return True
+        except Exception as e:
+            logMessage(f"Error creating server: {e}", "error")
+            self._recordFailure("server", self.guild.name, str(e))
+            return False
+
+    def _usesTemplate(self):
+        """
+        Checks whether a new server should be created from a source template
+        
+        Templates always carry the whole source, so filtered clones never use one.
+        
+        Returns:
+            bool: True if settings.template_create is on and the source is not filtered
+        """
+        return self.settings.get("template_create", False) and not self.guild.filtered
+
+    @inPhase("server")
+    async def readTemplates(self):
+        """
+        Reads the source's templates once, before the server is created from one
+        
+        Called ahead of planRequests so the plan knows whether a template
+        will be reused, synced or created; the clone then uses the same list.
+        Does nothing unless a new server will be created from a template.
+        
+        Returns:
+            list: Source templates, or False if they can't be read, None if not needed
+        """
+        if self.sourceTemplates is None and self._usesTemplate() and not self.serverId:
+            response = await self._request("GET", f"{self.baseUrl}/guilds/{self.guild.id}/templates")
+            
+            if response.status_code == 200:
+                self.sourceTemplates = response.json()
+            else:
+                logMessage(f"Can't read source templates: {response.status_code}", "warning")
+                self.sourceTemplates = False
+                
+        return self.sourceTemplates
+
+    async def _getTemplate(self):
+        """
+        Gets an up to date template of the source server, creating one if it has none
+        
+        Returns:
+            tuple: (template code, whether it was created here), or (None, False)
+                if the account can't manage the source's templates
+        """
+        templatesUrl = f"{self.baseUrl}/guilds/{self.guild.id}/templates"
+        templates = await self.readTemplates()
+        
+        if templates is False:
+            return None, False
+        
+        if templates:
+            template = templates[0]
+            
+            if template.get("is_dirty"):
+                response = await self._request("PUT", f"{templatesUrl}/{template['code']}")
+                
+                if response.status_code != 200:
+                    logMessage(f"Can't sync source template {template['code']}: {response.status_code}", "warning")
+                    return None, False
+                
+                logMessage(f"Synced source template {template['code']}", "success")
+            return template["code"], False
+        
+        response = await self._request("POST", templatesUrl, json={"name": self.guild.name[:100]})
+        
+        if response.status_code not in (200, 201):
+            logMessage(f"Can't create source template: {response.status_code}", "warning")
+            return None, False
+        
+        code = response.json()["code"]
+        logMessage(f"Created source template {code}", "success")
+        return code, True
+
+    @inPhase("server")
+    async def createServerFromTemplate(self):
+        """
+        Creates the new server from a template of the source server
+        
+        The template carries every role, channel and role overwrite, so the
+        structure costs two to four requests; like an inline create, the
+        follow-up sync adds the emojis and whatever the template dropped.
+        A template made only for this clone is deleted again afterwards.
+        Falls back to createServerInline when the account can't manage the
+        source's templates.
+        
+        Returns:
+            bool: True if server creation was successful, False otherwise
+        """
+        logMessage("Creating new server from a template of the source", "info")
+        code, created = None, False
+        
+        try:
+            code, created = await self._getTemplate()
+            
+            if code is None:
+                logMessage("Falling back to an inline create", "warning")
+                return await self.createServerInline()
+            
+            response = await self._request(
+                "POST",
+                f"{self.baseUrl}/guilds/templates/{code}",
+                json={"name": self.guild.name, "icon": await self._getServerIcon()},
+            )
+            
+            if response.status_code != 201:
+                logMessage(f"Failed to create server: {response.status_code} - {response.text}", "error")
+                self._recordFailure("server", self.guild.name, f"HTTP {response.status_code}")
+                return False
+
+            responseData = response.json()
+            
+            self.serverId = responseData["id"]
+            self.everyoneRoleId = next(
+                (role["id"] for role in responseData.get("roles", []) if role["id"] == self.serverId),
+                self.serverId,
+            )
+            self._recordStep("server", self.guild.id, self.serverId, everyone=self.everyoneRoleId)
+            self._recordStep("phase", "inline")
+            
+            logMessage(f"Created server: {self.guild.name} from template {code} (ID: {self.serverId})", "success")
+            
+            await self._configureServer()
+            
+            return True
+        except Exception as e:
+            logMessage(f"Error creating server: {e}", "error")
+            self._recordFailure("server", self.guild.name, str(e))
+            return False
+        finally:
+            if created:
+                try:
+                    await self._request("DELETE", f"{self.baseUrl}/guilds/{self.guild.id}/templates/{code}")
+                except Exception as e:
+                    logMessage(f"Error deleting source template {code}: {e}", "warning")
+
+    @inPhase("server")
+    async def _finishInlineClone(self):
+        """
+        Syncs whatever the inline or template guild create could not carry
+        
+        Reads the new server back once, maps its roles and channels onto the
+        source, and runs the resulting sync plan: emojis, member overwrites,
+        fields the API dropped and the final positions.
+        
+        Returns:
+            bool: True once the plan has run
+        """
+        targetData = await self._readTarget()
+        
+        if targetData is None:
+            return False
+        
+        return await self.syncStructure(targetData)
+
+    async def _readTarget(self):
+        """
+        Reads the target server's roles, channels and emojis with two requests
+        
+        Returns:
+            dict: Target data in collectServerData form, or None if a request failed
+        """
+        serverInfo, serverChannels = await asyncio.gather(
+            self._request("GET", f"{self.baseUrl}/guilds/{self.serverId}"),
+            self._request("GET", f"{self.baseUrl}/guilds/{self.serverId}/channels"),
+        )
+        
+        if serverInfo.status_code != 200 or serverChannels.status_code != 200:
+            logMessage(f"Failed to read back target server: {serverInfo.status_code}/{serverChannels.status_code}", "error")
+            return None
+        
+        targetInfo = serverInfo.json()
+        
+        return {
+            "info": targetInfo,
+            "channels": serverChannels.json(),
+            "roles": targetInfo.get("roles", []),
+            "emojis": targetInfo.get("emojis", []),
+        }
+
+    @inPhase("server")
+    async def _adoptUnjournaled(self):
+        """
+        Maps target items that a resumed clone created but never journaled
+        
+        A create still in flight when the run stopped can reach the server
+        without its checkpoint entry being written. The target is read once
+        and every unmapped source role, channel and emoji is paired with an
+        unclaimed target item the way planSync pairs them, so the rest of
+        the clone does not create it again. Channels are only adopted once
+        the default channels are gone, as none were created before that.
+        
+        Returns:
+            bool: True if the target could be read, False otherwise
+        """
+        targetData = await self._readTarget()
+        
+        if targetData is None:
+            return False
+        
+        adopted = []
+        everyone = self.guild.everyone
+        claimedRoles = set(self.roleMap.values())
+        
+        rolePairs, _, _ = self._matchItems(
+            [role for role in self.guild.rolesByPosition if role is not everyone and role.id not in self.roleMap],
+            [role for role in targetData["roles"] if role["id"] not in claimedRoles and role["name"] != "@everyone" and not role.get("managed")],
+            lambda role: role.name,
+            lambda role: role["name"],
+        )
+        
+        for source, target in rolePairs:
+            self.roleMap[source.id] = target["id"]
+            self._recordStep("role", source.id, target["id"])
+            adopted.append(f"role {source.name}")
+            
+        if ("phase", "deleteChannels") in self.completed:
+            claimedChannels = set(self.channelMap.values())
+            targetChannels = [channel for channel in targetData["channels"] if channel["id"] not in claimedChannels]
+            categoryPairs, _, _ = self._matchItems(
+                [channel for channel in self.guild.channelsByPosition if channel.isCategory and channel.id not in self.channelMap],
+                [channel for channel in targetChannels if channel["type"] == 4],
+                lambda channel: channel.name,
+                lambda channel: channel["name"],
+            )
+            
+            for source, target in categoryPairs:
+                self.channelMap[source.id] = target["id"]
+                
+            channelPairs, _, _ = self._matchItems(
+                [channel for channel in self.guild.channelsByPosition if not channel.isCategory and channel.id not in self.channelMap],
+                [channel for channel in targetChannels if channel["type"] != 4],
+                lambda channel: (channel.type, channel.name, self.channelMap.get(channel.parentId)),
+                lambda channel: (channel["type"], channel["name"], channel.get("parent_id")),
+            )
+            
+            for source, target in categoryPairs + channelPairs:
+                self.channelMap[source.id] = target["id"]
+                self._recordStep("channel", source.id, target["id"])
+                adopted.append(f"{'category' if source.isCategory else 'channel'} {source.name}")
+                
+        claimedEmojis = set(self.emojiMap.values())
+        emojiPairs, _, _ = self._matchItems(
+            [emoji for emoji in self.guild.emojis if ("emoji", emoji.id) not in self.completed],
+            [emoji for emoji in targetData["emojis"] if emoji["id"] not in claimedEmojis],
+            lambda emoji: emoji.name,
+            lambda emoji: emoji["name"],
+        )
+        
+        for source, target in emojiPairs:
+            self.emojiMap[source.id] = target["id"]
+            self._recordStep("emoji", source.id, target["id"])
+            adopted.append(f"emoji {source.name}")
+            
+        if adopted:
+            logMessage(f"Adopted {len(adopted)} items created before the interruption: {', '.join(adopted[:10])}"
+                       + (" ..." if len(adopted) > 10 else ""), "info")
+            
+        return True
+
+    @inPhase("verify")
+    async def verifyClone(self):
+        """
+        Checks that the target server matches the source after a clone
+        
+        Reads the target once and compares its fingerprint with the
+        source's (see Guild.fingerprint). Target items that are not in the
+        source are only reported when the source was not filtered.
+        
+        Returns:
+            dict: "missing", "extra" and "changed" fingerprint keys, or None if the target could not be read
+        """
+        targetData = await self._readTarget()
+        
+        if targetData is None:
+            return None
+        
+        differences = compareFingerprints(
+            self.guild.fingerprint(),
+            Guild.fromData(targetData).fingerprint(includeManaged=False),
+            ignoreExtra=self.guild.filtered,
+        )
+        count = sum(len(keys) for keys in differences.values())
+        
+        if not count:
+            logMessage(f"Parity check passed: {len(self.guild.roles)} roles, {len(self.guild.channels)} channels "
+                       f"and {len(self.guild.emojis)} emojis match the source", "success")
+            return differences
+        
+        logMessage(f"Parity check found {count} differences from the source", "warning")
+        
+        for kind, keys in differences.items():
+            for key in keys[:10]:
+                logMessage(f"{kind}: {key}", "warning")
+            if len(keys) > 10:
+                logMessage(f"{kind}: {len(keys) - 10} more", "warning")
+                
+        return differences
+
+    @inPhase("server")
+    async def _configureServer(self):
+        """
+        Applies the @everyone permissions and server settings to the new server
+        """
+        await asyncio.gather(
+            self._updateEveryoneRole(),
+            self._updateServerSettings(),
+        )
+        self._recordStep("phase", "configureServer")
+
+    async def _updateEveryoneRole(self):
+        """
+        Updates the @everyone role permissions in the new server
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            url = f"{self.baseUrl}/guilds/{self.serverId}/roles/{self.everyoneRoleId}"
+            
+            permissions = self.guild.everyone.permissions if self.guild.everyone else "1071698529857"
+                
+            roleData = {
+                "name": "@everyone",
+                "permissions": permissions,
+                "color": 0,
+                "hoist": False,
+                "mentionable": False,
+                "icon": None,
+                "unicode_emoji": None,
+            }
+            
+            response = await self._request(
+                "PATCH",
+                url,
+                json=roleData,
+            )
+            
+            if response.status_code != 200:
+                logMessage(f"Failed to update @everyone role: {response.status_code}", "error")
+                return False
+                
+            logMessage("Updated @everyone role permissions", "success")
+            return True
+        except Exception as e:
+            logMessage(f"Error updating @everyone role: {e}", "error")
+            return False
+
+    async def _updateServerSettings(self):
+        """
+        Updates server settings based on source server configuration
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            url = f"{self.baseUrl}/guilds/{self.serverId}"
+            
+            serverSettings = {
+                "features": list(self.guild.features),
+                "verification_level": self.guild.verificationLevel,
+                "default_message_notifications": self.guild.defaultMessageNotifications,
+                "explicit_content_filter": self.guild.explicitContentFilter,
+                "rules_channel_id": "1", 
+                "public_updates_channel_id": "1",
+            }
+            
+            response = await self._request(
+                "PATCH",
+                url,
+                json=serverSettings,
+            )
+            
+            if response.status_code != 200:
+                logMessage(f"Failed to update server settings: {response.status_code}", "error")
+                return False
+                
+            logMessage("Updated server settings", "success")
+            return True
+        except Exception as e:
+            logMessage(f"Error updating server settings: {e}", "error")
+            return False
+
+    @inPhase("deletes")
+    async def deleteChannels(self):
+        """
+        Deletes every existing channel in the target server concurrently
+        
+        Channels already mapped to a source channel are kept, so a resumed
+        run never deletes what an earlier run of this clone created.
+        
+        Returns:
+            bool: True if the channel list could be fetched, False otherwise
+        """
+        if not self.serverId:
+            logMessage("Server ID not set", "error")
+            return False
+        
+        if ("phase", "deleteChannels") in self.completed:
+            return True
+            
+        try:
+            response = await self._request(
+                "GET",
+                f"{self.baseUrl}/guilds/{self.serverId}/channels",
+            )
+            
+            if response.status_code != 200:
+                logMessage(f"Failed to get channels: {response.status_code}", "error")
+                return False
+                
+            createdChannels = set(self.channelMap.values())
+            existingChannels = [channel for channel in response.json() if channel["id"] not in createdChannels]
+            
+            await asyncio.gather(*(self._deleteChannel(channel) for channel in existingChannels))
+            self._recordStep("phase", "deleteChannels")
+            
+            return True
+        except Exception as e:
+            logMessage(f"Error deleting channels: {e}", "error")
+            return False
+
+    async def _deleteChannel(self, channel):
+        """
+        Deletes a single channel from the target server
+        
+        Args:
+            channel (dict): Channel data from the target server
+        """
+        try:
+            deleteResponse = await self._request(
+                "DELETE",
+                f"{self.baseUrl}/channels/{channel['id']}",
+            )
+            
+            if deleteResponse.status_code == 200:
+                logMessage(f"Deleted channel: {channel['name']}", "success")
+            else:
+                logMessage(f"Failed to delete channel: {channel['name']}", "error")
+        except Exception as e:
+            logMessage(f"Error deleting channel {channel.get('name', 'unknown')}: {e}", "error")
+
+    def _buildRolePayload(self, role):
+        """
+        Builds the create/update payload for a source role
+        
+        Args:
+            role (Role): Source role
+        
+        Returns:
+            dict: Role payload for the target server
+        """
+        return {
+            "name": role.name,
+            "permissions": role.permissions,
+            "color": role.color,
+            "hoist": role.hoist,
+            "mentionable": role.mentionable,
+            "icon": None,
+            "unicode_emoji": None,
+        }
+
+    def _translateOverwrites(self, overwrites, dropUnmapped=True):
+        """
+        Translates role overwrites from source role IDs to target role IDs
+        
+        Member overwrites keep their IDs. Role overwrites whose role has no
+        target yet are dropped, since one unknown role ID makes Discord reject
+        the whole channel, unless dropUnmapped is False.
+        
+        Args:
+            overwrites (tuple): Source Overwrites
+            dropUnmapped (bool): Drop role overwrites without a target role
+        
+        Returns:
+            list: Overwrite dicts referencing target IDs
+        """
+        translated = []
+        
+        for overwrite in overwrites:
+            if overwrite.id in self.roleMap:
+                translated.append(overwrite.toData(self.roleMap[overwrite.id]))
+            elif not overwrite.isRole or not dropUnmapped:
+                translated.append(overwrite.toData())
+                
+        return translated
+
+    def _buildChannelPayload(self, channel):
+        """
+        Builds the create payload for a source channel
+        
+        Args:
+            channel (Channel): Source channel
+        
+        Returns:
+            dict: Channel payload for the target server
+        """
+        channelData = {
+            "name": channel.name,
+            "type": channel.type,
+            "position": channel.position,
+            "permission_overwrites": self._translateOverwrites(channel.overwrites),
+        }
+
+        if channel.parentId in self.channelMap:
+            channelData["parent_id"] = self.channelMap[channel.parentId]
+
+        if channel.type == 0:
+            if channel.topic:
+                channelData["topic"] = channel.topic
+            if channel.rateLimitPerUser:
+                channelData["rate_limit_per_user"] = channel.rateLimitPerUser
+            if channel.nsfw:
+                channelData["nsfw"] = channel.nsfw
+        elif channel.type == 2:
+            if channel.bitrate:
+                channelData["bitrate"] = channel.bitrate
+            if channel.userLimit:
+                channelData["user_limit"] = channel.userLimit
+                
+        return channelData
+
+    @inPhase("roles")
+    async def createRoles(self):
+        """
+        Creates roles in the target server based on source server roles
+        
+        Roles are created concurrently; their hierarchy is set afterwards by
+        applyPositions. Source data is left untouched; overwrites are
+        translated through roleMap when each channel payload is built.
+        
+        Returns:
+            dict: Mapping between source role IDs and target role IDs
+        """
+        if not self.serverId:
+            logMessage("Server ID not set, can't create roles", "error")
+            return {}
+            
+        try:
+            serverRoles = self.guild.rolesByPosition
+            
+            logMessage(f"Creating {len(serverRoles)} roles", "info")
+            
+            pendingRoles = []
+            
+            for role in serverRoles:
+                if role is self.guild.everyone:
+                    self.roleMap[role.id] = self.everyoneRoleId
+                elif role.id not in self.roleMap:
+                    pendingRoles.append(role)
+                    
+            newRoleIds = await asyncio.gather(*(self._createRole(role) for role in pendingRoles))
+            overwritesByTarget = self.guild.overwritesByTarget
+            
+            for role, newRoleId in zip(pendingRoles, newRoleIds):
+                if not newRoleId and role.id in overwritesByTarget:
+                    logMessage(f"Dropping {len(overwritesByTarget[role.id])} channel overwrites for role: {role.name}", "warning")
+                
+            return self.roleMap
+        except Exception as e:
+            logMessage(f"Error creating roles: {e}", "error")
+            return {}
+
+    async def _createRole(self, role):
+        """
+        Creates a single role in the target server
+        
+        Args:
+            role (Role): Source role
+        
+        Returns:
+            str: ID of the new role, or None if creation failed
+        """
+        async with self._createLock("role", role.name):
+            try:
+                response = await self._request(
+                    "POST",
+                    f"{self.baseUrl}/guilds/{self.serverId}/roles",
+                    exists=self._findCreated(
+                        "roles",
+                        lambda item: item["name"] == role.name and item["id"] not in self.roleMap.values(),
+                        200,
+                    ),
+                    json=self._buildRolePayload(role),
+                )
+            except Exception as e:
+                logMessage(f"Error creating role {role.name}: {e}", "error")
+                self._recordFailure("role", role.name, str(e))
+                return None
+
+            if response.status_code != 200:
+                logMessage(f"Failed to create role: {role.name}", "error")
+                self._recordFailure("role", role.name, f"HTTP {response.status_code}")
+                return None
+            
+            newRoleId = response.json()["id"]
+            self.roleMap[role.id] = newRoleId
+            self._recordStep("role", role.id, newRoleId)
+            return newRoleId
+
+    @inPhase("channels")
+    async def createChannels(self):
+        """
+        Creates channels in the target server based on source server channels
+        
+        All categories are created concurrently, and each child channel starts
+        as soon as its own category exists instead of waiting for every category.
+        Children are taken straight from Guild.childrenByParent.
+        
+        Returns:
+            dict: Mapping between source channel IDs and target channel IDs
+        """
+        if not self.serverId:
+            logMessage("Server ID not set, can't create channels", "error")
+            return {}
+            
+        try:
+            childrenByParent = self.guild.childrenByParent
+            parentChannels = [channel for channel in childrenByParent.get(None, ()) if channel.isCategory]
+            
+            logMessage(f"Creating {len(parentChannels)} categories", "info")
+            
+            categoryTasks = {
+                category.id: asyncio.create_task(self._createChannel(category))
+                for category in parentChannels
+            }
+            
+            logMessage(f"Creating {len(self.guild.channels) - len(parentChannels)} channels", "info")
+            
+            await asyncio.gather(
+                *categoryTasks.values(),
+                *(
+                    self._createChannel(channel, categoryTasks.get(parentId))
+                    for parentId, children in childrenByParent.items()
+                    for channel in children
+                    if not channel.isCategory
+                ),
+            )
+            
+            return self.channelMap
+        except Exception as e:
+            logMessage(f"Error creating channels: {e}", "error")
+            return {}
+
+    async def _createChannel(self, channel, parentTask=None):
+        """
+        Creates a single category or channel in the target server
+        
+        Args:
+            channel (Channel): Source channel
+            parentTask (Task): Task creating the parent category, awaited first
+        
+        Returns:
+            bool: True if the channel was created, False otherwise
+        """
+        kind = "category" if channel.isCategory else "channel"
+        
+        try:
+            if parentTask:
+                await parentTask
+                
+            if channel.id in self.channelMap:
+                return True
+                
+            channelData = self._buildChannelPayload(channel)
+            identity = (channelData["name"], channelData["type"], channelData.get("parent_id"))
+
+            async with self._createLock("channel", identity):
+                response = await self._request(
+                    "POST",
+                    f"{self.baseUrl}/guilds/{self.serverId}/channels",
+                    exists=self._findCreated(
+                        "channels",
+                        lambda item: (item["name"], item["type"], item.get("parent_id")) == identity
+                        and item["id"] not in self.channelMap.values(),
+                        201,
+                    ),
+                    json=channelData,
+                )
+
+                if response.status_code == 201:
+                    self.channelMap[channel.id] = response.json()["id"]
+                    self._recordStep("channel", channel.id, self.channelMap[channel.id])
+                    logMessage(f"Created {kind}: {channel.name}", "success")
+                    return True
+            
+            logMessage(f"Failed to create {kind}: {channel.name}", "error")
+            self._recordFailure(kind, channel.name, f"HTTP {response.status_code}")
+            return False
+        except Exception as e:
+            logMessage(f"Error creating {kind} {channel.name}: {e}", "error")
+            self._recordFailure(kind, channel.name, str(e))
+            return False
+
+    @inPhase("emojis")
+    async def createEmojis(self, serverEmojis=None):
+        """
+        Creates emojis in the target server based on source server emojis
+        
+        Runs as a bounded pipeline: up to emoji_prefetch emojis are downloaded,
+        normalized and encoded at once while uploaders drain the queue, so CDN
+        downloads, image work and uploads overlap without holding every image
+        in memory.
+        
+        Args:
+            serverEmojis (list): Emojis to create, defaults to every source Emoji
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.serverId:
+            logMessage("Server ID not set, can't create emojis", "error")
+            return False
+            
+        try:
+            if serverEmojis is None:
+                serverEmojis = self.guild.emojis
+                
+            serverEmojis = [emoji for emoji in serverEmojis if ("emoji", emoji.id) not in self.completed]
+            
+            if not serverEmojis:
+                logMessage("No emojis to create", "warning")
+                return True
+            
+            logMessage(f"Creating {len(serverEmojis)} emojis", "info")
+            
+            queue = asyncio.Queue(maxsize=self.settings.get("emoji_prefetch", 4))
+            uploaders = [
+                asyncio.create_task(self._uploadEmojis(queue))
+                for _ in range(min(self.rateLimiter.maxConcurrency, len(serverEmojis)))
+            ]
+            
+            try:
+                await self._downloadEmojis(serverEmojis, queue)
+            finally:
+                for _ in uploaders:
+                    await queue.put(None)
+                    
+            await asyncio.gather(*uploaders)
+            
+            return True
+        except Exception as e:
+            logMessage(f"Error creating emojis: {e}", "error")
+            return False
+
+    async def _downloadEmojis(self, serverEmojis, queue):
+        """
+        Downloads and normalizes emojis and queues their encoded upload bodies
+        
+        Args:
+            serverEmojis (list): Source Emojis
+            queue (asyncio.Queue): Queue feeding the uploaders
+        """
+        slots = asyncio.Semaphore(self.settings.get("emoji_prefetch", 4))
+        
+        async def prepareEmoji(emoji):
+            async with slots:
+                try:
+                    key, imgUrl, mime = getEmojiAsset(emoji, self.cdnUrl)
+                    imgContent, statusCode = await self._fetchAsset(key, imgUrl)
+                    
+                    if imgContent is None:
+                        logMessage(f"Failed to download emoji image: {statusCode}", "error")
+                        self._recordFailure("emoji", emoji.name, f"image download failed: {statusCode}")
+                        return
+                    
+                    imgContent, mime = await self._prepareImage(imgContent, "emoji")
+                    emojiBody = encodeImagePayload(
+                        {
+                            "name": emoji.name,
+                            "roles": [self.roleMap[roleId] for roleId in emoji.roles if roleId in self.roleMap],
+                        },
+                        imgContent,
+                        mime,
+                    )
+                    
+                    await queue.put((emoji, emojiBody))
+                except Exception as e:
+                    logMessage(f"Error downloading emoji {emoji.name}: {e}", "error")
+                    self._recordFailure("emoji", emoji.name, str(e))
+                    
+        await asyncio.gather(*(prepareEmoji(emoji) for emoji in serverEmojis))
+
+    async def _uploadEmojis(self, queue):
+        """
+        Uploads queued emojis to the target server until a None sentinel arrives
+        
+        Args:
+            queue (asyncio.Queue): Queue of (emoji, encoded body) pairs
+        """
+        while True:
+            item = await queue.get()
+            
+            if item is None:
+                return
+            
+            emoji, emojiBody = item
+            
+            try:
+                async with self._createLock("emoji", emoji.name):
+                    response = await self._request(
+                        "POST",
+                        f"{self.baseUrl}/guilds/{self.serverId}/emojis",
+                        exists=self._findCreated(
+                            "emojis",
+                            lambda item: item["name"] == emoji.name and item["id"] not in self.emojiMap.values(),
+                            201,
+                        ),
+                        content=emojiBody,
+                        headers={"Content-Type": "application/json"},
+                    )
+                    
+                    if response.status_code == 201:
+                        self.emojiMap[emoji.id] = response.json()["id"]
+                        self._recordStep("emoji", emoji.id, self.emojiMap[emoji.id])
+                        logMessage(f"Created emoji: {emoji.name}", "success")
+                    else:
+                        logMessage(f"Failed to create emoji: {emoji.name}", "error")
+                        self._recordFailure("emoji", emoji.name, f"HTTP {response.status_code}")
+            except Exception as e:
+                logMessage(f"Error creating emoji {emoji.name}: {e}", "error")
+                self._recordFailure("emoji", emoji.name, str(e))
+
+    @inPhase("positions")
+    async def applyPositions(self):
+        """
+        Sets the final role and channel layout with one bulk request each
+        
+        Sends the source positions (and channel parents) for everything in
+        roleMap and channelMap, so the create phases can run in any order.
+        
+        Returns:
+            bool: True if both requests succeeded, False otherwise
+        """
+        rolePositions = [
+            {"id": self.roleMap[role.id], "position": role.position}
+            for role in self.guild.roles
+            if role.id in self.roleMap and role is not self.guild.everyone
+        ]
+        channelPositions = [
+            {
+                "id": self.channelMap[channel.id],
+                "position": channel.position,
+                "parent_id": self.channelMap.get(channel.parentId),
+            }
+            for channel in self.guild.channels
+            if channel.id in self.channelMap
+        ]
+        updates = [(kind, positions) for kind, positions in (("roles", rolePositions), ("channels", channelPositions)) if positions]
+        
+        try:
+            responses = await asyncio.gather(*(
+                self._request("PATCH", f"{self.baseUrl}/guilds/{self.serverId}/{kind}", json=positions)
+                for kind, positions in updates
+            ))
+        except Exception as e:
+            logMessage(f"Error applying positions: {e}", "error")
+            self._recordFailure("positions", "roles and channels", str(e))
+            return False
+        
+        success = True
+        
+        for (kind, positions), response in zip(updates, responses):
+            if response.status_code in (200, 204):
+                logMessage(f"Positioned {len(positions)} {kind}", "success")
+            else:
+                logMessage(f"Failed to position {kind}: {response.status_code}", "error")
+                self._recordFailure("positions", kind, f"HTTP {response.status_code}")
+                success = False
+                
+        return success
+
+    async def cloneStructure(self):
+        """
+        Clones roles, channels and emojis into the server set in serverId
+        
+        Runs the clone as a dependency graph: existing channels are deleted
+        while roles are created, then channels (which reference roles in
+        their overwrites) and emojis (which reference roles) go out together,
+        and finally the layout is fixed with two bulk position requests.
+        Within each phase every independent request is in flight at once,
+        capped per route by the rate limiter. If the existing channels could
+        not be deleted the clone stops before creating any, as a resumed run
+        could not tell them apart from the new ones.
+        
+        Returns:
+            bool: True once every phase has run, False if the clone stopped early
+        """
+        phases = [
+            {"name": "Delete Channels / Create Roles", "funcs": [self.deleteChannels, self.createRoles]},
+            {"name": "Create Channels / Create Emojis", "funcs": [self.createChannels, self.createEmojis]},
+            {"name": "Apply Positions", "funcs": [self.applyPositions]},
+        ]
+        success = True
+        
+        for phase in phases:
+            results = await asyncio.gather(
+                *(func() for func in phase["funcs"]),
+                return_exceptions=True,
+            )
+            
+            for result in results:
+                if isinstance(result, Exception):
+                    logMessage(f"Error in {phase['name']}: {result}", "warning")
+                    
+            if ("phase", "deleteChannels") not in self.completed:
+                logMessage("Could not delete the existing channels, stopping process", "error")
+                self._recordFailure("channel", "existing channels", "not deleted")
+                success = False
+                break
+                    
+        self.assetCache.save()
+        logMessage(f"Asset cache: {self.assetCache.hits} hits, {self.assetCache.misses} misses", "info")
+                    
+        return success
+
+    async def executeAll(self):
+        """
+        Executes the complete server cloning process
+        
+        By default the server is created with all roles and channels inline
+        in one request, followed by a sync for what that request cannot
+        carry; settings.template_create = true creates it from a template
+        of the source instead, and settings.inline_create = false falls
+        back to creating every item separately. When restored from a
+        checkpoint, steps that already finished are skipped and items whose
+        create was interrupted before it was journaled are adopted first.
+        
+        Returns:
+            bool: True if all operations completed successfully
+        """
+        resumed = bool(self.serverId)
+        
+        try:
+            if not self.serverId:
+                if self._usesTemplate():
+                    createServer = self.createServerFromTemplate
+                elif self.settings.get("inline_create", True):
+                    createServer = self.createServerInline
+                else:
+                    createServer = self.createServer
+                
+                if not await createServer():
+                    logMessage("Server creation failed, stopping process", "error")
+                    return False
+            elif ("phase", "configureServer") not in self.completed:
+                await self._configureServer()
+        except Exception as e:
+            logMessage(f"Error in Server Creation: {e}", "warning")
+            return False
+            
+        if ("phase", "inline") in self.completed:
+            await self._finishInlineClone()
+        else:
+            if resumed and not await self._adoptUnjournaled():
+                logMessage("Could not read the target server to resume, stopping process", "error")
+                return False
+            if not await self.cloneStructure():
+                return False
+        
+        if self._isComplete():
+            self._recordStep("done", None)
+        
+        return True
+
+    def _isComplete(self):
+        """
+        Checks whether every source role, channel and emoji has been created
+        
+        Returns:
+            bool: True if nothing is left for a resumed run to do
+        """
+        return (
+            all(role.id in self.roleMap for role in self.guild.roles)
+            and all(channel.id in self.channelMap for channel in self.guild.channels)
+            and all(("emoji", emoji.id) in self.completed for emoji in self.guild.emojis)
+        )
+
+    syncRoleFields = ("name", "permissions", "color", "hoist", "mentionable")
+
+    def _matchItems(self, sourceItems, targetItems, sourceKey, targetKey):
+        """
+        Pairs source and target items that share the same key, in list order
+        
+        Args:
+            sourceItems (list): Source items
+            targetItems (list): Target items
+            sourceKey (callable): Key function for source items
+            targetKey (callable): Key function for target items
+        
+        Returns:
+            tuple: (list of (source, target) pairs, unmatched sources, unmatched targets)
+        """
+        available = {}
+        
+        for target in targetItems:
+            available.setdefault(targetKey(target), []).append(target)
+            
+        pairs = []
+        unmatched = []
+        
+        for source in sourceItems:
+            candidates = available.get(sourceKey(source))
+            
+            if candidates:
+                pairs.append((source, candidates.pop(0)))
+            else:
+                unmatched.append(source)
+                
+        leftovers = [target for candidates in available.values() for target in candidates]
+        return pairs, unmatched, leftovers
+
+    def _diffChannel(self, source, target):
+        """
+        Lists the fields of a target channel that differ from its source
+        
+        Args:
+            source (Channel): Source channel
+            target (dict): Matching target channel data
+        
+        Returns:
+            list: API names of the fields that need patching
+        """
+        changes = [
+            field for field, attribute in Channel.apiFields.items()
+            if (getattr(source, attribute) or None) != (target.get(field) or None)
+        ]
+        
+        sourceOverwrites = {
+            (str(overwrite["id"]), overwrite["type"], str(overwrite["allow"]), str(overwrite["deny"]))
+            for overwrite in self._translateOverwrites(source.overwrites, dropUnmapped=False)
+        }
+        targetOverwrites = {
+            (str(overwrite["id"]), overwrite["type"], str(overwrite["allow"]), str(overwrite["deny"]))
+            for overwrite in target.get("permission_overwrites", [])
+        }
+        
+        if sourceOverwrites != targetOverwrites:
+            changes.append("permission_overwrites")
+        if self.channelMap.get(source.parentId) != target.get("parent_id"):
+            changes.append("parent_id")
+        if source.position != (target.get("position") or 0):
+            changes.append("position")
+            
+        return changes
+
+    def planSync(self, targetData):
+        """
+        Computes the minimal list of operations that turns the target into the source
+        
+        Roles are matched by name, categories by name, other channels by type,
+        name and parent category name, and emojis by name. Matched items are
+        recorded in roleMap/channelMap and only patched if they differ;
+        unmatched source items are created and unmatched target items deleted,
+        unless the source was narrowed by filterServerData. Managed
+        (integration) roles in the target are left alone.
+        
+        Args:
+            targetData (dict): collectServerData output for the target server
+        
+        Returns:
+            list: Operations as {"action", "kind", "source", "target", "changes"} dicts,
+                with the source as a model object and the target as API data
+        """
+        plan = []
+        
+        sourceEveryone = self.guild.everyone
+        targetRoles = sorted(targetData["roles"], key=lambda x: x["position"], reverse=True)
+        targetEveryone = next((role for role in targetRoles if role["name"] == "@everyone"), None)
+        
+        if targetEveryone:
+            self.everyoneRoleId = targetEveryone["id"]
+            
+            if sourceEveryone:
+                self.roleMap[sourceEveryone.id] = targetEveryone["id"]
+                
+                if sourceEveryone.permissions != targetEveryone["permissions"]:
+                    plan.append({"action": "update", "kind": "role", "source": sourceEveryone, "target": targetEveryone, "changes": ["permissions"]})
+                    
+        rolePairs, roleCreates, roleDeletes = self._matchItems(
+            [role for role in self.guild.rolesByPosition if role is not sourceEveryone],
+            [role for role in targetRoles if role["name"] != "@everyone" and not role.get("managed")],
+            lambda role: role.name,
+            lambda role: role["name"],
+        )
+        
+        for source, target in rolePairs:
+            self.roleMap[source.id] = target["id"]
+            changes = [field for field in self.syncRoleFields if getattr(source, field) != target.get(field)]
+            
+            if changes:
+                plan.append({"action": "update", "kind": "role", "source": source, "target": target, "changes": changes})
+                
+        plan[:0] = [{"action": "create", "kind": "role", "source": role, "target": None, "changes": []} for role in roleCreates]
+        
+        sourceChannels = self.guild.channelsByPosition
+        sourceById = self.guild.channelById
+        targetChannels = sorted(targetData["channels"], key=lambda x: x.get("position", 0))
+        targetNames = {channel["id"]: channel["name"] for channel in targetChannels}
+        
+        categoryPairs, categoryCreates, categoryDeletes = self._matchItems(
+            [channel for channel in sourceChannels if channel.isCategory],
+            [channel for channel in targetChannels if channel["type"] == 4],
+            lambda channel: channel.name,
+            lambda channel: channel["name"],
+        )
+        channelPairs, channelCreates, channelDeletes = self._matchItems(
+            [channel for channel in sourceChannels if not channel.isCategory],
+            [channel for channel in targetChannels if channel["type"] != 4],
+            lambda channel: (channel.type, channel.name, sourceById[channel.parentId].name if channel.parentId in sourceById else None),
+            lambda channel: (channel["type"], channel["name"], targetNames.get(channel.get("parent_id"))),
+        )
+        
+        for source, target in categoryPairs + channelPairs:
+            self.channelMap[source.id] = target["id"]
+            
+        for kind, pairs, creates in (("category", categoryPairs, categoryCreates), ("channel", channelPairs, channelCreates)):
+            plan.extend({"action": "create", "kind": kind, "source": channel, "target": None, "changes": []} for channel in creates)
+            
+            for source, target in pairs:
+                changes = self._diffChannel(source, target)
+                
+                if changes:
+                    action = "move" if set(changes) <= {"parent_id", "position"} else "update"
+                    plan.append({"action": action, "kind": kind, "source": source, "target": target, "changes": changes})
+                    
+        emojiPairs, emojiCreates, emojiDeletes = self._matchItems(
+            self.guild.emojis,
+            targetData.get("emojis", []),
+            lambda emoji: emoji.name,
+            lambda emoji: emoji["name"],
+        )
+        
+        plan.extend({"action": "create", "kind": "emoji", "source": emoji, "target": None, "changes": []} for emoji in emojiCreates)
+        
+        for source, target in emojiPairs:
+            self.emojiMap[source.id] = target["id"]
+            self.completed.add(("emoji", source.id))
+        
+        if self.guild.filtered:
+            return plan
+        
+        for kind, deletes in (("channel", channelDeletes), ("category", categoryDeletes), ("role", roleDeletes), ("emoji", emojiDeletes)):
+            plan.extend({"action": "delete", "kind": kind, "source": None, "target": item, "changes": []} for item in deletes)
+            
+        return plan
+
+    async def _runOperation(self, operation):
+        """
+        Runs a single update, move or delete operation from a sync plan
+        
+        Args:
+            operation (dict): Operation from planSync
+        
+        Returns:
+            bool: True if the request succeeded, False otherwise
+        """
+        action, kind = operation["action"], operation["kind"]
+        source, target = operation["source"], operation["target"]
+        
+        try:
+            if action == "delete":
+                urls = {
+                    "role": f"{self.baseUrl}/guilds/{self.serverId}/roles/{target['id']}",
+                    "emoji": f"{self.baseUrl}/guilds/{self.serverId}/emojis/{target['id']}",
+                }
+                response = await self._request("DELETE", urls.get(kind, f"{self.baseUrl}/channels/{target['id']}"))
+                success = response.status_code in (200, 204)
+            else:
+                if kind == "role":
+                    roleData = self._buildRolePayload(source)
+                    payload = {field: roleData[field] for field in operation["changes"]}
+                    url = f"{self.baseUrl}/guilds/{self.serverId}/roles/{target['id']}"
+                else:
+                    payload = {
+                        field: getattr(source, Channel.apiFields[field]) for field in operation["changes"]
+                        if field in Channel.apiFields
+                    }
+                    url = f"{self.baseUrl}/channels/{target['id']}"
+                    
+                    if "permission_overwrites" in operation["changes"]:
+                        payload["permission_overwrites"] = self._translateOverwrites(source.overwrites)
+                        
+                response = await self._request("PATCH", url, json=payload)
+                success = response.status_code == 200
+                
+            name = source.name if source else target["name"]
+            
+            if success:
+                logMessage(f"{action.capitalize()}d {kind}: {name}", "success")
+            else:
+                logMessage(f"Failed to {action} {kind}: {name}", "error")
+                self._recordFailure(kind, name, f"{action} failed: HTTP {response.status_code}")
+                
+            return success
+        except Exception as e:
+            logMessage(f"Error running {action} {kind}: {e}", "error")
+            self._recordFailure(kind, source.name if source else target["name"], f"{action} failed: {e}")
+            return False
+
+    async def runPlan(self, plan):
+        """
+        Runs a sync plan in dependency order
+        
+        Roles go first, then categories, then channels and emojis, then every
+        delete. Moves and position changes are not sent one by one; they are
+        applied by the bulk applyPositions requests at the end.
+        
+        Args:
+            plan (list): Operations from planSync
+        """
+        def select(kinds, delete=False):
+            return [
+                op for op in plan
+                if op["kind"] in kinds and (op["action"] == "delete") == delete and op["action"] != "move"
+            ]
+        
+        async def runOperations(operations, phase):
+            token = currentPhase.set(phase)
+            
+            try:
+                await asyncio.gather(*(
+                    (self._createRole(op["source"]) if op["kind"] == "role" else self._createChannel(op["source"]))
+                    if op["action"] == "create" else self._runOperation(op)
+                    for op in operations
+                ))
+            finally:
+                currentPhase.reset(token)
+            
+        await runOperations(select(("role",)), "roles")
+        await runOperations(select(("category",)), "channels")
+        
+        emojiCreates = [op["source"] for op in select(("emoji",))]
+        channelPhase = [runOperations(select(("channel",)), "channels")]
+        
+        if emojiCreates:
+            channelPhase.append(self.createEmojis(emojiCreates))
+            
+        await asyncio.gather(*channelPhase)
+        await runOperations(select(("channel", "category", "role", "emoji"), delete=True), "deletes")
+        
+        if self._needsPositions(plan):
+            await self.applyPositions()
+
+    def _needsPositions(self, plan):
+        """
+        Checks whether a sync plan changes the role or channel layout
+        
+        Args:
+            plan (list): Operations from planSync
+        
+        Returns:
+            bool: True if roles or channels are created or moved
+        """
+        return any(
+            (op["action"] == "create" and op["kind"] != "emoji")
+            or op["action"] == "move"
+            or {"parent_id", "position"} & set(op["changes"])
+            for op in plan
+        )
+
+    async def syncStructure(self, targetData):
+        """
+        Brings an existing server in line with the source using a minimal plan
+        
+        Args:
+            targetData (dict): collectServerData output for the target server
+        
+        Returns:
+            bool: True once the plan has run
+        """
+        plan = self.planSync(targetData)
+        counts = {}
+        
+        for operation in plan:
+            counts[operation["action"]] = counts.get(operation["action"], 0) + 1
+            
+        logMessage(
+            f"Sync plan: {counts.get('create', 0)} creates, {counts.get('update', 0)} updates, "
+            f"{counts.get('move', 0)} moves, {counts.get('delete', 0)} deletes",
+            "info",
+        )
+        
+        await self.runPlan(plan)
+        
+        self.assetCache.save()
+        logMessage(f"Asset cache: {self.assetCache.hits} hits, {self.assetCache.misses} misses", "info")
+        
+        return True
+
+    planLimits = {"default": (5, 5.0)}
+
+    def _planRequest(self, phase, method, url, description, concurrency=None):
+        """
+        Describes one API request the clone would send
+        
+        Args:
+            phase (str): Clone phase the request runs in
+            method (str): HTTP method
+            url (str): Request URL, with 0 standing in for IDs not known yet
+            description (str): What the request does
+            concurrency (int): Requests of this kind in flight at once
+        
+        Returns:
+            dict: Planned request tagged with its route and rate limit bucket
+        """
+        route, major = self.rateLimiter._parseRoute(method, url)
+        
+        return {
+            "phase": phase,
+            "method": method,
+            "route": route,
+            "bucket": f"{route}:{major}",
+            "description": description,
+            "concurrency": concurrency or self.rateLimiter.maxConcurrency,
+        }
+
+    def planRequests(self, targetData=None):
+        """
+        Lists, in order, every API request the clone would perform
+        
+        Without targetData this is the new-server path of executeAll, assuming
+        the inline or template create carries every role and channel. The
+        template requests follow readTemplates if it ran, and otherwise
+        assume a temporary template is created. With
+        targetData it is the sync plan for an existing server; planning then
+        fills roleMap and channelMap just like a real sync would.
+        
+        Args:
+            targetData (dict): collectServerData output for an existing target server
+        
+        Returns:
+            list: Planned requests from _planRequest
+        """
+        guildId = self.serverId or "0"
+        guildUrl = f"{self.baseUrl}/guilds/{guildId}"
+        requests = []
+        
+        if targetData is None and (self._usesTemplate() or self.settings.get("inline_create", True)):
+            templates = self.sourceTemplates
+            
+            if self._usesTemplate() and templates is not False:
+                templatesUrl = f"{self.baseUrl}/guilds/{self.guild.id}/templates"
+                
+                if templates is None:
+                    requests.append(self._planRequest("server", "GET", templatesUrl, "Read source templates"))
+                if not templates:
+                    requests.append(self._planRequest("server", "POST", templatesUrl, "Create source template"))
+                elif templates[0].get("is_dirty"):
+                    requests.append(self._planRequest("server", "PUT", f"{templatesUrl}/{templates[0]['code']}", "Sync source template"))
+                    
+                requests.append(self._planRequest("server", "POST", f"{self.baseUrl}/guilds/templates/0",
+                                                  f"Create server from template: {self.guild.name}"))
+                
+                if not templates:
+                    requests.append(self._planRequest("server", "DELETE", f"{templatesUrl}/0", "Delete temporary source template"))
+            else:
+                requests.append(self._planRequest("server", "POST", f"{self.baseUrl}/guilds",
+                                                  f"Create server with {len(self.guild.roles)} roles and "
+                                                  f"{len(self.guild.channels)} channels: {self.guild.name}"))
+            requests.append(self._planRequest("server", "PATCH", f"{guildUrl}/roles/{guildId}", "Update @everyone role"))
+            requests.append(self._planRequest("server", "PATCH", guildUrl, "Update server settings"))
+            requests.append(self._planRequest("server", "GET", guildUrl, "Read back new server"))
+            requests.append(self._planRequest("server", "GET", f"{guildUrl}/channels", "Read back new channels"))
+            
+            for emoji in self.guild.emojis:
+                requests.append(self._planRequest("emojis", "POST", f"{guildUrl}/emojis", f"Create emoji: {emoji.name}"))
+                
+            requests.append(self._planRequest("positions", "PATCH", f"{guildUrl}/roles", "Set role positions"))
+            requests.append(self._planRequest("positions", "PATCH", f"{guildUrl}/channels", "Set channel positions"))
+            return requests
+        
+        if targetData is None:
+            requests.append(self._planRequest("server", "POST", f"{self.baseUrl}/guilds", f"Create server: {self.guild.name}"))
+            requests.append(self._planRequest("server", "PATCH", f"{guildUrl}/roles/{guildId}", "Update @everyone role"))
+            requests.append(self._planRequest("server", "PATCH", guildUrl, "Update server settings"))
+            requests.append(self._planRequest("roles", "GET", f"{guildUrl}/channels", "List default channels to delete"))
+            
+            for role in self.guild.rolesByPosition:
+                if role is not self.guild.everyone:
+                    requests.append(self._planRequest("roles", "POST", f"{guildUrl}/roles", f"Create role: {role.name}"))
+                    
+            for channel in self.guild.createOrder:
+                kind = "category" if channel.isCategory else "channel"
+                requests.append(self._planRequest("channels", "POST", f"{guildUrl}/channels", f"Create {kind}: {channel.name}"))
+                
+            for emoji in self.guild.emojis:
+                requests.append(self._planRequest("emojis", "POST", f"{guildUrl}/emojis", f"Create emoji: {emoji.name}"))
+                
+            requests.append(self._planRequest("positions", "PATCH", f"{guildUrl}/roles", "Set role positions"))
+            requests.append(self._planRequest("positions", "PATCH", f"{guildUrl}/channels", "Set channel positions"))
+            return requests
+        
+        phases = {"role": "roles", "category": "channels", "channel": "channels", "emoji": "emojis"}
+        plan = self.planSync(targetData)
+        
+        for operation in plan:
+            action, kind = operation["action"], operation["kind"]
+            
+            if action == "move":
+                continue
+            
+            name = operation["source"].name if operation["source"] else operation["target"]["name"]
+            targetId = (operation["target"] or {}).get("id", "0")
+            phase = "deletes" if action == "delete" else phases[kind]
+            description = f"{action.capitalize()} {kind}: {name}"
+            
+            if kind == "role":
+                url = f"{guildUrl}/roles" if action == "create" else f"{guildUrl}/roles/{targetId}"
+            elif kind == "emoji":
+                url = f"{guildUrl}/emojis" if action == "create" else f"{guildUrl}/emojis/{targetId}"
+            else:
+                url = f"{guildUrl}/channels" if action == "create" else f"{self.baseUrl}/channels/{targetId}"
+                
+            method = {"create": "POST", "delete": "DELETE"}.get(action, "PATCH")
+            requests.append(self._planRequest(phase, method, url, description))
+            
+        if self._needsPositions(plan):
+            requests.append(self._planRequest("positions", "PATCH", f"{guildUrl}/roles", "Set role positions"))
+            requests.append(self._planRequest("positions", "PATCH", f"{guildUrl}/channels", "Set channel positions"))
+            
+        return requests
+
+    concurrentPhases = {"emojis": "channels"}
+
+    def estimateDuration(self, requests, limits=None, latency=None):
+        """
+        Predicts the wall-clock time of a request plan
+        
+        Phases run one after another, except the phases in concurrentPhases
+        that run alongside another one. Inside a phase every bucket drains in
+        parallel, each limited by its concurrency, the assumed request latency
+        and its rate limit window. Discord does not publish per-route limits,
+        so they come from settings.plan_limits ({route: [limit, window]}),
+        falling back to planLimits["default"], unless limits observed during
+        the run are given.
+        
+        Args:
+            requests (list): Planned requests from planRequests
+            limits (dict): Route -> (limit, window) overriding the configured limits
+            latency (float): Request latency to assume instead of settings.plan_latency
+        
+        Returns:
+            dict: {"total": seconds, "phases": {phase: seconds}, "buckets": {bucket: {...}}}
+        """
+        latency = latency or self.settings.get("plan_latency", 0.3)
+        limits = {**self.planLimits, **self.settings.get("plan_limits", {}), **(limits or {})}
+        buckets = {}
+        
+        for request in requests:
+            bucket = buckets.setdefault(request["bucket"], {
+                "phase": request["phase"],
+                "route": request["route"],
+                "requests": 0,
+                "concurrency": request["concurrency"],
+            })
+            bucket["requests"] += 1
+            
+        phases = {}
+        
+        for name, bucket in buckets.items():
+            limit, window = limits.get(bucket["route"], limits["default"])
+            sendTime = math.ceil(bucket["requests"] / bucket["concurrency"]) * latency
+            waitTime = (math.ceil(bucket["requests"] / limit) - 1) * window + latency
+            bucket["seconds"] = round(max(sendTime, waitTime), 2)
+            phases[bucket["phase"]] = max(phases.get(bucket["phase"], 0.0), bucket["seconds"])
+            
+        groups = {}
+        
+        for phase, seconds in phases.items():
+            group = self.concurrentPhases.get(phase, phase)
+            groups[group] = max(groups.get(group, 0.0), seconds)
+            
+        return {
+            "total": round(sum(groups.values()), 2),
+            "phases": phases,
+            "buckets": buckets,
+        }
+
+@dataclass(slots=True)
+class CloneResult:
+    """
+    Outcome of one CloneSession.clone
+    
+    Attributes:
+        serverId (str): ID of the target server, None if it was never created
+        mode (str): "new" or "sync"
+        complete (bool): Whether every role, channel and emoji was created
+        roleMap (dict): Source role ID -> target role ID
+        channelMap (dict): Source channel ID -> target channel ID
+        emojiMap (dict): Source emoji ID -> target emoji ID
+        failures (list): {"kind", "name", "reason"} of every item that failed
+        differences (dict): Parity check "missing", "extra" and "changed" keys, None if it did not run
+        seconds (float): Wall time of the clone
+        metrics (dict): RequestMetrics.report of the clone's requests and phases
+    """
+    serverId: str
+    mode: str
+    complete: bool
+    roleMap: dict
+    channelMap: dict
+    emojiMap: dict
+    failures: list
+    differences: dict
+    seconds: float
+    metrics: dict
+
+    @property
+    def ok(self):
+        return (bool(self.serverId) and self.complete and not self.failures
+                and not any(self.differences.values() if self.differences else ()))
+
+class CloneSession:
+    """
+    Library entry point for running many clones from one long-lived process
+    
+    Every scrape and clone of a session shares one HTTP pool, rate limiter
+    and asset cache, so connections, learned rate limits and downloaded
+    images stay warm between calls. Nothing is prompted or read from
+    config.json; settings take the same keys as its "settings" object and
+    log_level defaults to "warning".
+    
+    Example:
+        async with CloneSession(token) as session:
+            source = await session.scrape("123456789012345678")
+            result = await session.clone(source)
+            print(result.serverId, result.channelMap)
+    
+    Attributes:
+        config (dict): Configuration handed to every scraper and creator
+        metrics (RequestMetrics): Metrics of the session's scrapes and snapshots
+        assets (dict): Guild ID -> snapshot assets of every loaded snapshot
+    """
+    
+    def __init__(self, token, settings=None, config=None):
+        """
+        Open a session
+        
+        Args:
+            token (str): Discord user token
+            settings (dict): Settings overriding config["settings"]
+            config (dict): Base configuration in the config.json format
+        
+        Raises:
+            ConfigError: If the settings fail validation
+        """
+        config = dict(config or {})
+        self.config = {**config, "token": token, "settings": {"log_level": "warning", **config.get("settings", {}), **(settings or {})}}
+        problems = validateConfig(self.config)
+        
+        if problems:
+            raise ConfigError(f"Invalid settings: {'; '.join(problems)}")
+        
+        self.token = token
+        self.settings = self.config["settings"]
+        self.metrics = RequestMetrics()
+        self.pool = HttpPool(token, self.settings)
+        self.rateLimiter = RateLimiter(self.settings.get("max_concurrency", 5))
+        self.assetCache = AssetCache(
+            self.settings.get("asset_cache_dir", ".cache/assets"),
+            self.settings.get("asset_cache_size_mb", 256) * 1024 * 1024,
+        )
+        self.assets = {}
+        logger.configure(self.config)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exception):
+        await self.close()
+
+    async def close(self):
+        """
+        Save the asset cache index and close every pooled connection
+        """
+        self.assetCache.save()
+        await self.pool.aclose()
+        logger.flush()
+
+    def _scraper(self, serverId, metrics=None):
+        return ServerScraper(self.token, str(serverId), self.config, metrics or self.metrics, self.pool, self.rateLimiter)
+
+    async def scrape(self, serverId, filters=None):
+        """
+        Read a server's structure
+        
+        Args:
+            serverId (str): Server ID
+            filters (dict): Selective clone filters, see filterServerData
+        
+        Returns:
+            Guild: The server model
+        
+        Raises:
+            RequestError: If the server can't be read
+        """
+        serverData = await self._scraper(serverId).collectServerData()
+        return Guild.fromData(filterServerData(serverData, filters or {}))
+
+    def load(self, path, filters=None):
+        """
+        Read a snapshot file, keeping its assets for later clones of the guild
+        
+        Args:
+            path (str): Snapshot file path
+            filters (dict): Selective clone filters, see filterServerData
+        
+        Returns:
+            Guild: The server model
+        
+        Raises:
+            SnapshotError: If the snapshot version is not supported
+        """
+        serverData, assets, _ = loadSnapshot(path)
+        guild = Guild.fromData(filterServerData(serverData, filters or {}))
+        self.assets[guild.id] = assets
+        return guild
+
+    async def snapshot(self, serverId, path, filters=None):
+        """
+        Save a server's structure, icon and emojis to a snapshot file
+        
+        Args:
+            serverId (str): Server ID
+            path (str): Snapshot file path
+            filters (dict): Selective clone filters, see filterServerData
+        
+        Returns:
+            Guild: The saved server model
+        """
+        scraper = self._scraper(serverId)
+        serverData = filterServerData(await scraper.collectServerData(), filters or {})
+        assets = await scraper.collectAssets(serverData)
+        saveSnapshot(path, serverData, assets)
+        guild = Guild.fromData(serverData)
+        self.assets[guild.id] = assets
+        return guild
+
+    async def clone(self, source, target=None, filters=None, allowDeletes=False, verify=None, checkpoint=None):
+        """
+        Clone a source server into a new server, or sync it into an existing one
+        
+        Args:
+            source: Guild from scrape or load, a server ID, or a snapshot path
+            target (str): Server ID to sync into, None to create a new server
+            filters (dict): Selective clone filters, see filterServerData
+            allowDeletes (bool): Whether an unfiltered sync may delete target items not in the source
+            verify (bool): Run the parity check afterwards, settings.verify if None
+            checkpoint (str): Checkpoint file to write, so the clone can be resumed
+        
+        Returns:
+            CloneResult: The finished clone
+        
+        Raises:
+            UnconfirmedSyncError: If an unfiltered sync was not allowed to delete
+            RequestError: If the source or target server can't be read
+            CloneError: If items failed or the target differs from the source; its result holds what was done
+        """
+        if isinstance(source, Guild):
+            guild = Guild.fromData(filterServerData(source.toData(), filters)) if filters else source
+        elif os.path.isfile(str(source)):
+            guild = self.load(source, filters)
+        else:
+            guild = await self.scrape(source, filters)
+            
+        mode = "sync" if target else "new"
+        
+        if mode == "sync" and not guild.filtered and not allowDeletes:
+            raise UnconfirmedSyncError("syncing would delete target items not in the source, pass allowDeletes=True to allow it")
+        
+        metrics = RequestMetrics()
+        creator = ServerCreator(self.token, guild, self.assets.get(guild.id), self.config, metrics=metrics,
+                                pool=self.pool, rateLimiter=self.rateLimiter, assetCache=self.assetCache)
+        startedAt = monotonic()
+        differences = None
+        
+        try:
+            if mode == "sync":
+                creator.serverId = str(target)
+                targetData = await self._scraper(target, metrics).collectServerData()
+                
+                if checkpoint:
+                    creator.startCheckpoint(checkpoint, mode)
+                await creator.syncStructure(targetData)
+            else:
+                if checkpoint:
+                    creator.startCheckpoint(checkpoint, mode)
+                await creator.executeAll()
+                
+            if creator.serverId and (self.settings.get("verify", True) if verify is None else verify):
+                differences = await creator.verifyClone()
+        finally:
+            if creator.checkpoint:
+                creator.checkpoint.close()
+            logger.flush()
+            
+        result = CloneResult(
+            serverId=creator.serverId,
+            mode=mode,
+            complete=bool(creator.serverId) and creator._isComplete(),
+            roleMap=dict(creator.roleMap),
+            channelMap=dict(creator.channelMap),
+            emojiMap=dict(creator.emojiMap),
+            failures=list(creator.failures),
+            differences=differences,
+            seconds=round(monotonic() - startedAt, 2),
+            metrics=metrics.report(),
+        )
+        
+        if not result.ok:
+            count = sum(len(keys) for keys in differences.values()) if differences else 0
+            raise CloneError(f"clone of {guild.name} finished with {len(result.failures)} failed items "
+                             f"and {count} differences from the source", result)
+            
+        return result
+
+taskLoop = None
+
+def runTask(coroutine):
+    """
+    Runs a coroutine to completion and flushes buffered log output afterwards
+    
+    Every task of a run shares one event loop, so the connections kept open
+    by an HttpPool carry over from scraping to cloning.
+    
+    Args:
+        coroutine: The coroutine to run
+    
+    Returns:
+        The coroutine's result
+    """
+    global taskLoop
+    
+    if taskLoop is None or taskLoop.is_closed():
+        taskLoop = asyncio.new_event_loop()
+        atexit.register(taskLoop.close)
+        
+    try:
+        return taskLoop.run_until_complete(coroutine)
+    finally:
+        logger.flush()
+
+def getFilters(arguments, config):
+    """
+    Builds the clone filter spec from settings.filters and command line flags
+    
+    Args:
+        arguments (Namespace): Parsed arguments, flags that were given win
+        config (dict): Loaded configuration
+    
+    Returns:
+        dict: Filter spec for filterServerData
+    """
+    filters = dict(config.get("settings", {}).get("filters", {}))
+    
+    for key in ("categories", "exclude_categories", "channel_types", "roles", "exclude_roles", "emojis"):
+        if getattr(arguments, key, None) is not None:
+            filters[key] = getattr(arguments, key)
+            
+    return filters
+
+def getCheckpointPath(config, sourceServerId):
+    """
+    Builds a new checkpoint file path for a clone job
+    
+    Args:
+        config (dict): Loaded configuration
+        sourceServerId (str): ID of the source server
+    
+    Returns:
+        str: Checkpoint file path
+    """
+    checkpointDir = config.get("settings", {}).get("checkpoint_dir", "checkpoints")
+    return os.path.join(checkpointDir, f"{sourceServerId}-{strftime('%Y%m%d-%H%M%S')}.jsonl")
+
+def displayPlan(requests, estimate, planFile=None):
+    """
+    Prints a dry-run plan summary and optionally writes the full plan as JSON
+    
+    Args:
+        requests (list): Planned requests from ServerCreator.planRequests
+        estimate (dict): Output of ServerCreator.estimateDuration
+        planFile (str): Path to write the full plan to
+    """
+    logMessage(f"Planned {len(requests)} requests, estimated {estimate['total']:.1f}s", "info")
+    
+    for phase, seconds in estimate["phases"].items():
+        logMessage(f"Phase {phase}: ~{seconds:.1f}s", "info")
+        
+    for name, bucket in sorted(estimate["buckets"].items(), key=lambda item: -item[1]["seconds"]):
+        logMessage(f"{name}: {bucket['requests']} requests, ~{bucket['seconds']:.1f}s", "default")
+        
+    if planFile:
+        with open(planFile, "w") as outputFile:
+            json.dump({"requests": requests, "estimate": estimate}, outputFile, indent=4)
+        logMessage(f"Wrote plan to {planFile}", "success")
+        
+    logger.flush()
+
+def writeRunReport(metrics, config):
+    """
+    Writes the run's request metrics to a JSON report and, if configured, a Prometheus textfile
+    
+    Reports go to settings.report_dir (default "reports"); the textfile is
+    written to settings.prometheus_textfile when set.
+    
+    Args:
+        metrics (RequestMetrics): Metrics collected during the run
+        config (dict): Loaded configuration
+    
+    Returns:
+        str: Report file path, or None if no requests were made
+    """
+    if not metrics.endpoints:
+        return None
+    
+    settings = config.get("settings", {})
+    reportPath = os.path.join(settings.get("report_dir", "reports"), f"run-{strftime('%Y%m%d-%H%M%S')}.json")
+    
+    try:
+        metrics.writeReport(reportPath)
+        
+        if settings.get("prometheus_textfile"):
+            metrics.writePrometheus(settings["prometheus_textfile"])
+    except OSError as e:
+        logMessage(f"Failed to write run report: {e}", "error")
+        return None
+    
+    report = metrics.report()
+    logMessage(f"Run report: {reportPath} ({report['requests']} requests, {report['retries']} retries, "
+               f"{report['rateLimitWait']:.1f}s waiting on rate limits)", "info")
+    return reportPath
+
+def loadJobs(path):
+    """
+    Reads a batch job file
+    
+    JSON files are always supported; YAML needs the optional PyYAML package.
+    The file holds either a list of jobs or {"workers": n, "jobs": [...]},
+    where each job has a source (server ID or snapshot file) and optionally
+    a target server ID, a snapshot path to save to, a name and filters.
+    
+    Args:
+        path (str): Job file path
+    
+    Returns:
+        tuple: (list of job dicts, worker count or None)
+    
+    Raises:
+        ValueError: If the file is not a valid job list
+    """
+    with open(path, encoding="utf-8") as jobFile:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML job files need PyYAML (pip install pyyaml), or use JSON")
+            
+            data = yaml.safe_load(jobFile)
+        else:
+            data = json.load(jobFile)
+            
+    if isinstance(data, list):
+        data = {"jobs": data}
+        
+    if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+        raise ValueError("job file must be a list of jobs or an object with a \"jobs\" list")
+    
+    for index, job in enumerate(data["jobs"]):
+        if not isinstance(job, dict) or not job.get("source"):
+            raise ValueError(f"job {index + 1} needs a source")
+        if job.get("target") and job.get("snapshot"):
+            raise ValueError(f"job {index + 1} can't have both a target and a snapshot")
+        
+    return data["jobs"], data.get("workers")
+
+def loadSource(source, filters, token, config, shared):
+    """
+    Loads a batch job's source server once, however many jobs clone it
+    
+    Jobs with the same source and filters share one scrape (or snapshot
+    read) and one immutable Guild model.
+    
+    Args:
+        source (str): Source server ID or snapshot path
+        filters (dict): Selective clone filters, see filterServerData
+        token (str): Discord user token
+        config (Config): Shared configuration
+        shared (dict): Resources shared by every job, see runJob
+    
+    Returns:
+        asyncio.Future: Resolves to (Guild, assets dict)
+    """
+    key = (source, json.dumps(filters, sort_keys=True))
+    
+    if key not in shared["sources"]:
+        async def load():
+            if os.path.isfile(source):
+                serverData, assets, _ = loadSnapshot(source)
+            else:
+                scraper = ServerScraper(token, source, config, shared["metrics"], shared["pool"], shared["rateLimiter"])
+                serverData, assets = await scraper.collectServerData(), {}
+                
+            return Guild.fromData(filterServerData(serverData, filters)), assets
+        
+        shared["sources"][key] = asyncio.ensure_future(load())
+        
+    return shared["sources"][key]
+
+async def runJob(index, job, token, config, shared, confirmed=False):
+    """
+    Runs one batch job without any prompts
+    
+    With shared["dryRun"] set, sources and targets are only read: the job's
+    request plan is logged and kept in shared["plans"], and nothing is
+    created, changed or saved.
+    
+    Args:
+        index (int): Position of the job in the batch
+        job (dict): Job from loadJobs or the command line, or {"resume": checkpoint path}
+        token (str): Discord user token
+        config (Config): Shared configuration
+        shared (dict): metrics, pool, rateLimiter, assetCache, loaded sources, source
+            fingerprints of earlier successful runs, dryRun and plans, shared by every job
+        confirmed (bool): Whether unfiltered syncs may delete target items
+    
+    Returns:
+        dict: Job result with name, mode, status (ok, planned, skipped or failed), serverId,
+            checkpoint, seconds, error and differences found by the parity check
+    """
+    resume = job.get("resume")
+    mode = "resume" if resume else "sync" if job.get("target") else "snapshot" if job.get("snapshot") else "new"
+    result = {"name": job.get("name") or str(resume or job["source"]), "mode": mode, "status": "failed",
+              "serverId": job.get("target"), "checkpoint": resume, "seconds": 0.0, "error": None, "differences": None}
+    clientArgs = {"metrics": shared["metrics"], "pool": shared["pool"], "rateLimiter": shared["rateLimiter"]}
+    startedAt = monotonic()
+    serverCreator = None
+    jobKey = fingerprint = None
+    
+    try:
+        if resume:
+            serverCreator, mode, finished = ServerCreator.fromCheckpoint(token, resume, config, assetCache=shared["assetCache"], **clientArgs)
+            result.update(mode=mode, serverId=serverCreator.serverId)
+            
+            if finished:
+                result["status"] = "skipped"
+                return result
+            
+            logMessage(f"Resuming {mode} clone of {serverCreator.guild.name} ({len(serverCreator.roleMap)} roles, "
+                       f"{len(serverCreator.channelMap)} channels done)", "info")
+        else:
+            source = str(job["source"])
+            filters = {**config.settings.get("filters", {}), **job.get("filters", {})}
+            
+            jobKey = json.dumps([mode, source, job.get("target"), job.get("snapshot"), filters], sort_keys=True)
+            
+            if mode == "snapshot":
+                sourceScraper = ServerScraper(token, source, config, **clientArgs)
+                sourceData = filterServerData(await sourceScraper.collectServerData(), filters)
+                fingerprint = Guild.fromData(sourceData).fingerprintHash()
+                
+                if shared["skipUnchanged"] and getSnapshotFingerprint(job["snapshot"]) == fingerprint:
+                    result.update(status="skipped", serverId=None)
+                    return result
+                
+                if shared["dryRun"]:
+                    logMessage(f"Would save snapshot of {sourceData['info'].get('name')} to {job['snapshot']}", "info")
+                    result.update(status="planned", serverId=None)
+                    return result
+                
+                saveSnapshot(job["snapshot"], sourceData, await sourceScraper.collectAssets(sourceData))
+                result.update(status="ok", serverId=None)
+                return result
+            
+            guild, sourceAssets = await loadSource(source, filters, token, config, shared)
+            fingerprint = guild.fingerprintHash()
+            
+            if shared["skipUnchanged"] and shared["fingerprints"].get(jobKey) == fingerprint:
+                result["status"] = "skipped"
+                return result
+            
+            if mode == "sync" and not guild.filtered and not confirmed and not shared["dryRun"]:
+                raise UnconfirmedSyncError("syncing would delete target items not in the source, pass --yes to allow it")
+            
+            serverCreator = ServerCreator(token, guild, sourceAssets, config, assetCache=shared["assetCache"], **clientArgs)
+            
+            if mode == "sync":
+                serverCreator.serverId = str(job["target"])
+                
+            result["checkpoint"] = getCheckpointPath(config, f"{guild.id}-job{index + 1}")
+        
+        if mode == "sync":
+            targetScraper = ServerScraper(token, serverCreator.serverId, config, **clientArgs)
+            targetData = await targetScraper.collectServerData()
+        else:
+            targetData = None
+            await serverCreator.readTemplates()
+            
+        if shared["dryRun"]:
+            requests = serverCreator.planRequests(targetData)
+            estimate = serverCreator.estimateDuration(requests)
+            logMessage(f"Job {result['name']} ({mode}):", "info")
+            displayPlan(requests, estimate)
+            shared["plans"][index] = {"name": result["name"], "mode": mode, "requests": requests, "estimate": estimate}
+            result.update(status="planned", checkpoint=None)
+            return result
+        
+        if not resume:
+            serverCreator.startCheckpoint(result["checkpoint"], mode)
+            
+        clone = serverCreator.syncStructure(targetData) if mode == "sync" else serverCreator.executeAll()
+            
+        if config.settings.get("progress", True):
+            await CloneProgress(serverCreator, serverCreator.planRequests(targetData), result["name"]).run(clone)
+        else:
+            await clone
+            
+        result["serverId"] = serverCreator.serverId
+        
+        if serverCreator.serverId and config.settings.get("verify", True):
+            differences = await serverCreator.verifyClone()
+            result["differences"] = None if differences is None else sum(len(keys) for keys in differences.values())
+            
+        if not serverCreator.serverId or not serverCreator._isComplete():
+            result["error"] = "some roles, channels or emojis were not created"
+        elif result["differences"]:
+            result["error"] = f"target differs from the source in {result['differences']} places"
+        else:
+            result["status"] = "ok"
+            
+            if jobKey:
+                shared["fingerprints"][jobKey] = fingerprint
+    except Exception as e:
+        result["error"] = str(e) or e.__class__.__name__
+    finally:
+        if serverCreator and serverCreator.checkpoint:
+            serverCreator.checkpoint.close()
+            
+        result["seconds"] = round(monotonic() - startedAt, 2)
+        level = {"ok": "success", "planned": "info", "skipped": "info"}.get(result["status"], "error")
+        logMessage(f"Job {result['name']} ({mode}): {result['status']}" + (f" - {result['error']}" if result["error"] else ""), level)
+        
+    return result
+
+async def runJobs(jobs, token, config, shared, workers=2, confirmed=False):
+    """
+    Runs batch jobs through a small worker queue
+    
+    Args:
+        jobs (list): Jobs to run
+        token (str): Discord user token
+        config (Config): Shared configuration
+        shared (dict): Resources shared by every job, see runJob
+        workers (int): Jobs running at the same time
+        confirmed (bool): Whether unfiltered syncs may delete target items
+    
+    Returns:
+        list: Job results in job order
+    """
+    queue = asyncio.Queue()
+    results = [None] * len(jobs)
+    
+    for index, job in enumerate(jobs):
+        queue.put_nowait((index, job))
+        
+    async def worker():
+        while not queue.empty():
+            index, job = queue.get_nowait()
+            results[index] = await runJob(index, job, token, config, shared, confirmed)
+            
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(jobs))))))
+    shared["assetCache"].save()
+    await shared["pool"].aclose()
+    return results
+
+def getFingerprintPath(config):
+    return config.get("settings", {}).get("fingerprint_file", os.path.join(".cache", "fingerprints.json"))
+
+def loadFingerprints(config):
+    """
+    Reads the source fingerprints recorded by earlier batch runs
+    
+    Args:
+        config (dict): Loaded configuration
+    
+    Returns:
+        dict: Job key -> fingerprint hash of the source it last ran with successfully
+    """
+    try:
+        with open(getFingerprintPath(config)) as fingerprintFile:
+            return json.load(fingerprintFile)
+    except (OSError, ValueError):
+        return {}
+
+def saveFingerprints(config, fingerprints):
+    """
+    Writes the source fingerprints for the next batch run
+    
+    Args:
+        config (dict): Loaded configuration
+        fingerprints (dict): Job key -> fingerprint hash
+    """
+    path = getFingerprintPath(config)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    
+    with open(path, "w") as fingerprintFile:
+        json.dump(fingerprints, fingerprintFile, indent=4)
+
+def runBatch(arguments):
+    """
+    Runs clone jobs from a job file, the command line or a checkpoint without prompts
+    
+    With --dry-run every job is only planned, and --plan-file receives the
+    plans as JSON.
+    
+    Args:
+        arguments (Namespace): Parsed arguments
+    
+    Returns:
+        int: Exit code, 0 if every job succeeded, was planned or was skipped, 1 if any failed, 2 on bad input
+    """
+    config = loadConfig()
+    token = config.get("token", "")
+    
+    if not token:
+        logMessage("Token not found in config.json", "error")
+        return 2
+    
+    try:
+        if arguments.resume:
+            if not os.path.isfile(arguments.resume):
+                raise ValueError(f"checkpoint {arguments.resume} not found")
+            jobs, workers = [{"resume": arguments.resume}], 1
+        elif arguments.batch:
+            jobs, workers = loadJobs(arguments.batch)
+        else:
+            job = {"source": arguments.source, "target": arguments.target, "snapshot": arguments.snapshot}
+            jobs, workers = [{key: value for key, value in job.items() if value}], None
+    except (OSError, ValueError) as e:
+        logMessage(f"Invalid jobs: {e}", "error")
+        return 2
+    
+    cliFilters = getFilters(arguments, {})
+    
+    for job in jobs:
+        job["filters"] = {**job.get("filters", {}), **cliFilters}
+        
+    workers = arguments.workers or workers or config.settings.get("batch_workers", 2)
+    shared = {
+        "metrics": RequestMetrics(),
+        "pool": HttpPool(token, config.settings),
+        "rateLimiter": RateLimiter(config.settings.get("max_concurrency", 5)),
+        "assetCache": AssetCache(
+            config.settings.get("asset_cache_dir", ".cache/assets"),
+            config.settings.get("asset_cache_size_mb", 256) * 1024 * 1024,
+        ),
+        "sources": {},
+        "fingerprints": loadFingerprints(config),
+        "skipUnchanged": arguments.skip_unchanged,
+        "dryRun": arguments.dry_run,
+        "plans": [None] * len(jobs),
+    }
+    
+    try:
+        results = runTask(runJobs(jobs, token, config, shared, workers, arguments.yes))
+    finally:
+        saveFingerprints(config, shared["fingerprints"])
+        writeRunReport(shared["metrics"], config)
+        logger.flush()
+        
+    if arguments.plan_file:
+        plans = [plan for plan in shared["plans"] if plan]
+        
+        with open(arguments.plan_file, "w") as planFile:
+            json.dump(plans[0] if len(jobs) == 1 and plans else {"jobs": plans}, planFile, indent=4)
+        logMessage(f"Wrote plan to {arguments.plan_file}", "success")
+        logger.flush()
+    
+    failed = [result for result in results if result["status"] == "failed"]
+    print(f"\n{'job':<30} {'mode':<9} {'status':<7} {'server':<20} {'seconds':>8}")
+    
+    for result in results:
+        print(f"{result['name'][:30]:<30} {result['mode']:<9} {result['status']:<7} {str(result['serverId'] or '-'):<20} {result['seconds']:>8.2f}")
+        
+        if result["status"] == "failed" and result["checkpoint"] and os.path.isfile(result["checkpoint"]):
+            print(f"  resume with: python main.py --resume {result['checkpoint']}")
+            
+    print(f"\n{len(results) - len(failed)}/{len(results)} jobs succeeded")
+    
+    if arguments.summary:
+        with open(arguments.summary, "w") as summaryFile:
+            json.dump({"jobs": results, "succeeded": len(results) - len(failed), "failed": len(failed)}, summaryFile, indent=4)
+            
+    return 1 if failed else 0
@@ -0,0 +1,283 @@
+"""
+Interactive terminal UI for Duplicate: banner, prompts and plan output.
+
+Imported by main.py only when no headless flags are given, so rich and
+colorama are never loaded for scripted runs.
+"""
+
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TextColumn
+from rich.console import *
+from rich.panel import *
+from rich.live import Live
+from colorama import *
+from duplicate import *
+import duplicate
+
+try:
+    from pystyle import System
+except ImportError:
+    System = None
+
+init(autoreset=True)
+console = Console()
+
+def setTitle(title):
+    """
+    Sets the terminal window title when pystyle is installed
+    
+    Args:
+        title (str): Window title
+    """
+    if System is not None:
+        System.Title(title)
+
+def displayBanner(banner):
+    """
+    Displays a static ASCII banner
+    
+    Args:
+        banner (str): The banner text to display
+    """
+    if os.name == "nt":
+        os.system("cls")
+    else:
+        os.system("clear")
+    print(Fore.RED + banner)
+    
+def generateBanner():
+    asciiText = """
+  ______   ___        ______    _____  ___    _______   _______   
+ /" _  "\ |"  |      /    " \  ( "   \|"  \  /"     "| /"      \  
+(: ( \___)||  |     // ____  \ |.\    \    |(: ______)|:        | 
+ \/ \     |:  |    /  /    ) :)|: \.   \   | \/    |  |_____/   ) 
+ //  \ _   \  |___(: (____/ // |.  \    \. | // ___)_  //      /  
+(:   _) \ ( \_|:   |\        /  |    \    \ |(:      "||:  __   \  
+ \_______) \_______) "_____/    \___|\____\) \_______)|__|  \___)
+    """
+    return asciiText
+
+class ProgressDashboard:
+    """
+    Live view of a CloneProgress: one bar per phase plus throughput, rate
+    limit wait and ETA. Redrawn only when CloneProgress.run calls render,
+    so the refresh rate is capped however fast requests finish.
+    """
+    
+    def __init__(self):
+        self.bars = Progress(
+            TextColumn("[bold cyan]{task.description:<10}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+        )
+        self.tasks = {}
+        self.live = Live(console=console, auto_refresh=False)
+
+    def render(self, progress):
+        """
+        Update the bars from the tracker and redraw once
+        
+        Args:
+            progress (CloneProgress): Tracker of the running clone
+        """
+        snapshot = progress.snapshot()
+        
+        for name, phase in snapshot["phases"].items():
+            if name not in self.tasks:
+                self.tasks[name] = self.bars.add_task(name, total=phase["total"])
+            self.bars.update(self.tasks[name], completed=phase["done"])
+            
+        footer = (f"[cyan]{snapshot['throughput']:.1f}[/] req/s  ·  {snapshot['requests']} requests  ·  "
+                  f"rate limit wait [yellow]{snapshot['rateLimitWait']:.1f}s[/]  ·  "
+                  f"ETA [green]{duplicate.formatSeconds(snapshot['eta'])}[/]")
+        self.live.update(Group(self.bars, footer), refresh=True)
+
+def runClone(serverCreator, clone, targetData=None):
+    """
+    Runs a clone with a live dashboard, or periodic summary lines when
+    stdout is not a terminal, then checks the target against the source
+    
+    Args:
+        serverCreator (ServerCreator): Creator running the clone
+        clone: executeAll or syncStructure coroutine of the creator
+        targetData (dict): Target server data for syncs, used to plan the progress bars
+    
+    Returns:
+        The clone's result
+    """
+    settings = serverCreator.settings
+    
+    if targetData is None:
+        runTask(serverCreator.readTemplates())
+    
+    if not settings.get("progress", True):
+        result = runTask(clone)
+    elif not console.is_terminal:
+        result = runTask(CloneProgress(serverCreator, serverCreator.planRequests(targetData)).run(clone))
+    else:
+        progress = CloneProgress(serverCreator, serverCreator.planRequests(targetData))
+        dashboard = ProgressDashboard()
+        
+        with dashboard.live:
+            result = runTask(progress.run(clone, dashboard.render, 1 / settings.get("progress_refresh", 4)))
+            
+    if serverCreator.serverId and settings.get("verify", True):
+        runTask(serverCreator.verifyClone())
+        
+    return result
+
+def runInteractive(arguments):
+    """
+    Runs the interactive, prompt-driven Discord server cloning application
+    
+    Args:
+        arguments (Namespace): Parsed command line arguments
+    """
+    setTitle("Duplicate - Discord Server Cloning Tool - made by github.com/sevenv1")
+    checkpointPath = None
+    metrics = RequestMetrics()
+    pool = None
+    
+    try:
+        config = loadConfig()
+        token = config.get("token", "")
+        
+        if not token:
+            logMessage("Token not found in config.json", "error")
+            token = input(f"{Fore.RED}[?]{Fore.RESET} Enter your Discord token: ")
+            
+            config["token"] = token
+            config.save()
+            
+        pool = HttpPool(token, config.settings)
+        rateLimiter = RateLimiter(config.settings.get("max_concurrency", 5))
+
+        banner = generateBanner()
+        displayBanner(banner)
+        
+        console.print("\n[red]Select cloning mode:")
+        console.print("[1] Clone to existing server")
+        console.print("[2] Create new server")
+        console.print("[3] Save server snapshot")
+        
+        cloningMode = ""
+        while cloningMode not in ["1", "2", "3"]:
+            cloningMode = input(f"{Fore.RED}[?]{Style.RESET_ALL} Your choice (1/2/3): ")
+            
+            if cloningMode not in ["1", "2", "3"]:
+                console.print("[red]Invalid option. Please enter 1, 2 or 3.")
+        
+        sourceServerId = input(f"{Fore.RED}[?]{Style.RESET_ALL} Source Server ID or snapshot file: ")
+        sourceAssets = {}
+        
+        try:
+            if cloningMode != "3" and os.path.isfile(sourceServerId):
+                console.print(Panel("[bold cyan]Loading source snapshot..."))
+                sourceData, sourceAssets, _ = loadSnapshot(sourceServerId)
+            else:
+                console.print(Panel("[bold cyan]Connecting to source server..."))
+                sourceScraper = ServerScraper(token, sourceServerId, config, metrics, pool, rateLimiter)
+                sourceData = runTask(sourceScraper.collectServerData())
+            
+            if not sourceData["info"].get("id"):
+                console.print(Panel("[bold red]Failed to get source server data. Check your token and server ID."))
+                input("Press any key to exit...")
+                return
+                
+            console.print(Panel(f"[bold green]Successfully connected to source server: {sourceData['info'].get('name', 'Unknown')}"))
+            sourceData = filterServerData(sourceData, getFilters(arguments, config))
+        except Exception as e:
+            console.print(Panel(f"[bold red]Failed to connect to source server: {e}"))
+            input("Press any key to exit...")
+            return
+        
+        if cloningMode == "3":
+            snapshotPath = input(f"{Fore.RED}[?]{Style.RESET_ALL} Snapshot file (snapshots/{sourceServerId}.json.gz): ")
+            snapshotPath = snapshotPath or f"snapshots/{sourceServerId}.json.gz"
+            
+            try:
+                sourceAssets = runTask(sourceScraper.collectAssets(sourceData))
+                saveSnapshot(snapshotPath, sourceData, sourceAssets)
+                console.print(Panel(f"[bold green]Saved snapshot to {snapshotPath}"))
+            except Exception as e:
+                console.print(Panel(f"[bold red]Error saving snapshot: {e}"))
+                
+            input("Press any key to exit...")
+            return
+        
+        if cloningMode == "1":
+            targetServerId = input(f"{Fore.RED}[?]{Style.RESET_ALL} Target Server ID: ")
+            
+            try:
+                console.print(Panel("[bold cyan]Connecting to target server..."))
+                targetScraper = ServerScraper(token, targetServerId, config, metrics, pool, rateLimiter)
+                targetData = runTask(targetScraper.collectServerData())
+                
+                if not targetData["info"].get("id"):
+                    console.print(Panel("[bold red]Failed to get target server data. Check your token and server ID."))
+                    input("Press any key to exit...")
+                    return
+                    
+                console.print(Panel(f"[bold green]Successfully connected to target server: {targetData['info'].get('name', 'Unknown')}"))
+                
+                if arguments.dry_run:
+                    serverCreator = ServerCreator(token, sourceData, sourceAssets, config, metrics, pool, rateLimiter)
+                    serverCreator.serverId = targetServerId
+                    requests = serverCreator.planRequests(targetData)
+                    displayPlan(requests, serverCreator.estimateDuration(requests), arguments.plan_file)
+                    input("Press any key to exit...")
+                    return
+                
+                if sourceData.get("filtered"):
+                    console.print(Panel("[bold yellow]Only the selected channels, roles and emojis will be created or updated; nothing will be deleted."), style="yellow")
+                else:
+                    console.print(Panel("[bold yellow]WARNING: Channels, roles and emojis in the target server that are not in the source will be deleted!"), style="yellow")
+                    
+                confirmation = input(f"{Fore.RED}[!]{Style.RESET_ALL} Are you sure you want to continue? (yes/no): ")
+                
+                if confirmation.lower() != "yes":
+                    console.print(Panel("[bold yellow]Operation cancelled by user."))
+                    input("Press any key to exit...")
+                    return
+                    
+                serverCreator = ServerCreator(token, sourceData, sourceAssets, config, metrics, pool, rateLimiter)
+                serverCreator.serverId = targetServerId
+                checkpointPath = getCheckpointPath(config, sourceData["info"]["id"])
+                serverCreator.startCheckpoint(checkpointPath, "sync")
+                
+                runClone(serverCreator, serverCreator.syncStructure(targetData), targetData)
+                
+            except Exception as e:
+                console.print(Panel(f"[bold red]Error cloning to existing server: {e}"))
+        elif arguments.dry_run:
+            serverCreator = ServerCreator(token, sourceData, sourceAssets, config, metrics, pool, rateLimiter)
+            runTask(serverCreator.readTemplates())
+            requests = serverCreator.planRequests()
+            displayPlan(requests, serverCreator.estimateDuration(requests), arguments.plan_file)
+            input("Press any key to exit...")
+            return
+        else:
+            try:
+                serverCreator = ServerCreator(token, sourceData, sourceAssets, config, metrics, pool, rateLimiter)
+                checkpointPath = getCheckpointPath(config, sourceData["info"]["id"])
+                serverCreator.startCheckpoint(checkpointPath, "new")
+                runClone(serverCreator, serverCreator.executeAll())
+            except Exception as e:
+                console.print(Panel(f"[bold red]Error creating new server: {e}"))
+        
+        console.print(Panel("[bold green]Server cloning process completed!"))
+        input("Press any key to exit...")
+    except KeyboardInterrupt:
+        console.print(Panel("[bold yellow]Operation cancelled by user."))
+        
+        if checkpointPath:
+            console.print(f"[yellow]Continue later with: python main.py --resume {checkpointPath}")
+    except Exception as e:
+        console.print(Panel(f"[bold red]Unexpected error: {e}"))
+        input("Press any key to exit...")
+    finally:
+        if pool:
+            runTask(pool.aclose())
+            
+        writeRunReport(metrics, duplicate.activeConfig or {})
+        logger.flush()